@@ -5,6 +5,7 @@ from typing import Optional
 
 import flet.version
 import flet_cli.commands.build
+import flet_cli.commands.cache
 import flet_cli.commands.clean
 import flet_cli.commands.create
 import flet_cli.commands.debug
@@ -112,6 +113,7 @@ def get_parser() -> argparse.ArgumentParser:
     flet_cli.commands.run.Command.register_to(sp, "run")
     flet_cli.commands.build.Command.register_to(sp, "build")
     flet_cli.commands.clean.Command.register_to(sp, "clean")
+    flet_cli.commands.cache.Command.register_to(sp, "cache")
     flet_cli.commands.debug.Command.register_to(sp, "debug")
     flet_cli.commands.test.Command.register_to(sp, "test")
     flet_cli.commands.pack.Command.register_to(sp, "pack")
@@ -1,13 +1,52 @@
 import argparse
+import copy
 import os
 import shutil
 from pathlib import Path
 
 from rich.console import Group
 from rich.live import Live
+from rich.progress import Progress
 
 from flet_cli.commands.build_base import BaseBuildCommand, console
+from flet_cli.commands.flutter_base import BaseFlutterCommand
 from flet_cli.utils.android import flutter_target_platforms
+from flet_cli.utils.build_graph import BuildGraph
+from flet_cli.utils.trace import traced_step
+
+TARGET_PLATFORMS = [
+    "macos",
+    "linux",
+    "windows",
+    "web",
+    "apk",
+    "aab",
+    "ipa",
+    "ios-simulator",
+]
+
+# attributes a target's pipeline sets, reset for each target of a multi-target
+# build
+TARGET_STATE = [
+    "pubspec_path",
+    "rel_out_dir",
+    "assets_path",
+    "package_platform",
+    "config_platform",
+    "debug_platform",
+    "package_app_path",
+    "template_data",
+    "python_module_filename",
+    "out_dir",
+    "python_module_name",
+    "build_dir",
+    "flutter_dir",
+    "flutter_packages_dir",
+    "flutter_packages_temp_dir",
+    "fingerprints",
+    "icons_hash",
+    "splashes_hash",
+]
 
 
 class Command(BaseBuildCommand):
@@ -21,6 +60,9 @@ class Command(BaseBuildCommand):
     """
 
     def __init__(self, parser: argparse.ArgumentParser) -> None:
+        self.parser = parser
+        self.target_platforms: list[str] = []
+        self.status_prefix = ""
         super().__init__(parser)
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
@@ -33,18 +75,18 @@ class Command(BaseBuildCommand):
 
         parser.add_argument(
             "target_platform",
-            type=str.lower,
-            choices=[
-                "macos",
-                "linux",
-                "windows",
-                "web",
-                "apk",
-                "aab",
-                "ipa",
-                "ios-simulator",
-            ],
-            help="The target platform or type of package to build",
+            nargs="*",
+            metavar="target_platform",
+            help="One or more target platforms or types of package to build: "
+            f"{', '.join(TARGET_PLATFORMS)}",
+        )
+        parser.add_argument(
+            "--targets",
+            dest="targets",
+            help="Comma-separated list of target platforms to build, "
+            "e.g. `--targets linux,web,apk`. With several targets, each is built "
+            "in its own work directory, build/.targets/<target_platform>, so it "
+            "doesn't reuse the build/flutter directory of single-target builds",
         )
         parser.add_argument(
             "-o",
@@ -52,20 +94,45 @@ class Command(BaseBuildCommand):
             dest="output_dir",
             required=False,
             help="Output directory for the final executable/bundle "
-            "(default: <python_app_path>/build/<target_platform>)",
+            "(default: <python_app_path>/build/<target_platform>); "
+            "with several targets, each is placed in a sub-directory",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=os.environ.get("FLET_CLI_BUILD_JOBS")
+            or min(4, os.cpu_count() or 1),
+            help="Maximum number of independent build steps to run concurrently; "
+            "1 runs them sequentially (default: FLET_CLI_BUILD_JOBS environment "
+            "variable or min(4, number of CPUs))",
+        )
+        parser.add_argument(
+            "--target-jobs",
+            dest="target_jobs",
+            type=int,
+            default=os.environ.get("FLET_CLI_BUILD_TARGET_JOBS") or 2,
+            help="Maximum number of target platforms built at the same time "
+            "(default: FLET_CLI_BUILD_TARGET_JOBS environment variable or 2)",
         )
         super().add_arguments(parser)
 
     def handle(self, options: argparse.Namespace) -> None:
         """
-        Execute the full build pipeline for the selected target platform.
+        Execute the full build pipeline for the selected target platforms.
 
         Args:
             options: Parsed command-line options.
         """
 
         super().handle(options)
-        assert self.target_platform
+        self.target_platforms = self.resolve_target_platforms()
+        if len(self.target_platforms) > 1:
+            self.build_targets()
+            return
+
+        self.target_platform = self.target_platforms[0]
         self.status = console.status(
             f"[bold blue]Initializing {self.target_platform} build...",
             spinner="bouncingBall",
@@ -75,15 +142,7 @@ class Command(BaseBuildCommand):
             self.validate_target_platform()
             self.validate_entry_point()
             self.setup_template_data()
-            self.create_flutter_project()
-            self.package_python_app()
-            self.register_flutter_extensions()
-            if self.create_flutter_project(second_pass=True):
-                self.update_flutter_dependencies()
-            self.customize_icons()
-            self.customize_splash_images()
-            self.run_flutter()
-            self.copy_build_output()
+            self.create_build_graph().run(max_workers=self.options.jobs)
 
             self.cleanup(
                 0,
@@ -102,6 +161,247 @@ class Command(BaseBuildCommand):
                 ),
             )
 
+    def resolve_target_platforms(self) -> list[str]:
+        """
+        Collect target platforms from positional arguments and `--targets`.
+
+        A trailing positional value that is not a target platform but an
+        existing path is taken as the app path, so `flet build linux web
+        path/to/app` works as expected. Any other value is rejected.
+
+        Returns:
+            Unique target platforms in the order given.
+        """
+
+        assert self.options
+
+        positional = list(self.options.target_platform)
+        if (
+            positional
+            and positional[-1].lower() not in TARGET_PLATFORMS
+            and self.options.python_app_path == "."
+            and os.path.exists(positional[-1])
+        ):
+            # argparse hands every positional to the greedy target list
+            self.options.python_app_path = positional.pop()
+
+        targets = [
+            t.strip().lower()
+            for t in positional + (self.options.targets or "").split(",")
+            if t.strip()
+        ]
+        for target in targets:
+            if target not in TARGET_PLATFORMS:
+                self.parser.error(
+                    f"argument target_platform: invalid choice: '{target}' "
+                    f"(choose from {', '.join(TARGET_PLATFORMS)}, or give the "
+                    "path of an existing app directory last)"
+                )
+        if not targets:
+            self.parser.error("the following arguments are required: target_platform")
+        return list(dict.fromkeys(targets))
+
+    def build_targets(self):
+        """
+        Build several target platforms in one invocation.
+
+        The Flutter toolchain, app path, `pyproject.toml` and Python release are
+        resolved once. Each target then runs its own pipeline in a separate
+        work directory (`build/.targets/<target>`), with up to `--target-jobs`
+        targets building at the same time.
+        """
+
+        assert self.options
+
+        self.status = console.status(
+            f"[bold blue]Initializing {', '.join(self.target_platforms)} builds...",
+            spinner="bouncingBall",
+        )
+        with Live(Group(self.status, self.progress), console=console) as self.live:
+            self.target_platform = self.target_platforms[0]
+            self.require_android_sdk = any(
+                self.platforms[t]["package_platform"] == "Android"
+                for t in self.target_platforms
+            )
+            BaseFlutterCommand.initialize_command(self)
+            self.initialize_project()
+            assert self.python_app_path
+
+            builds = [self.create_target_build(t) for t in self.target_platforms]
+            for build in builds:
+                build.validate_target_platform()
+                build.validate_entry_point()
+                build.setup_template_data()
+
+            self.update_status(
+                f"[bold blue]Building {len(builds)} targets "
+                f"(up to {max(1, self.options.target_jobs)} at a time)..."
+            )
+            self.live.update(
+                Group(
+                    self.status,
+                    *[b.status for b in builds],
+                    self.progress,
+                    *[b.progress for b in builds],
+                )
+            )
+
+            graph = BuildGraph()
+            for build in builds:
+                graph.add(build.target_platform, build.run_build_graph)
+            graph.run(max_workers=self.options.target_jobs)
+
+            self.cleanup(
+                0,
+                message=(
+                    f"Successfully built {len(builds)} targets! "
+                    f"{self.emojis['success']}\n"
+                    + "\n".join(
+                        f"{self.platforms[b.target_platform]['status_text']}: "
+                        f"[cyan]{b.rel_out_dir}[/cyan] {self.emojis['directory']}"
+                        for b in builds
+                    )
+                ),
+            )
+
+    def create_target_build(self, target_platform: str) -> "Command":
+        """
+        Create a copy of this command that builds a single target platform.
+
+        The copy shares the resolved toolchain and project state, the live
+        display and the tracer, which are thread-safe. It gets its own copy of
+        the options and platform metadata, its own target state, work directory,
+        output directory, status line and progress bars, so targets building
+        concurrently don't see each other's changes.
+
+        Args:
+            target_platform: Target platform the copy builds.
+
+        Returns:
+            Command initialized for `target_platform`.
+        """
+
+        assert self.options
+        assert self.python_app_path
+
+        build = copy.copy(self)
+        build.options = copy.deepcopy(self.options)
+        build.env = dict(self.env)
+        build.platforms = copy.deepcopy(self.platforms)
+        build.platform_matrix_table = copy.deepcopy(self.platform_matrix_table)
+        for name in TARGET_STATE:
+            setattr(build, name, None)
+        build.flutter_dependencies = {}
+        build.site_packages_skipped = False
+        build.progress = Progress(transient=True)
+        build.target_platform = target_platform
+        build.target_platforms = [target_platform]
+        build.status_prefix = f"[cyan]{target_platform}[/cyan] "
+        build.status = console.status(
+            f"{build.status_prefix}[bold blue]Waiting...", spinner="bouncingBall"
+        )
+
+        dist = self.platforms[target_platform]["dist"]
+        build.initialize_target(
+            build_dir=self.python_app_path / "build" / ".targets" / target_platform,
+            output_dir=(
+                os.path.join(build.options.output_dir, dist)
+                if build.options.output_dir
+                else None
+            ),
+        )
+        return build
+
+    @traced_step("build_target")
+    def run_build_graph(self):
+        """
+        Run the build pipeline of this command's target platform.
+        """
+
+        assert self.options
+        self.trace_annotate(target=self.target_platform)
+        self.create_build_graph().run(max_workers=self.options.jobs)
+        self.update_status(f"[bold blue]Done {self.emojis['checkmark']}")
+
+    def update_status(self, status):
+        """
+        Update current live status message, prefixed with the target platform
+        when several targets are built.
+
+        Args:
+            status: Status text to display.
+        """
+
+        super().update_status(f"{self.status_prefix}{status}")
+
+    def create_build_graph(self) -> BuildGraph:
+        """
+        Declare the build pipeline steps and the order constraints between them.
+
+        Python packaging overlaps Pyodide runtime preparation, and app icons and
+        splash screens are generated concurrently. Icons and splash screens
+        can't start before packaging finishes: the second template pass, which
+        depends on the extensions found while packaging, re-renders
+        `pubspec.yaml` and the default platform images.
+
+        Returns:
+            Graph running the full build when executed.
+        """
+
+        def second_pass():
+            if self.create_flutter_project(second_pass=True):
+                self.update_flutter_dependencies()
+
+        def resolve_dependencies():
+            # both generators would otherwise resolve the patched pubspec.yaml
+            # at the same time
+            if self.icons_hash and self.splashes_hash:
+                self.resolve_flutter_dependencies()
+
+        def generate_icons():
+            if self.icons_hash:
+                self.generate_icons()
+
+        def generate_splash_images():
+            if self.splashes_hash:
+                self.generate_splash_images()
+
+        # both generators patch web/index.html
+        web_index = ["web/index.html"] if self.target_platform == "web" else []
+
+        graph = BuildGraph()
+        graph.add("template", self.create_flutter_project, outputs=["flutter"])
+        graph.add(
+            "package",
+            lambda: self.package_python_app(prepare_pyodide=False),
+            inputs=["flutter"],
+            outputs=["python-app"],
+        )
+        graph.add("pyodide", self.prepare_pyodide_runtime, inputs=["flutter"])
+        graph.add(
+            "extensions",
+            self.register_flutter_extensions,
+            inputs=["python-app"],
+            outputs=["template-data"],
+        )
+        graph.add(
+            "template-2",
+            second_pass,
+            deps=["pyodide"],
+            inputs=["template-data"],
+            outputs=["pubspec"],
+        )
+        graph.add("configure-icons", self.configure_icons, outputs=["pubspec"])
+        graph.add("configure-splash", self.configure_splash_images, outputs=["pubspec"])
+        graph.add("resolve", resolve_dependencies, outputs=["pubspec"])
+        graph.add("icons", generate_icons, inputs=["pubspec"], outputs=web_index)
+        graph.add(
+            "splash", generate_splash_images, inputs=["pubspec"], outputs=web_index
+        )
+        graph.add("flutter", self.run_flutter, deps=["icons", "splash", "pyodide"])
+        graph.add("copy-output", self.copy_build_output, deps=["flutter"])
+        return graph
+
     def add_flutter_command_args(self, args: list[str]):
         """
         Append `flutter build` arguments derived from CLI options and project config.
@@ -172,6 +472,7 @@ class Command(BaseBuildCommand):
         ):
             args.append(arg)
 
+    @traced_step()
     def run_flutter(self):
         """
         Run Flutter build command and log completion status.
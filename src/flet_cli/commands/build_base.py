@@ -1,11 +1,14 @@
 import argparse
+import atexit
 import base64
 import copy
 import glob
+import hashlib
 import json
 import os
 import platform
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, cast
 
@@ -16,8 +19,9 @@ from rich.table import Column, Table
 
 import flet.version
 import flet_cli.utils.processes as processes
-from flet.utils import copy_tree, slugify
+from flet.utils import slugify
 from flet.utils.deprecated import deprecated_warning
+from flet.utils.platform_utils import get_bool_env_var
 from flet_cli.commands.flutter_base import (
     BaseFlutterCommand,
     console,
@@ -30,8 +34,17 @@ from flet_cli.utils.android import (
     ANDROID_ARCH_TO_FLUTTER_TARGET_PLATFORM,
     excluded_android_abis,
 )
+from flet_cli.utils.cache_index import artifact_lock_name, record_use, use_artifact
 from flet_cli.utils.cli import parse_cli_bool_value
+from flet_cli.utils.dart_snapshots import (
+    dependencies_stale,
+    get_tool_snapshot,
+    package_config_path,
+)
+from flet_cli.utils.file_lock import file_lock
+from flet_cli.utils.fingerprint import FileFingerprints, hash_file
 from flet_cli.utils.hash_stamp import HashStamp
+from flet_cli.utils.links import TreeMirror
 from flet_cli.utils.merge import merge_dict
 from flet_cli.utils.plist import is_supported_plist_value, parse_cli_plist_value
 from flet_cli.utils.project_dependencies import (
@@ -43,6 +56,20 @@ from flet_cli.utils.python_versions import (
     UnsupportedPythonVersionError,
     resolve_python_version,
 )
+from flet_cli.utils.site_packages_store import (
+    requirement_is_portable,
+    requirements_txt_is_portable,
+    restore_site_packages,
+    save_site_packages,
+    site_packages_key,
+)
+from flet_cli.utils.template_cache import (
+    get_cache_root,
+    get_cached_template_dir,
+    get_cached_template_zip,
+    template_render_cache,
+)
+from flet_cli.utils.trace import BuildTracer, traced_step
 
 DEFAULT_TEMPLATE_URL = (
     "https://github.com/flet-dev/flet/releases/download/"
@@ -90,6 +117,9 @@ class BaseBuildCommand(BaseFlutterCommand):
         self.flutter_packages_dir = None
         self.flutter_packages_temp_dir = None
         self.site_packages_skipped = False
+        self.fingerprints: Optional[FileFingerprints] = None
+        self.icons_hash: Optional[HashStamp] = None
+        self.splashes_hash: Optional[HashStamp] = None
         self.platforms = {
             "windows": {
                 "package_platform": "Windows",
@@ -550,6 +580,14 @@ class BaseBuildCommand(BaseFlutterCommand):
             nargs="*",
             help="Additional arguments for flutter build command",
         )
+        parser.add_argument(
+            "--no-site-packages-store",
+            dest="no_site_packages_store",
+            action="store_true",
+            default=False,
+            help="Always install app dependencies instead of reusing an identical "
+            "site-packages set from the shared store in the Flet cache",
+        )
         parser.add_argument(
             "--source-packages",
             dest="source_packages",
@@ -711,6 +749,14 @@ class BaseBuildCommand(BaseFlutterCommand):
             default=False,
             help="Display the build platform matrix in a table, then exit",
         )
+        parser.add_argument(
+            "--trace",
+            dest="trace",
+            metavar="TRACE_FILE",
+            help="Record build steps and subprocesses with their wall time, "
+            "child CPU time, peak RSS and cache hits to a Chrome trace-event "
+            "JSON file, and print a summary at exit",
+        )
         super().add_arguments(parser)
 
     def handle(self, options: argparse.Namespace) -> None:
@@ -741,20 +787,52 @@ class BaseBuildCommand(BaseFlutterCommand):
         if "target_platform" in self.options:
             self.target_platform = self.options.target_platform
 
+        if getattr(self.options, "trace", None):
+            self.tracer = BuildTracer()
+            # written at interpreter exit, after worker threads have finished,
+            # so failed and interrupted builds are traced too
+            atexit.register(self.write_trace, self.options.trace)
+
+    def write_trace(self, path):
+        """
+        Write the recorded trace to a file and print its summary.
+
+        Args:
+            path: Chrome trace-event JSON file to write.
+        """
+
+        assert self.tracer
+
+        self.tracer.write(path)
+        console.print(self.tracer.summary())
+        console.print(f"Build trace written to [cyan]{path}[/cyan]")
+
     def initialize_command(self):
         """
         Initialize build paths, target metadata, and shared Flutter prerequisites.
         """
 
-        assert self.options
         assert self.target_platform
 
-        self.package_platform = self.platforms[self.target_platform]["package_platform"]
-        self.config_platform = self.platforms[self.target_platform]["config_platform"]
-        self.require_android_sdk = self.package_platform == "Android"
+        self.require_android_sdk = (
+            self.platforms[self.target_platform]["package_platform"] == "Android"
+        )
 
         super().initialize_command()
 
+        self.initialize_project()
+        self.initialize_target()
+
+    @traced_step()
+    def initialize_project(self):
+        """
+        Resolve the Flet app path, its `pyproject.toml` and bundled Python release.
+
+        This state is independent of the target platform.
+        """
+
+        assert self.options
+
         self.python_app_path = Path(self.options.python_app_path).resolve()
 
         if not (
@@ -766,30 +844,53 @@ class BaseBuildCommand(BaseFlutterCommand):
                 f"{self.python_app_path}",
             )
 
-        self.rel_out_dir = self.options.output_dir or os.path.join(
+        self.get_pyproject = load_pyproject_toml(self.python_app_path)
+
+        try:
+            self.python_release = resolve_python_version(
+                self.options.python_version, self.get_pyproject
+            )
+        except UnsupportedPythonVersionError as e:
+            self.cleanup(1, str(e))
+
+    @traced_step()
+    def initialize_target(
+        self, build_dir: Optional[Path] = None, output_dir: Optional[str] = None
+    ):
+        """
+        Initialize target platform metadata and the build work directory.
+
+        Args:
+            build_dir: Work directory holding the Flutter project, packaged app
+                and build stamps; defaults to `<python_app_path>/build`.
+            output_dir: Output directory overriding the `--output` option.
+        """
+
+        assert self.options
+        assert self.target_platform
+        assert self.python_app_path
+        assert self.python_release
+
+        self.package_platform = self.platforms[self.target_platform]["package_platform"]
+        self.config_platform = self.platforms[self.target_platform]["config_platform"]
+
+        output_dir = output_dir or self.options.output_dir
+        self.rel_out_dir = output_dir or os.path.join(
             "build", self.platforms[self.target_platform]["dist"]
         )
 
-        self.build_dir = self.python_app_path.joinpath("build")
+        self.build_dir = build_dir or self.python_app_path.joinpath("build")
         self.flutter_dir = self.build_dir.joinpath("flutter")
         self.flutter_packages_dir = self.build_dir.joinpath("flutter-packages")
         self.flutter_packages_temp_dir = self.build_dir.joinpath(
             "flutter-packages-temp"
         )
         self.out_dir = (
-            Path(self.options.output_dir).resolve()
-            if self.options.output_dir
+            Path(output_dir).resolve()
+            if output_dir
             else self.python_app_path.joinpath(self.rel_out_dir)
         )
         self.pubspec_path = str(self.flutter_dir.joinpath("pubspec.yaml"))
-        self.get_pyproject = load_pyproject_toml(self.python_app_path)
-
-        try:
-            self.python_release = resolve_python_version(
-                self.options.python_version, self.get_pyproject
-            )
-        except UnsupportedPythonVersionError as e:
-            self.cleanup(1, str(e))
 
         # Changing the bundled Python version invalidates the compiled bytecode
         # baked into the previous build's native bundles (stdlib/site-packages
@@ -807,6 +908,12 @@ class BaseBuildCommand(BaseFlutterCommand):
         self.build_dir.mkdir(parents=True, exist_ok=True)
         version_marker.write_text(self.python_release.short, encoding="utf-8")
 
+        # content fingerprints of build inputs, memoized across builds by stat
+        self.fingerprints = FileFingerprints(
+            self.build_dir / ".hash" / "fingerprints.json"
+        )
+
+    @traced_step()
     def validate_target_platform(self):
         """
         Validate whether current host OS can build the selected target platform.
@@ -843,6 +950,7 @@ class BaseBuildCommand(BaseFlutterCommand):
             f"[magenta]{self.current_platform}[/]."
             self.cleanup(1, message)
 
+    @traced_step()
     def validate_entry_point(self):
         """
         Resolve app entry-point module and ensure corresponding Python file exists.
@@ -872,6 +980,7 @@ class BaseBuildCommand(BaseFlutterCommand):
                 "for your Flet app.",
             )
 
+    @traced_step()
     def setup_template_data(self):
         """
         Build template context by merging CLI options, project config, and defaults.
@@ -1520,6 +1629,7 @@ class BaseBuildCommand(BaseFlutterCommand):
             ),
         }
 
+    @traced_step()
     def create_flutter_project(self, second_pass=False):
         """
         Render Flutter bootstrap project from template if template inputs changed.
@@ -1540,7 +1650,8 @@ class BaseBuildCommand(BaseFlutterCommand):
         assert self.pubspec_path
 
         hash = HashStamp(
-            self.build_dir / ".hash" / f"template-{'2' if second_pass else '1'}"
+            self.build_dir / ".hash" / f"template-{'2' if second_pass else '1'}",
+            self.fingerprints,
         )
 
         template_url = self.options.template or self.get_pyproject(
@@ -1554,6 +1665,7 @@ class BaseBuildCommand(BaseFlutterCommand):
             template_ref = flet.version.flet_version
 
         is_local_dev = False
+        template_zip = None
         # Identity printed in status / hashed for invalidation; may differ from
         # the path cookiecutter actually reads when caching kicks in below.
         template_source = template_url
@@ -1569,17 +1681,24 @@ class BaseBuildCommand(BaseFlutterCommand):
                 checkout = None
                 is_local_dev = True
             else:
-                from flet_cli.utils.template_cache import get_cached_template_zip
-
                 template_source = DEFAULT_TEMPLATE_URL.format(version=template_ref)
-                template_url = str(
-                    get_cached_template_zip(template_source, template_ref)
-                )
+                # the immutable release zip is extracted once into the cache
+                template_zip = get_cached_template_zip(template_source, template_ref)
+                template_url = str(get_cached_template_dir(template_zip))
                 checkout = None
 
         hash.update(template_source)
         hash.update(template_ref)
 
+        # include a local template (directory or cached zip) by content, so
+        # editing it re-creates the app shell but re-checking it out does not
+        if template_zip:
+            hash.update_file(template_zip)
+        elif template_url and os.path.isdir(template_url):
+            hash.update_tree(template_url)
+        elif template_url and os.path.isfile(template_url):
+            hash.update_file(template_url)
+
         template_dir = self.options.template_dir or self.get_pyproject(
             "tool.flet.template.dir"
         )
@@ -1587,6 +1706,9 @@ class BaseBuildCommand(BaseFlutterCommand):
         hash.update(self.template_data)
 
         hash_changed = hash.has_changed()
+        self.trace_annotate(
+            second_pass=second_pass, cache="miss" if hash_changed else "hit"
+        )
 
         if hash_changed:
             # if options.clear_cache is set, delete any existing Flutter bootstrap
@@ -1609,20 +1731,35 @@ class BaseBuildCommand(BaseFlutterCommand):
                 status += "..."
                 self.update_status(status)
 
+            # compiled Jinja templates, reused by both passes and later builds
+            if template_zip:
+                render_cache_dir = template_zip.parent / "jinja"
+            else:
+                source_key = hashlib.sha256(str(template_source).encode())
+                render_cache_dir = (
+                    get_cache_root()
+                    / "build-template"
+                    / "jinja"
+                    / source_key.hexdigest()[:16]
+                )
+
             try:
                 from cookiecutter.main import cookiecutter
 
-                cookiecutter(
-                    template=template_url,
-                    checkout=checkout,
-                    directory=template_dir,
-                    output_dir=str(self.flutter_dir.parent),
-                    no_input=True,
-                    overwrite_if_exists=True,
-                    extra_context={
-                        k: v for k, v in self.template_data.items() if v is not None
-                    },
-                )
+                with template_render_cache(render_cache_dir):
+                    cookiecutter(
+                        template=template_url,
+                        checkout=checkout,
+                        directory=template_dir,
+                        output_dir=str(self.flutter_dir.parent),
+                        no_input=True,
+                        overwrite_if_exists=True,
+                        extra_context={
+                            k: v
+                            for k, v in self.template_data.items()
+                            if v is not None
+                        },
+                    )
             except Exception as e:
                 shutil.rmtree(self.flutter_dir)
                 self.cleanup(1, f"{e}")
@@ -1711,6 +1848,7 @@ class BaseBuildCommand(BaseFlutterCommand):
 
         return hash_changed
 
+    @traced_step()
     def register_flutter_extensions(self):
         """
         Discover local Flutter extension packages and inject them into dependencies.
@@ -1760,6 +1898,7 @@ class BaseBuildCommand(BaseFlutterCommand):
                 f"Registered Flutter user extensions {self.emojis['checkmark']}"
             )
 
+    @traced_step()
     def update_flutter_dependencies(self):
         """
         Merge resolved Flutter extension dependencies into `pubspec.yaml`.
@@ -1794,6 +1933,19 @@ class BaseBuildCommand(BaseFlutterCommand):
         Resolve platform icon assets, patch pubspec icon config, and generate icons.
         """
 
+        if self.configure_icons():
+            self.generate_icons()
+
+    @traced_step()
+    def configure_icons(self) -> bool:
+        """
+        Resolve platform icon assets, copy them, and patch pubspec icon config.
+
+        Returns:
+            `True` when icon inputs changed and `generate_icons` must run,
+            otherwise `False`.
+        """
+
         assert self.package_app_path
         assert self.flutter_dir
         assert self.options
@@ -1801,7 +1953,7 @@ class BaseBuildCommand(BaseFlutterCommand):
         assert self.pubspec_path
         assert self.build_dir
 
-        hash = HashStamp(self.build_dir / ".hash" / "icons")
+        hash = HashStamp(self.build_dir / ".hash" / "icons", self.fingerprints)
 
         pubspec_origin_path = f"{self.pubspec_path}.orig"
         pubspec = self.load_yaml(pubspec_origin_path)
@@ -1882,56 +2034,82 @@ class BaseBuildCommand(BaseFlutterCommand):
                 adaptive_icon_background
             )
 
-        # check if pubspec changed
-        hash.update(Path(pubspec_origin_path).stat().st_mtime)
+        # check if pubspec changed. The template stamps are included as well:
+        # re-rendering the app shell restores the template's default icons, so
+        # they must be generated again even if pubspec.yaml itself is the same.
+        hash.update_file(pubspec_origin_path)
+        hash.update_file(self.build_dir / ".hash" / "template-1")
+        hash.update_file(self.build_dir / ".hash" / "template-2")
         hash.update(pubspec["flutter_launcher_icons"])
 
+        icons_changed = hash.has_changed()
+        self.trace_annotate(cache="miss" if icons_changed else "hit")
+        if not icons_changed:
+            hash.commit()
+            return False
+
+        if copy_ops:
+            self.update_status("[bold blue]Customizing app icons...")
+            for op in copy_ops:
+                if self.verbose > 0:
+                    console.log(
+                        f"Copying image {op[0]} to {op[1]}", style=verbose1_style
+                    )
+                shutil.copy(op[0], op[1])
+            console.log(f"Customized app icons {self.emojis['checkmark']}")
+
         # save pubspec.yaml
-        if hash.has_changed():
-            if copy_ops:
-                self.update_status("[bold blue]Customizing app icons...")
-                for op in copy_ops:
-                    if self.verbose > 0:
-                        console.log(
-                            f"Copying image {op[0]} to {op[1]}", style=verbose1_style
-                        )
-                    shutil.copy(op[0], op[1])
-                console.log(f"Customized app icons {self.emojis['checkmark']}")
+        updated_pubspec = self.load_yaml(self.pubspec_path)
+        updated_pubspec["flutter_launcher_icons"] = pubspec["flutter_launcher_icons"]
+        self.save_yaml(self.pubspec_path, updated_pubspec)
 
-            updated_pubspec = self.load_yaml(self.pubspec_path)
-            updated_pubspec["flutter_launcher_icons"] = pubspec[
-                "flutter_launcher_icons"
-            ]
-            self.save_yaml(self.pubspec_path, updated_pubspec)
+        self.icons_hash = hash
+        return True
 
-            self.update_status("[bold blue]Generating app icons...")
+    @traced_step()
+    def generate_icons(self):
+        """
+        Generate platform app icons configured by `configure_icons`.
+        """
 
-            # icons
-            icons_result = self.run(
-                [
-                    self.dart_exe,
-                    "run",
-                    "--suppress-analytics",
-                    "flutter_launcher_icons",
-                ],
-                cwd=str(self.flutter_dir),
-                capture_output=self.verbose < 1,
-            )
-            if icons_result.returncode != 0:
-                if isinstance(icons_result.stdout, str):
-                    console.log(icons_result.stdout, style=verbose1_style)
-                if isinstance(icons_result.stderr, str):
-                    console.log(icons_result.stderr, style=error_style)
-                self.cleanup(icons_result.returncode)
-            console.log(f"Generated app icons {self.emojis['checkmark']}")
+        assert self.flutter_dir
+        assert self.icons_hash
 
-        hash.commit()
+        self.update_status("[bold blue]Generating app icons...")
+
+        # icons
+        icons_result = self.run_dart_tool(
+            "flutter_launcher_icons", [], capture_output=self.verbose < 1
+        )
+        if icons_result.returncode != 0:
+            if isinstance(icons_result.stdout, str):
+                console.log(icons_result.stdout, style=verbose1_style)
+            if isinstance(icons_result.stderr, str):
+                console.log(icons_result.stderr, style=error_style)
+            self.cleanup(icons_result.returncode)
+        console.log(f"Generated app icons {self.emojis['checkmark']}")
+
+        self.icons_hash.commit()
+        self.icons_hash = None
 
     def customize_splash_images(self):
         """
         Resolve splash assets/colors, patch splash config, and generate splash files.
         """
 
+        if self.configure_splash_images():
+            self.generate_splash_images()
+
+    @traced_step()
+    def configure_splash_images(self) -> bool:
+        """
+        Resolve splash assets/colors, copy images, and patch pubspec splash config.
+
+        Returns:
+            `True` when splash inputs changed and `generate_splash_images` must
+            run, otherwise `False`.
+        """
+
         assert self.package_app_path
         assert self.flutter_dir
         assert self.options
@@ -1941,9 +2119,9 @@ class BaseBuildCommand(BaseFlutterCommand):
         assert self.target_platform
 
         if self.target_platform not in ["web", "ipa", "ios-simulator", "apk", "aab"]:
-            return
+            return False
 
-        hash = HashStamp(self.build_dir / ".hash" / "splashes")
+        hash = HashStamp(self.build_dir / ".hash" / "splashes", self.fingerprints)
 
         pubspec_origin_path = f"{self.pubspec_path}.orig"
 
@@ -2139,47 +2317,92 @@ class BaseBuildCommand(BaseFlutterCommand):
             )
         )
 
-        # check if pubspec changed
-        hash.update(Path(pubspec_origin_path).stat().st_mtime)
+        # check if pubspec changed (and whether the app shell was re-rendered,
+        # which restores the template's default splash screens)
+        hash.update_file(pubspec_origin_path)
+        hash.update_file(self.build_dir / ".hash" / "template-1")
+        hash.update_file(self.build_dir / ".hash" / "template-2")
         hash.update(pubspec["flutter_native_splash"])
 
+        splashes_changed = hash.has_changed()
+        self.trace_annotate(cache="miss" if splashes_changed else "hit")
+        if not splashes_changed:
+            hash.commit()
+            return False
+
+        if copy_ops:
+            self.update_status("[bold blue]Customizing app splash images...")
+            for op in copy_ops:
+                if self.verbose > 0:
+                    console.log(
+                        f"Copying image {op[0]} to {op[1]}", style=verbose1_style
+                    )
+                shutil.copy(op[0], op[1])
+            console.log(f"Customized app splash images {self.emojis['checkmark']}")
+
         # save pubspec.yaml
-        if hash.has_changed():
-            if copy_ops:
-                self.update_status("[bold blue]Customizing app splash images...")
-                for op in copy_ops:
-                    if self.verbose > 0:
-                        console.log(
-                            f"Copying image {op[0]} to {op[1]}", style=verbose1_style
-                        )
-                    shutil.copy(op[0], op[1])
-                console.log(f"Customized app splash images {self.emojis['checkmark']}")
+        updated_pubspec = self.load_yaml(self.pubspec_path)
+        updated_pubspec["flutter_native_splash"] = pubspec["flutter_native_splash"]
+        self.save_yaml(self.pubspec_path, updated_pubspec)
 
-            updated_pubspec = self.load_yaml(self.pubspec_path)
-            updated_pubspec["flutter_native_splash"] = pubspec["flutter_native_splash"]
-            self.save_yaml(self.pubspec_path, updated_pubspec)
+        self.splashes_hash = hash
+        return True
 
-            # splash screens
-            self.update_status("[bold blue]Generating splash screens...")
-            splash_result = self.run(
-                [
-                    self.dart_exe,
-                    "run",
-                    "--suppress-analytics",
-                    "flutter_native_splash:create",
-                ],
-                cwd=str(self.flutter_dir),
-                capture_output=self.verbose < 1,
-            )
-            if splash_result.returncode != 0:
-                if isinstance(splash_result.stdout, str):
-                    console.log(splash_result.stdout, style=verbose1_style)
-                if isinstance(splash_result.stderr, str):
-                    console.log(splash_result.stderr, style=error_style)
-                self.cleanup(splash_result.returncode)
-            console.log(f"Generated splash screens {self.emojis['checkmark']}")
+    @traced_step()
+    def generate_splash_images(self):
+        """
+        Generate splash screens configured by `configure_splash_images`.
+        """
 
-        hash.commit()
+        assert self.flutter_dir
+        assert self.splashes_hash
+
+        # splash screens
+        self.update_status("[bold blue]Generating splash screens...")
+        splash_result = self.run_dart_tool(
+            "flutter_native_splash:create", [], capture_output=self.verbose < 1
+        )
+        if splash_result.returncode != 0:
+            if isinstance(splash_result.stdout, str):
+                console.log(splash_result.stdout, style=verbose1_style)
+            if isinstance(splash_result.stderr, str):
+                console.log(splash_result.stderr, style=error_style)
+            self.cleanup(splash_result.returncode)
+        console.log(f"Generated splash screens {self.emojis['checkmark']}")
+
+        self.splashes_hash.commit()
+        self.splashes_hash = None
+
+    @traced_step()
+    def resolve_flutter_dependencies(self):
+        """
+        Run `flutter pub get` for the Flutter bootstrap project.
+
+        Used ahead of Dart tools that run concurrently, so they don't each
+        start resolving the just-patched `pubspec.yaml` at the same time, and
+        by `run_dart_tool` before running a tool snapshot.
+        """
+
+        assert self.flutter_dir
+
+        self.update_status("[bold blue]Resolving Flutter dependencies...")
+        pub_result = self.run(
+            [
+                self.flutter_exe,
+                "pub",
+                "get",
+                "--no-version-check",
+                "--suppress-analytics",
+            ],
+            cwd=str(self.flutter_dir),
+            capture_output=self.verbose < 1,
+        )
+        if pub_result.returncode != 0:
+            if isinstance(pub_result.stdout, str):
+                console.log(pub_result.stdout, style=verbose1_style)
+            if isinstance(pub_result.stderr, str):
+                console.log(pub_result.stderr, style=error_style)
+            self.cleanup(pub_result.returncode)
 
     def fallback_image(self, pubspec, yaml_path: str, images: list, images_dir: str):
         """
@@ -2220,12 +2443,17 @@ class BaseBuildCommand(BaseFlutterCommand):
             self.options.swift_package_manager, "swift_package_manager", True
         )
 
-    def package_python_app(self):
+    @traced_step()
+    def package_python_app(self, prepare_pyodide: bool = True):
         """
         Package Python app and dependencies into Flutter-consumable app archive.
 
         Handles dependency resolution, cleanup/compile flags, cache checks, and
         invokes `serious_python` packaging command.
+
+        Args:
+            prepare_pyodide: Whether to also place the Pyodide runtime for web
+                builds; pass `False` to run `prepare_pyodide_runtime` separately.
         """
 
         assert self.options
@@ -2238,14 +2466,10 @@ class BaseBuildCommand(BaseFlutterCommand):
         assert self.flutter_packages_temp_dir
         assert self.template_data
 
-        hash = HashStamp(self.build_dir / ".hash" / "package")
+        hash = HashStamp(self.build_dir / ".hash" / "package", self.fingerprints)
 
         self.update_status("[bold blue]Packaging Python app...")
         package_args = [
-            self.dart_exe,
-            "run",
-            "--suppress-analytics",
-            "serious_python:main",
             "package",
             str(self.package_app_path),
             "--platform",
@@ -2284,7 +2508,11 @@ class BaseBuildCommand(BaseFlutterCommand):
         if platform_dependencies:
             toml_dependencies.extend(platform_dependencies)
 
+        requirements_key = None
         dev_packages_configured = False
+        # dev packages that can't be fingerprinted (e.g. remote URLs) force a
+        # full site-packages install on every build
+        dev_packages_untracked = False
         if len(toml_dependencies) > 0:
             dev_packages = (
                 self.get_pyproject(f"tool.flet.{self.config_platform}.dev_packages")
@@ -2307,16 +2535,25 @@ class BaseBuildCommand(BaseFlutterCommand):
                             toml_dependencies[i] = (
                                 f"{package_name} @ {dev_path.as_uri()}"
                             )
+                            # local sources reach the stamp by content
+                            if dev_path.is_dir():
+                                hash.update_tree(dev_path)
+                            else:
+                                hash.update_file(dev_path)
                         else:
                             toml_dependencies[i] = (
                                 f"{package_name} @ {package_location}"
                             )
+                            dev_packages_untracked = True
                         dev_packages_configured = True
                 if dev_packages_configured:
                     toml_dependencies.append("--no-cache-dir")
 
             for toml_dep in toml_dependencies:
                 package_args.extend(["-r", toml_dep])
+            # direct URLs and local paths install whatever they point to now
+            if all(requirement_is_portable(d) for d in toml_dependencies):
+                requirements_key = toml_dependencies
 
         elif requirements_txt.exists():
             if self.verbose > 1:
@@ -2326,10 +2563,16 @@ class BaseBuildCommand(BaseFlutterCommand):
                         f"Contents of requirements.txt: {reqs_txt_contents}",
                         style=verbose2_style,
                     )
-                    hash.update(reqs_txt_contents)
+            hash.update_file(requirements_txt)
             package_args.extend(["-r", "-r", "-r", str(requirements_txt)])
+            requirements_key = (
+                f"requirements.txt:{hash_file(requirements_txt)}"
+                if requirements_txt_is_portable(requirements_txt)
+                else None
+            )
         else:
             package_args.extend(["-r", f"flet=={flet.version.flet_version}"])
+            requirements_key = package_args[-1]
 
         # site-packages variable
         if self.package_platform != "Emscripten":
@@ -2483,21 +2726,80 @@ class BaseBuildCommand(BaseFlutterCommand):
         for arg in package_args:
             hash.update(arg)
 
-        if not dev_packages_configured:
+        # site-packages shared across apps and builds through the store, keyed by
+        # everything but app-specific settings. Web packages dependencies into
+        # app.zip, and local dev packages are tied to this app. Direct URL
+        # dependencies leave `requirements_key` unset.
+        site_packages_dir = self.build_dir / "site-packages"
+        store_key = None
+        if (
+            requirements_key is not None
+            and not dev_packages_configured
+            and self.package_platform != "Emscripten"
+            and not self.options.no_site_packages_store
+        ):
+            store_key = site_packages_key(
+                requirements_key,
+                self.package_platform,
+                self.template_data["options"]["target_arch"],
+                platform.machine(),
+                self.python_release.short,
+                self.python_release.standalone,
+                flet.version.flet_version,
+                self._serious_python_dependency(),
+                [
+                    a
+                    for i, a in enumerate(package_args)
+                    if a in ("--compile-packages", "--cleanup-packages")
+                    or package_args[i - 1] == "--cleanup-package-files"
+                ],
+                {
+                    k: v
+                    for k, v in package_env.items()
+                    if k
+                    in (
+                        "SERIOUS_PYTHON_ALLOW_SOURCE_DISTRIBUTIONS",
+                        "SERIOUS_PYTHON_DARWIN_SPM",
+                    )
+                },
+            )
+
+        if not dev_packages_untracked:
             if not hash.has_changed():
                 package_args.append("--skip-site-packages")
+                self.trace_annotate(site_packages="unchanged")
                 # serious_python skips copying Flutter packages to the temp dir
                 # under --skip-site-packages, so register_flutter_extensions must
                 # keep (not wipe) the permanent flutter-packages copy from the
                 # previous build.
                 self.site_packages_skipped = True
+            elif store_key and restore_site_packages(
+                store_key,
+                {
+                    "site-packages": site_packages_dir,
+                    "flutter-packages": self.flutter_packages_dir,
+                },
+            ):
+                package_args.append("--skip-site-packages")
+                self.site_packages_skipped = True
+                self.trace_annotate(site_packages="store hit")
+                if self.verbose > 0:
+                    console.log(
+                        f"Reusing site-packages {store_key[:12]} from the store",
+                        style=verbose1_style,
+                    )
             else:
+                self.trace_annotate(site_packages="install")
                 if self.flutter_packages_dir.exists():
                     shutil.rmtree(self.flutter_packages_dir, ignore_errors=True)
 
-        package_result = self.run(
+        if store_key and not self.site_packages_skipped:
+            # never install through files hard-linked with a store entry
+            shutil.rmtree(site_packages_dir, ignore_errors=True)
+
+        package_result = self.run_dart_tool(
+            "serious_python:main",
             package_args,
-            cwd=str(self.flutter_dir),
             env=package_env,
             capture_output=self.verbose < 1,
         )
@@ -2509,6 +2811,15 @@ class BaseBuildCommand(BaseFlutterCommand):
                 console.log(package_result.stderr, style=error_style)
             self.cleanup(package_result.returncode)
 
+        if store_key and not self.site_packages_skipped:
+            save_site_packages(
+                store_key,
+                {
+                    "site-packages": site_packages_dir,
+                    "flutter-packages": self.flutter_packages_temp_dir,
+                },
+            )
+
         hash.commit()
 
         # verify the package output: web ships app/app.zip; native platforms
@@ -2526,20 +2837,55 @@ class BaseBuildCommand(BaseFlutterCommand):
 
         console.log(f"Packaged Python app {self.emojis['checkmark']}")
 
-        # Drop the matching Pyodide runtime into the Flutter project's web/
-        # directory so it ships in `flutter build web` output. Cached
-        # per-version under ~/.flet/pyodide/<version>/ so subsequent builds
-        # are no-ops.
-        if self.package_platform == "Emscripten":
-            from flet_cli.utils.pyodide import ensure_pyodide
+        if prepare_pyodide:
+            self.prepare_pyodide_runtime()
 
-            self.update_status("[bold blue]Preparing Pyodide runtime...")
-            pyodide_dest = self.flutter_dir / "web" / "pyodide"
-            ensure_pyodide(self.python_release.pyodide, pyodide_dest)
-            console.log(
-                f"Pyodide {self.python_release.pyodide} ready "
-                f"{self.emojis['checkmark']}"
-            )
+    def _serious_python_dependency(self):
+        """
+        Return the `serious_python` dependency spec of the Flutter project.
+        """
+
+        assert self.pubspec_path
+
+        if not os.path.exists(self.pubspec_path):
+            return None
+        pubspec = self.load_yaml(self.pubspec_path) or {}
+        for section in ("dependency_overrides", "dependencies"):
+            spec = (pubspec.get(section) or {}).get("serious_python")
+            if spec is not None:
+                return spec
+        return None
+
+    @traced_step()
+    def prepare_pyodide_runtime(self):
+        """
+        Place the Pyodide runtime matching the bundled Python into a web build.
+
+        Drops the runtime into the Flutter project's web/ directory so it ships
+        in `flutter build web` output. Cached per-version under
+        ~/.flet/cache/pyodide/<version>/ so subsequent builds are no-ops.
+        """
+
+        assert self.flutter_dir
+        assert self.build_dir
+
+        if self.package_platform != "Emscripten":
+            return
+
+        from flet_cli.utils.pyodide import ensure_pyodide
+
+        self.update_status("[bold blue]Preparing Pyodide runtime...")
+        pyodide_dest = self.flutter_dir / "web" / "pyodide"
+        ensure_pyodide(
+            self.python_release.pyodide,
+            pyodide_dest,
+            stamp_path=self.build_dir / ".hash" / "pyodide.json",
+            # copied into the build output by `flutter build web`
+            allow_hardlinks=True,
+        )
+        console.log(
+            f"Pyodide {self.python_release.pyodide} ready {self.emojis['checkmark']}"
+        )
 
     def get_bool_setting(self, cli_option, pyproj_setting, default_value):
         """
@@ -2777,6 +3123,7 @@ class BaseBuildCommand(BaseFlutterCommand):
             .replace("{product_name}", self.template_data["product_name"])
         )
 
+    @traced_step()
     def copy_build_output(self):
         """
         Copy generated platform artifacts into the requested output directory.
@@ -2793,22 +3140,11 @@ class BaseBuildCommand(BaseFlutterCommand):
             f"[bold blue]Copying build to [cyan]{self.rel_out_dir}[/cyan] directory...",
         )
 
-        def make_ignore_fn(out_dir, out_glob):
-            """
-            Create a shutil ignore callback that keeps only one selected output glob.
-            """
-
-            def ignore(path, names):
-                """
-                Filter sibling entries at `out_dir` so only `out_glob` is copied.
-                """
-
-                if path == out_dir and out_glob != "*":
-                    return [f for f in os.listdir(path) if f != out_glob]
-                return []
-
-            return ignore
-
+        # mirror the outputs instead of copying them afresh: only files that
+        # changed since the previous build are cloned or copied into `out_dir`,
+        # never hard-linked, so edits of the output stay out of the build tree
+        mirror = TreeMirror()
+        found_output = False
         for build_output in self.platforms[self.target_platform]["outputs"]:
             build_output_dir = self.resolve_output_path(build_output)
 
@@ -2823,21 +3159,30 @@ class BaseBuildCommand(BaseFlutterCommand):
             if not os.path.exists(build_output_dir):
                 continue
 
-            if self.out_dir.exists():
-                shutil.rmtree(str(self.out_dir))
-            self.out_dir.mkdir(parents=True, exist_ok=True)
-
-            # copy build result to out_dir
-            copy_tree(
+            # like the output directory, the mirror holds the last output only
+            mirror.clear()
+            found_output = True
+            mirror.add(
                 build_output_dir,
-                str(self.out_dir),
-                ignore=make_ignore_fn(build_output_dir, build_output_glob),
+                names=None if build_output_glob == "*" else [build_output_glob],
             )
 
         if self.target_platform == "web" and self.assets_path.exists():
             # copy `assets` directory contents to the output directory
-            copy_tree(str(self.assets_path), str(self.out_dir))
-        elif self.target_platform in {"apk", "aab"}:
+            mirror.add(self.assets_path)
+
+        stats = mirror.sync(self.out_dir, delete=found_output)
+        if self.verbose > 0:
+            console.log(
+                f"Build output: {stats.linked} updated, {stats.unchanged} "
+                f"unchanged, {stats.removed} removed",
+                style=verbose1_style,
+            )
+        self.trace_annotate(
+            linked=stats.linked, unchanged=stats.unchanged, removed=stats.removed
+        )
+
+        if self.target_platform in {"apk", "aab"}:
             self.rename_android_build_outputs()
 
         console.log(
@@ -2995,9 +3340,123 @@ class BaseBuildCommand(BaseFlutterCommand):
             console.log(f'Found "{image_name}" image at {best}', style=verbose1_style)
         copy_ops.append((best, dest_path))
         hash.update(best)
-        hash.update(Path(best).stat().st_mtime)
+        hash.update_file(best)
         return Path(best).name
 
+    def run_dart_tool(
+        self,
+        tool: str,
+        args: list[str],
+        env: Optional[dict] = None,
+        capture_output=True,
+    ):
+        """
+        Run a Dart package executable of the Flutter bootstrap project.
+
+        Equivalent to `dart run <tool> <args>`, but runs a cached kernel
+        snapshot of the tool when possible, compiling it on first use. Set
+        `FLET_CLI_NO_DART_SNAPSHOTS` to always use `dart run`.
+
+        Args:
+            tool: Executable as passed to `dart run`: `<package>[:<executable>]`.
+            args: Arguments passed to the tool.
+            env: Additional environment variables.
+            capture_output: Whether process output should be captured.
+
+        Returns:
+            Process result object returned by `flet_cli.utils.processes.run`.
+        """
+
+        assert self.flutter_dir
+
+        command = [self.dart_exe, "run", "--suppress-analytics", tool]
+        if not get_bool_env_var("FLET_CLI_NO_DART_SNAPSHOTS"):
+            # `dart run` resolves a changed pubspec.yaml itself; do the same
+            # before trusting the resolved package config
+            if dependencies_stale(self.flutter_dir):
+                self.resolve_flutter_dependencies()
+            snapshot = self._ensure_tool_snapshot(tool)
+            if snapshot:
+                package_config = package_config_path(self.flutter_dir)
+                command = [self.dart_exe, f"--packages={package_config}", snapshot]
+
+        return self.run(
+            [*command, *args],
+            cwd=str(self.flutter_dir),
+            env=env,
+            capture_output=capture_output,
+        )
+
+    def _ensure_tool_snapshot(self, tool: str) -> Optional[str]:
+        """
+        Return the path of a kernel snapshot of `tool`, compiling it if needed.
+
+        Returns:
+            Snapshot path, or `None` when the tool should run through `dart run`.
+        """
+
+        assert self.flutter_dir
+
+        located = get_tool_snapshot(self.dart_exe, self.flutter_dir, tool)
+        if located is None:
+            self.trace_annotate(snapshot="unavailable")
+            return None
+        snapshot, entry_point = located
+        use_artifact("dart-snapshot", snapshot.parent)
+        if not snapshot.exists():
+            # another build may be compiling the same snapshot: wait for it;
+            # cache pruning skips the artifact while the lock is held
+            with file_lock(artifact_lock_name("dart-snapshot", snapshot.parent)):
+                if not snapshot.exists():
+                    return self._compile_tool_snapshot(tool, snapshot, entry_point)
+        self.trace_annotate(snapshot="hit")
+        record_use("dart-snapshot", snapshot.parent, hit=True)
+        return str(snapshot)
+
+    def _compile_tool_snapshot(
+        self, tool: str, snapshot: Path, entry_point: Path
+    ) -> Optional[str]:
+        """
+        Compile a kernel snapshot of `tool` and publish it at `snapshot`.
+
+        Returns:
+            Snapshot path, or `None` when compilation failed.
+        """
+
+        assert self.flutter_dir
+
+        self.trace_annotate(snapshot="miss")
+        self.update_status(f"[bold blue]Compiling {tool}...")
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp_snapshot = snapshot.with_name(
+            f"{snapshot.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        compile_result = self.run(
+            [
+                self.dart_exe,
+                "compile",
+                "kernel",
+                f"--packages={package_config_path(self.flutter_dir)}",
+                "-o",
+                str(tmp_snapshot),
+                str(entry_point),
+            ],
+            cwd=str(self.flutter_dir),
+            capture_output=True,
+        )
+        if compile_result.returncode != 0 or not tmp_snapshot.exists():
+            if self.verbose > 0:
+                console.log(
+                    f"Unable to compile a snapshot of {tool}, using dart run: "
+                    f"{compile_result.stderr or compile_result.stdout}",
+                    style=verbose1_style,
+                )
+            tmp_snapshot.unlink(missing_ok=True)
+            return None
+        os.replace(tmp_snapshot, snapshot)
+        record_use("dart-snapshot", snapshot.parent, hit=False)
+        return str(snapshot)
+
     def run(self, args, cwd, env: Optional[dict] = None, capture_output=True):
         """
         Run subprocess with merged environment and optional verbose logging.
@@ -3015,13 +3474,16 @@ class BaseBuildCommand(BaseFlutterCommand):
         if self.verbose > 0:
             console.log(f"Run subprocess: {args}", style=verbose1_style)
 
-        return processes.run(
-            args,
-            cwd,
-            env={**self.env, **env} if env else self.env,
-            capture_output=capture_output,
-            log=self.log_stdout,
-        )
+        with self.trace_subprocess(args) as span:
+            result = processes.run(
+                args,
+                cwd,
+                env={**self.env, **env} if env else self.env,
+                capture_output=capture_output,
+                log=self.log_stdout,
+            )
+            span["exit_code"] = result.returncode
+        return result
 
     def load_yaml(self, path):
         """
@@ -0,0 +1,414 @@
+import argparse
+import os
+import platform
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress import Progress
+from rich.style import Style
+from rich.table import Column, Table
+
+import flet.version
+import flet_cli.utils.processes as processes
+from flet_cli.commands.base import BaseCommand
+from flet_cli.commands.build import TARGET_PLATFORMS
+from flet_cli.utils.cache_index import (
+    MAX_SIZE_ENV,
+    CacheArtifact,
+    artifact_locations,
+    format_size,
+    kind_stats,
+    list_artifacts,
+    max_cache_size,
+    parse_size,
+    prune,
+)
+
+error_style = Style(color="red1", bold=True)
+success_style = Style(color="green", bold=True)
+console = Console(log_path=False)
+
+# `flutter precache` flags of the engine artifacts each target builds with
+PRECACHE_FLAGS = {
+    "macos": "--macos",
+    "linux": "--linux",
+    "windows": "--windows",
+    "web": "--web",
+    "apk": "--android",
+    "aab": "--android",
+    "ipa": "--ios",
+    "ios-simulator": "--ios",
+}
+
+
+def _display_path(path: Path) -> str:
+    try:
+        return f"~/{path.relative_to(Path.home()).as_posix()}"
+    except ValueError:
+        return str(path)
+
+
+class Command(BaseCommand):
+    """
+    Inspect, prune and prefetch cached build inputs.
+
+    Lists the build templates, Python manifests, Pyodide runtimes,
+    site-packages, Dart tool snapshots, Flutter SDKs and JDKs kept between
+    builds, reports hit rates per kind, evicts the least recently used ones,
+    and downloads everything builds for given targets need ahead of time.
+    """
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        """
+        Register command-line options for cache management.
+
+        Args:
+            parser: Argument parser configured by the command runner.
+        """
+
+        parser.add_argument(
+            "action",
+            type=str.lower,
+            nargs="?",
+            default="list",
+            choices=["list", "stats", "prune", "prefetch"],
+            help="List cached artifacts, show statistics per artifact kind, "
+            "evict artifacts, or download build inputs ahead of time",
+        )
+        parser.add_argument(
+            "--kind",
+            dest="kinds",
+            action="append",
+            choices=[kind for kind, _, _ in artifact_locations()],
+            help="Only include artifacts of this kind (can be repeated)",
+        )
+        parser.add_argument(
+            "--max-size",
+            dest="max_size",
+            help="prune: evict least recently used artifacts until the cache "
+            f"takes at most this size, e.g. 20G (default: ${MAX_SIZE_ENV})",
+        )
+        parser.add_argument(
+            "--older-than",
+            dest="older_than",
+            type=float,
+            help="prune: evict artifacts unused for this many days",
+        )
+        parser.add_argument(
+            "--dry-run",
+            dest="dry_run",
+            action="store_true",
+            default=False,
+            help="prune: only show what would be evicted",
+        )
+        parser.add_argument(
+            "--targets",
+            dest="targets",
+            default="web",
+            help="prefetch: comma-separated target platforms to prepare for, "
+            f"from: {', '.join(TARGET_PLATFORMS)}",
+        )
+        parser.add_argument(
+            "--python",
+            dest="python_versions",
+            help="prefetch: comma-separated Python versions to prepare for, "
+            "e.g. 3.12,3.13 (default: the default bundled version)",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=4,
+            help="prefetch: maximum number of concurrent downloads",
+        )
+
+    def handle(self, options: argparse.Namespace) -> None:
+        """
+        Run the requested cache action.
+
+        Args:
+            options: Parsed command-line options.
+        """
+
+        if options.action == "prune":
+            self.prune(options)
+            return
+        if options.action == "prefetch":
+            self.prefetch(options)
+            return
+
+        artifacts = [
+            a for a in list_artifacts() if not options.kinds or a.kind in options.kinds
+        ]
+        if options.action == "stats":
+            self.print_stats(artifacts, options.kinds)
+        else:
+            self.print_artifacts(artifacts)
+
+    def print_artifacts(self, artifacts: list[CacheArtifact]) -> None:
+        """
+        Print cached artifacts, most recently used first.
+
+        Args:
+            artifacts: Artifacts to list.
+        """
+
+        if not artifacts:
+            console.print("The cache is empty.")
+            return
+
+        table = Table(
+            Column("Kind", style="cyan"),
+            Column("Path"),
+            Column("Size", justify="right"),
+            Column("Last used"),
+            Column("Hits", justify="right"),
+            Column("Misses", justify="right"),
+        )
+        for a in sorted(artifacts, key=lambda a: a.last_used, reverse=True):
+            table.add_row(
+                a.kind,
+                _display_path(a.path),
+                format_size(a.size),
+                datetime.fromtimestamp(a.last_used).strftime("%Y-%m-%d %H:%M"),
+                str(a.hits),
+                str(a.misses),
+            )
+        console.print(table)
+        console.print(f"Total: {format_size(sum(a.size for a in artifacts))}")
+
+    def print_stats(
+        self, artifacts: list[CacheArtifact], kinds: Optional[list[str]]
+    ) -> None:
+        """
+        Print size and hit rate per artifact kind.
+
+        Hits and misses include those of artifacts evicted since.
+
+        Args:
+            artifacts: Current artifacts.
+            kinds: Kinds to report, or `None` for all.
+        """
+
+        stats = kind_stats()
+        table = Table(
+            Column("Kind", style="cyan"),
+            Column("Artifacts", justify="right"),
+            Column("Size", justify="right"),
+            Column("Hits", justify="right"),
+            Column("Misses", justify="right"),
+            Column("Hit rate", justify="right"),
+        )
+        for kind, _, _ in artifact_locations():
+            if kinds and kind not in kinds:
+                continue
+            of_kind = [a for a in artifacts if a.kind == kind]
+            hits = stats.get(kind, {}).get("hits", 0)
+            misses = stats.get(kind, {}).get("misses", 0)
+            table.add_row(
+                kind,
+                str(len(of_kind)),
+                format_size(sum(a.size for a in of_kind)),
+                str(hits),
+                str(misses),
+                f"{hits / (hits + misses):.0%}" if hits + misses else "-",
+            )
+        console.print(table)
+
+        budget = max_cache_size()
+        total = format_size(sum(a.size for a in artifacts))
+        console.print(
+            f"Total: {total}"
+            + (f" of {format_size(budget)} budget" if budget is not None else "")
+        )
+
+    def prune(self, options: argparse.Namespace) -> None:
+        """
+        Evict artifacts by size budget and/or age.
+
+        Args:
+            options: Parsed command-line options.
+        """
+
+        try:
+            max_size = (
+                parse_size(options.max_size) if options.max_size else max_cache_size()
+            )
+        except ValueError as e:
+            console.print(str(e), style=error_style)
+            exit(1)
+
+        if max_size is None and options.older_than is None:
+            console.print(
+                f"Specify --max-size, --older-than or set ${MAX_SIZE_ENV}.",
+                style=error_style,
+            )
+            exit(1)
+
+        evicted = prune(
+            max_size=max_size,
+            older_than=(
+                options.older_than * 86400 if options.older_than is not None else None
+            ),
+            kinds=options.kinds,
+            dry_run=options.dry_run,
+        )
+        if not evicted:
+            console.print("Nothing to prune.")
+            return
+
+        verb = "Would evict" if options.dry_run else "Evicted"
+        for a in evicted:
+            if options.dry_run or options.verbose > 0:
+                console.print(
+                    f"{verb} [cyan]{a.kind}[/cyan] {_display_path(a.path)} "
+                    f"({format_size(a.size)})"
+                )
+        console.print(
+            f"{verb} {len(evicted)} artifact(s), "
+            f"{format_size(sum(a.size for a in evicted))}",
+            style=success_style,
+        )
+
+    def prefetch(self, options: argparse.Namespace) -> None:
+        """
+        Download everything builds for the given targets fetch on first use.
+
+        Fetches the python-build manifest, then concurrently the build
+        template, Pyodide runtimes (web), the Flutter SDK with the engine
+        artifacts of the targets, and the JDK with Android SDK packages
+        (apk/aab). Python distributions for native targets and Dart/Gradle
+        packages are resolved by the build itself and aren't covered.
+
+        Args:
+            options: Parsed command-line options.
+        """
+
+        from flet_cli.commands.build_base import DEFAULT_TEMPLATE_URL
+        from flet_cli.utils.android_sdk import AndroidSDK
+        from flet_cli.utils.flutter import install_flutter
+        from flet_cli.utils.jdk import install_jdk
+        from flet_cli.utils.pyodide import ensure_pyodide_cache
+        from flet_cli.utils.python_versions import (
+            get_default_python_version,
+            get_release,
+            supported_short_versions,
+        )
+        from flet_cli.utils.template_cache import (
+            get_cached_template_dir,
+            get_cached_template_zip,
+        )
+
+        targets = [t.strip().lower() for t in options.targets.split(",") if t.strip()]
+        unknown = [t for t in targets if t not in TARGET_PLATFORMS]
+        if unknown or not targets:
+            console.print(
+                f"Unknown target platform(s): {', '.join(unknown) or '(none)'}. "
+                f"Choose from: {', '.join(TARGET_PLATFORMS)}.",
+                style=error_style,
+            )
+            exit(1)
+
+        def log(message) -> None:
+            if options.verbose > 0:
+                console.log(message)
+
+        # the manifest lists the Python releases: fetch it first
+        try:
+            default_python_version = get_default_python_version()
+        except RuntimeError as e:
+            console.print(str(e), style=error_style)
+            exit(1)
+        python_versions = (
+            [v.strip() for v in options.python_versions.split(",") if v.strip()]
+            if options.python_versions
+            else [default_python_version]
+        )
+        releases = [get_release(v) for v in python_versions]
+        if None in releases:
+            console.print(
+                f"Unsupported Python version(s) in {options.python_versions!r}. "
+                f"Supported: {', '.join(supported_short_versions())}.",
+                style=error_style,
+            )
+            exit(1)
+
+        progress = Progress(transient=True)
+        status = console.status("[bold blue]Prefetching build inputs...")
+        jobs: dict[str, Callable[[], None]] = {}
+
+        template_ref = flet.version.flet_version
+
+        def prefetch_template() -> None:
+            template_zip = get_cached_template_zip(
+                DEFAULT_TEMPLATE_URL.format(version=template_ref), template_ref
+            )
+            get_cached_template_dir(template_zip)
+
+        jobs[f"build template {template_ref}"] = prefetch_template
+
+        if "web" in targets:
+            for pyodide_version in sorted({r.pyodide for r in releases if r}):
+                jobs[f"Pyodide {pyodide_version}"] = (
+                    lambda v=pyodide_version: ensure_pyodide_cache(v, progress)
+                )
+
+        flutter_version = flet.version.flutter_version
+
+        def prefetch_flutter() -> None:
+            flutter_dir = install_flutter(flutter_version, log, progress=progress)
+            ext = ".bat" if platform.system() == "Windows" else ""
+            flags = sorted({PRECACHE_FLAGS[t] for t in targets})
+            result = processes.run(
+                [
+                    os.path.join(flutter_dir, "bin", f"flutter{ext}"),
+                    "precache",
+                    "--no-version-check",
+                    "--suppress-analytics",
+                    *flags,
+                ],
+                os.getcwd(),
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"flutter precache failed: {result.stderr or result.stdout}"
+                )
+
+        jobs[f"Flutter {flutter_version}"] = prefetch_flutter
+
+        if {"apk", "aab"} & set(targets):
+
+            def prefetch_android() -> None:
+                java_home = install_jdk(log, progress=progress)
+                AndroidSDK(java_home, log, progress=progress).install()
+
+            jobs["JDK and Android SDK"] = prefetch_android
+
+        failed = []
+        with Live(Group(status, progress), console=console, transient=True):
+            with ThreadPoolExecutor(max_workers=max(1, options.jobs)) as executor:
+                futures: dict[Future, str] = {
+                    executor.submit(job): name for name, job in jobs.items()
+                }
+                for future in wait(futures).done:
+                    name = futures[future]
+                    error = future.exception()
+                    if error is None:
+                        console.log(f"Prefetched {name}")
+                    else:
+                        failed.append(name)
+                        console.log(
+                            f"Failed to prefetch {name}: {error}", style=error_style
+                        )
+
+        if failed:
+            exit(1)
+        console.print(
+            f"Build inputs for {', '.join(targets)} are cached.", style=success_style
+        )
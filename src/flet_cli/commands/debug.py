@@ -7,6 +7,7 @@ from rich.console import Group
 from rich.live import Live
 
 from flet_cli.commands.build_base import BaseBuildCommand, console, verbose2_style
+from flet_cli.utils.trace import traced_step
 
 
 class Command(BaseBuildCommand):
@@ -160,6 +161,7 @@ class Command(BaseBuildCommand):
             ]:
                 args.extend(["--route", self.options.route])
 
+    @traced_step()
     def run_flutter(self):
         """
         Run the prepared Flutter project on the selected target device.
@@ -1,9 +1,11 @@
 import argparse
+import contextlib
 import os
 import platform
 import re
 import shutil
 import sys
+from pathlib import Path
 from typing import Any, Optional
 
 from packaging import version
@@ -19,7 +21,15 @@ import flet_cli.utils.processes as processes
 from flet.utils import cleanup_path, is_windows
 from flet.utils.platform_utils import get_bool_env_var
 from flet_cli.commands.base import BaseCommand
-from flet_cli.utils.flutter import get_flutter_dir, install_flutter
+from flet_cli.utils.cache_index import record_use
+from flet_cli.utils.file_lock import add_wait_listener
+from flet_cli.utils.flutter import (
+    get_flutter_config,
+    get_flutter_dir,
+    install_flutter,
+)
+from flet_cli.utils.toolchain_cache import file_stamp, get_cached, set_cached
+from flet_cli.utils.trace import BuildTracer, traced_step
 
 # Detect the plain-output request BEFORE building the shared console: the
 # `--no-rich-output` argparse flag is parsed per-command, too late to
@@ -77,6 +87,7 @@ class BaseFlutterCommand(BaseCommand):
         }
         self.assume_yes = False
         self._android_install_confirmed = False
+        self.tracer: Optional[BuildTracer] = None
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         """
@@ -121,7 +132,24 @@ class BaseFlutterCommand(BaseCommand):
         self.no_rich_output = self.no_rich_output or self.options.no_rich_output
         self.verbose = self.options.verbose
         self.assume_yes = getattr(self.options, "assume_yes", False)
+        add_wait_listener(self.on_cache_lock_wait)
+
+    def on_cache_lock_wait(self, name: str, seconds: float) -> None:
+        """
+        Report time spent waiting for another process to fill the cache.
 
+        Args:
+            name: Name of the cache lock waited for.
+            seconds: Time waited, in seconds.
+        """
+
+        self.trace_annotate(lock_wait=f"{name} {seconds:.1f}s")
+        if self.verbose > 0:
+            console.log(
+                f"Waited {seconds:.1f}s for cache lock {name}", style=verbose1_style
+            )
+
+    @traced_step("initialize_toolchain")
     def initialize_command(self):
         """
         Validate prerequisites and prepare Flutter/Android toolchain.
@@ -178,6 +206,10 @@ class BaseFlutterCommand(BaseCommand):
                         "Re-run with --yes to install automatically.",
                     )
             self.install_flutter()
+        else:
+            managed_dir = get_flutter_dir(str(self.required_flutter_version))
+            if self.flutter_exe.startswith(managed_dir + os.sep):
+                record_use("flutter-sdk", managed_dir, hit=True)
 
         if self.verbose > 0:
             console.log("Flutter executable:", self.flutter_exe, style=verbose2_style)
@@ -203,29 +235,47 @@ class BaseFlutterCommand(BaseCommand):
         """
 
         assert self.required_flutter_version
-        version_results = self.run(
-            [
-                self.flutter_exe,
-                "--version",
-                "--no-version-check",
-                "--suppress-analytics",
-            ],
-            cwd=os.getcwd(),
-            capture_output=True,
+
+        # `flutter --version` takes seconds; reuse the version found for this SDK
+        # until its version files change
+        flutter_exe = os.path.realpath(
+            shutil.which(self.flutter_exe) or self.flutter_exe
+        )
+        sdk_dir = Path(flutter_exe).parent.parent
+        stamp = file_stamp(
+            [sdk_dir / "version", sdk_dir / "bin" / "cache" / "flutter.version.json"]
+        )
+        installed_version = get_cached("flutter_version", flutter_exe, stamp)
+        self.trace_annotate(flutter_version="hit" if installed_version else "miss")
+
+        if installed_version is None:
+            version_results = self.run(
+                [
+                    self.flutter_exe,
+                    "--version",
+                    "--no-version-check",
+                    "--suppress-analytics",
+                ],
+                cwd=os.getcwd(),
+                capture_output=True,
+            )
+            if version_results.returncode == 0 and version_results.stdout:
+                match = re.search(r"Flutter (\d+\.\d+\.\d+)", version_results.stdout)
+                if match:
+                    installed_version = match.group(1)
+                    set_cached("flutter_version", flutter_exe, stamp, installed_version)
+            else:
+                console.log(1, "Failed to validate Flutter version.")
+
+        if installed_version is None:
+            return False
+
+        # validate installed Flutter version
+        flutter_version = version.parse(installed_version)
+        return (
+            flutter_version.major == self.required_flutter_version.major
+            and flutter_version.minor == self.required_flutter_version.minor
         )
-        if version_results.returncode == 0 and version_results.stdout:
-            match = re.search(r"Flutter (\d+\.\d+\.\d+)", version_results.stdout)
-            if match:
-                flutter_version = version.parse(match.group(1))
-
-                # validate installed Flutter version
-                return (
-                    flutter_version.major == self.required_flutter_version.major
-                    and flutter_version.minor == self.required_flutter_version.minor
-                )
-        else:
-            console.log(1, "Failed to validate Flutter version.")
-        return False
 
     def install_flutter(self):
         """
@@ -296,29 +346,33 @@ class BaseFlutterCommand(BaseCommand):
         jdk_dir = install_jdk(self.log_stdout, progress=self.progress)
         self.env["JAVA_HOME"] = jdk_dir
 
-        # config flutter's JDK dir
-        if self.verbose > 0:
-            console.log(
-                "Configuring Flutter's path to JDK",
-                style=verbose1_style,
+        # config flutter's JDK dir; `flutter config` takes seconds, so skip it
+        # when the setting is already in place
+        if get_flutter_config("jdk-dir") == jdk_dir:
+            self.trace_annotate(flutter_jdk_dir="unchanged")
+        else:
+            if self.verbose > 0:
+                console.log(
+                    "Configuring Flutter's path to JDK",
+                    style=verbose1_style,
+                )
+            config_result = self.run(
+                [
+                    self.flutter_exe,
+                    "config",
+                    "--no-version-check",
+                    "--suppress-analytics",
+                    f"--jdk-dir={jdk_dir}",
+                ],
+                cwd=os.getcwd(),
+                capture_output=self.verbose < 1,
             )
-        config_result = self.run(
-            [
-                self.flutter_exe,
-                "config",
-                "--no-version-check",
-                "--suppress-analytics",
-                f"--jdk-dir={jdk_dir}",
-            ],
-            cwd=os.getcwd(),
-            capture_output=self.verbose < 1,
-        )
-        if config_result.returncode != 0:
-            if isinstance(config_result.stdout, str):
-                console.log(config_result.stdout, style=verbose1_style)
-            if isinstance(config_result.stderr, str):
-                console.log(config_result.stderr, style=error_style)
-            self.cleanup(config_result.returncode)
+            if config_result.returncode != 0:
+                if isinstance(config_result.stdout, str):
+                    console.log(config_result.stdout, style=verbose1_style)
+                if isinstance(config_result.stderr, str):
+                    console.log(config_result.stderr, style=error_style)
+                self.cleanup(config_result.returncode)
 
         if self.verbose > 0:
             console.log(f"JDK installed {self.emojis['checkmark']}")
@@ -429,14 +483,50 @@ class BaseFlutterCommand(BaseCommand):
         if self.verbose > 0:
             console.log(f"Run subprocess: {args}", style=verbose1_style)
 
-        return processes.run(
-            args,
-            cwd,
-            env={**self.env, **env} if env else self.env,
-            capture_output=capture_output,
-            log=self.log_stdout,
+        with self.trace_subprocess(args) as span:
+            result = processes.run(
+                args,
+                cwd,
+                env={**self.env, **env} if env else self.env,
+                capture_output=capture_output,
+                log=self.log_stdout,
+            )
+            span["exit_code"] = result.returncode
+        return result
+
+    def trace_subprocess(self, args):
+        """
+        Return a context manager tracing a subprocess when tracing is enabled.
+
+        Args:
+            args: Command and arguments of the subprocess.
+
+        Returns:
+            Context manager yielding the mutable span annotations.
+        """
+
+        if self.tracer is None:
+            return contextlib.nullcontext({})
+        # executable plus first sub-command, e.g. "flutter build" or "dart run"
+        parts = [os.path.basename(str(args[0]))]
+        subcommands = [str(a) for a in args[1:] if not str(a).startswith("-")]
+        if subcommands:
+            parts.append(os.path.basename(subcommands[0]))
+        return self.tracer.span(
+            " ".join(parts), "subprocess", command=" ".join(map(str, args))
         )
 
+    def trace_annotate(self, **args):
+        """
+        Annotate the innermost traced span of the current thread, if tracing.
+
+        Args:
+            args: Annotations to set, e.g. `cache="hit"`.
+        """
+
+        if self.tracer is not None:
+            self.tracer.annotate(**args)
+
     def cleanup(self, exit_code: int, message: Any = None, no_border: bool = False):
         """
         Finalize command output, optionally run Flutter doctor, and exit process.
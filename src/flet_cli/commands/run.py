@@ -7,6 +7,8 @@ import sys
 import tempfile
 import threading
 import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
 from pathlib import Path
 from urllib.parse import quote, urlparse, urlunparse
 
@@ -22,7 +24,18 @@ from flet.utils import (
     random_string,
 )
 from flet_cli.commands.base import BaseCommand
+from flet_cli.utils import module_reloader
+from flet_cli.utils.change_batcher import ChangeBatcher
+from flet_cli.utils.fork_server import ForkServer, is_fork_supported
+from flet_cli.utils.ignore_matcher import (
+    IgnoreMatcher,
+    PathPatterns,
+    escape_pattern,
+    plan_watches,
+)
+from flet_cli.utils.import_graph import ImportGraph
 from flet_cli.utils.pyproject_toml import load_pyproject_toml
+from flet_cli.utils.restart_timings import RestartTimings
 
 
 class Command(BaseCommand):
@@ -148,6 +161,54 @@ class Command(BaseCommand):
             help="Path to a directory containing static assets "
             "used by the app (e.g. images, fonts)",
         )
+        parser.add_argument(
+            "--reload",
+            dest="reload",
+            type=str.lower,
+            choices=["process", "module", "fork"],
+            default="process",
+            help="How to apply changes: restart the app process, reload "
+            "changed modules inside the running app and re-run its `main` on "
+            "connected pages (keeps imports and the server connection), or "
+            "restart the app process forked from a server with preloaded "
+            "modules (Linux and macOS)",
+        )
+        parser.add_argument(
+            "--preload",
+            dest="preload",
+            type=str,
+            default=None,
+            help="Comma-separated list of modules the `--reload=fork` server "
+            "imports ahead of time. Detected from the imports of the app's "
+            "files by default",
+        )
+        parser.add_argument(
+            "--restart-on",
+            dest="restart_on",
+            type=str,
+            default=None,
+            help="Comma-separated gitignore-style patterns of files that restart "
+            "the app when watching a directory, in addition to the Python files "
+            "the app imports (default: the assets directory and pyproject.toml). "
+            'Use "*" to restart on any change',
+        )
+        parser.add_argument(
+            "--timings",
+            dest="timings",
+            action="store_true",
+            default=False,
+            help="Measure each restart: change detection, shutdown of the old "
+            "app process, spawn and startup of the new one, with a rolling "
+            "p50/p95 summary",
+        )
+        parser.add_argument(
+            "--timings-file",
+            dest="timings_file",
+            type=str,
+            default=None,
+            help="Append the measurements of each restart to this JSON Lines "
+            "file (implies --timings)",
+        )
         parser.add_argument(
             "--ignore-dirs",
             dest="ignore_dirs",
@@ -225,12 +286,36 @@ class Command(BaseCommand):
 
         ignore_dirs = (
             [
-                str(script_dir.joinpath(directory).resolve())
+                os.path.abspath(script_dir.joinpath(directory.strip()))
                 for directory in options.ignore_dirs.split(",")
             ]
             if options.ignore_dirs
             else []
         )
+        ignore_matcher = IgnoreMatcher(str(script_dir), ignore_dirs)
+
+        # with a watched directory, restart only for files the app imports
+        # and those matching the restart patterns
+        import_graph = restart_patterns = None
+        if options.directory or options.recursive:
+            search_paths = [os.getcwd()]
+            if not options.module:
+                search_paths.insert(0, str(script_path.parent))
+            search_paths.extend(
+                p for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p
+            )
+            import_graph = ImportGraph(str(script_dir), str(script_path), search_paths)
+            if options.restart_on:
+                patterns = [p.strip() for p in options.restart_on.split(",")]
+            else:
+                patterns = ["/pyproject.toml"]
+                if assets_dir:
+                    rel = os.path.relpath(assets_dir, script_dir.resolve())
+                    if not rel.startswith(".."):
+                        patterns.append(
+                            f"/{escape_pattern(rel.replace(os.sep, '/'))}/"
+                        )
+            restart_patterns = PathPatterns(str(script_dir), patterns)
 
         # Dev-mode app storage under a hidden, Flet-namespaced `.flet/` dir so
         # it stays out of the way and is git-ignored. Mirrors a built app: the
@@ -294,11 +379,38 @@ class Command(BaseCommand):
             except Exception:
                 pass
 
+        fork_server = None
+        if options.reload == "fork":
+            if is_fork_supported():
+                fork_server = ForkServer(
+                    # the fork server runs in the app data directory
+                    script_path=os.path.abspath(script_path),
+                    target=options.script if options.module else str(script_path),
+                    is_module=options.module,
+                    script_args=list(options.script_args),
+                    preload=(
+                        [m.strip() for m in options.preload.split(",") if m.strip()]
+                        if options.preload
+                        else None
+                    ),
+                )
+            else:
+                print("--reload=fork is not supported on this platform.")
+
+        # `--reload=module` runs the app under the in-process reloader
+        reloader_args = (
+            ["-m", "flet_cli.utils.module_reloader"]
+            if options.reload == "module"
+            else []
+        )
         my_event_handler = Handler(
             args=[sys.executable, "-u"]
+            + reloader_args
             + ["-m"] * options.module
             + [options.script if options.module else script_path]
             + list(options.script_args),
+            reload_modules=options.reload == "module",
+            fork_server=fork_server,
             watch_directory=options.directory or options.recursive,
             script_path=str(script_path),
             port=port,
@@ -310,14 +422,23 @@ class Command(BaseCommand):
             android=options.android,
             hidden=options.hidden,
             assets_dir=assets_dir,
-            ignore_dirs=ignore_dirs,
+            ignore_matcher=ignore_matcher,
+            import_graph=import_graph,
+            restart_patterns=restart_patterns,
+            timings=(
+                RestartTimings(jsonl_path=options.timings_file)
+                if options.timings or options.timings_file
+                else None
+            ),
             flet_app_data_dir=str(flet_app_data_dir),
             flet_app_cache_dir=str(flet_app_cache_dir),
             flet_app_temp_dir=str(flet_app_temp_dir),
         )
 
         my_observer = Observer()
-        my_observer.schedule(my_event_handler, script_dir, recursive=options.recursive)
+        my_event_handler.schedule_watches(
+            my_observer, str(script_dir), recursive=options.recursive
+        )
         my_observer.start()
 
         try:
@@ -355,10 +476,15 @@ class Handler(FileSystemEventHandler):
         android,
         hidden,
         assets_dir,
-        ignore_dirs,
+        ignore_matcher,
+        import_graph,
+        restart_patterns,
+        timings,
         flet_app_data_dir,
         flet_app_cache_dir,
         flet_app_temp_dir,
+        reload_modules=False,
+        fork_server=None,
     ) -> None:
         super().__init__()
         self.args = args
@@ -373,8 +499,12 @@ class Handler(FileSystemEventHandler):
         self.android = android
         self.hidden = hidden
         self.assets_dir = assets_dir
-        self.ignore_dirs = ignore_dirs
-        self.last_time = time.time()
+        self.ignore_matcher = ignore_matcher
+        self.import_graph = import_graph
+        self.restart_patterns = restart_patterns
+        self.timings = timings
+        self.observer = None
+        self.watches = {}
         self.is_running = False
         self.fvp = None
         self.pid_file = None
@@ -384,6 +514,19 @@ class Handler(FileSystemEventHandler):
         self.flet_app_cache_dir = flet_app_cache_dir
         self.flet_app_temp_dir = flet_app_temp_dir
         self.terminate = threading.Event()
+        self.changes = ChangeBatcher(self.on_changes)
+        self.changes.seed([script_path])
+        self.fork_server = fork_server
+        self.reload_listener = None
+        self.reload_conn = None
+        # guards `reload_conn`, swapped by the `accept_reloaders` thread
+        self.reload_lock = threading.Lock()
+        if reload_modules:
+            self.reload_authkey = os.urandom(16)
+            self.reload_listener = Listener(
+                ("127.0.0.1", 0), authkey=self.reload_authkey
+            )
+            threading.Thread(target=self.accept_reloaders, daemon=True).start()
         self.start_process()
 
     def start_process(self):
@@ -436,9 +579,22 @@ class Handler(FileSystemEventHandler):
             else invocation_cwd
         )
 
+        if self.reload_listener is not None:
+            host, port = self.reload_listener.address
+            p_env[module_reloader.ADDRESS_ENV] = f"{host}:{port}"
+            p_env[module_reloader.AUTHKEY_ENV] = self.reload_authkey.hex()
+
         p_env["PYTHONIOENCODING"] = "utf-8"
         p_env["PYTHONWARNINGS"] = "default::DeprecationWarning"
 
+        if self.fork_server is not None:
+            try:
+                self.start_forked_process(p_env)
+                return
+            except (RuntimeError, OSError) as e:
+                print(f"{e} Restarting the app as a new process.")
+                self.fork_server = None
+
         self.p = subprocess.Popen(
             self.args,
             env=p_env,
@@ -451,31 +607,199 @@ class Handler(FileSystemEventHandler):
         th = threading.Thread(target=self.print_output, args=[self.p], daemon=True)
         th.start()
 
+    def start_forked_process(self, p_env):
+        """
+        Fork the application process from the fork server, starting it first.
+
+        Args:
+            p_env: Environment of the application process.
+
+        Raises:
+            RuntimeError: The fork server isn't running.
+            OSError: The fork server couldn't be started.
+        """
+
+        if self.fork_server.process is None:
+            # forked processes write to the output of the fork server
+            server = self.fork_server.start(p_env, cwd=self.flet_app_data_dir)
+            th = threading.Thread(target=self.print_output, args=[server], daemon=True)
+            th.start()
+        self.p = self.fork_server.spawn(p_env, cwd=self.flet_app_data_dir)
+        self.is_running = True
+
     def on_any_event(self, event):
         """
-        React to file-system events and trigger a debounced process restart.
+        Collect file-system events into a batch of changes.
 
-        Events coming from ignored directories are skipped. Restart is performed
-        for create/modify/delete/move events either on the target script or
-        within the watched directory tree.
+        Events coming from ignored directories are skipped. Create, modify,
+        delete and move events either on the target script or within the
+        watched directory tree are passed to the change batcher, which calls
+        `on_changes` once they stop arriving.
         """
 
-        for directory in self.ignore_dirs:
-            child = os.path.abspath(event.src_path)
-            # check if the file which triggered the reload is in the (ignored) directory
-            if os.path.commonpath([directory]) == os.path.commonpath(
-                [directory, child]
-            ):
-                return
+        if event.is_directory and event.event_type == "modified":
+            return  # reported for changes of its files
+
+        # editors often save by moving an ignored temporary file into place
+        paths = [
+            path
+            for path in (event.src_path, getattr(event, "dest_path", ""))
+            if path
+            and not self.ignore_matcher.is_ignored(path, is_dir=event.is_directory)
+        ]
+        if not paths:
+            return
+
+        if event.is_directory and self.observer is not None:
+            if event.event_type in ["deleted", "moved"]:
+                self.unwatch_directory(event.src_path)
+            new_directory = {
+                "created": event.src_path,
+                "moved": getattr(event, "dest_path", ""),
+            }.get(event.event_type)
+            if new_directory and new_directory in paths:
+                self.watch_new_directory(new_directory)
 
         if (
             self.watch_directory or event.src_path == self.script_path
         ) and event.event_type in ["modified", "deleted", "created", "moved"]:
-            current_time = time.time()
-            if (current_time - self.last_time) > 0.5 and self.is_running:
-                self.last_time = current_time
-                th = threading.Thread(target=self.restart_program, args=(), daemon=True)
-                th.start()
+            for path in paths:
+                self.changes.add(path)
+
+    def schedule_watches(self, observer, directory, recursive):
+        """
+        Schedule file-system watches of the script directory.
+
+        With `recursive`, ignored subtrees get no watches: directories
+        containing ignored ones are watched individually.
+
+        Args:
+            observer: Watchdog observer to schedule watches with.
+            directory: Script directory.
+            recursive: Whether to watch sub-directories.
+        """
+
+        if not recursive:
+            observer.schedule(self, directory, recursive=False)
+            return
+        self.observer = observer
+        for path, recursive_watch in plan_watches(directory, self.ignore_matcher):
+            self.watches[path] = observer.schedule(
+                self, path, recursive=recursive_watch
+            )
+
+    def watch_new_directory(self, path):
+        """
+        Watch a directory created in a tree watched without recursion.
+
+        Args:
+            path: Created directory.
+        """
+
+        if any(
+            watch.is_recursive and path.startswith(watched + os.sep)
+            for watched, watch in list(self.watches.items())
+        ):
+            return  # covered by a recursive watch
+        self.schedule_watches(self.observer, path, recursive=True)
+
+    def unwatch_directory(self, path):
+        """
+        Remove the watches of a deleted or moved directory and its children.
+
+        Args:
+            path: Deleted or moved directory.
+        """
+
+        for watched in list(self.watches):
+            if watched == path or watched.startswith(path + os.sep):
+                try:
+                    self.observer.unschedule(self.watches.pop(watched))
+                except KeyError:
+                    pass
+
+    def on_changes(self, paths, first_event):
+        """
+        Apply a batch of changed files: reload or restart the app once.
+
+        Args:
+            paths: Paths whose contents changed.
+            first_event: `time.monotonic()` of the batch's first event.
+        """
+
+        if not self.is_running:
+            return
+
+        script_dir = os.path.dirname(self.script_path)
+
+        def names(paths):
+            return ", ".join(
+                os.path.relpath(p, script_dir)
+                if p.startswith(script_dir + os.sep)
+                else p
+                for p in paths
+            )
+
+        if self.import_graph is not None:
+            app_paths = self.import_graph.update(paths)
+            ignored = [
+                p
+                for p in paths
+                if p not in app_paths and not self.restart_patterns.matches(p)
+            ]
+            if ignored:
+                print(f"Not used by the app, not restarting for: {names(ignored)}")
+            paths = [p for p in paths if p not in ignored]
+            if not paths:
+                return
+
+        print(f"Changed: {names(paths)}")
+
+        if not self.notify_reloader(paths):
+            if self.timings is not None:
+                self.timings.begin(first_event, paths)
+            self.restart_program()
+
+    def accept_reloaders(self):
+        """
+        Accept connections of in-process reloaders of started app processes.
+        """
+
+        while True:
+            try:
+                conn = self.reload_listener.accept()
+            except (AuthenticationError, EOFError):
+                continue
+            except OSError:
+                return
+            with self.reload_lock:
+                if self.reload_conn is not None:
+                    self.reload_conn.close()
+                self.reload_conn = conn
+
+    def notify_reloader(self, paths) -> bool:
+        """
+        Send changed paths to the in-process reloader of the running app.
+
+        Args:
+            paths: Changed file paths.
+
+        Returns:
+            `True` if the reloader was notified, `False` when the app process
+            has to be restarted instead.
+        """
+
+        with self.reload_lock:
+            conn = self.reload_conn
+            if conn is None or not self.is_running or self.p.poll() is not None:
+                return False
+            try:
+                conn.send(paths)
+                return True
+            except (OSError, ValueError):
+                conn.close()
+                self.reload_conn = None
+                return False
 
     def print_output(self, p):
         """
@@ -495,6 +819,8 @@ class Handler(FileSystemEventHandler):
                 break
             line = line.rstrip("\r\n")
             if line.startswith(self.page_url_prefix):
+                if self.timings is not None:
+                    self.timings.mark("ready")
                 if not self.page_url:
                     parts = line[len(self.page_url_prefix) + 1 :].split(" ", 1)
                     self.page_url = parts[0]
@@ -548,9 +874,19 @@ class Handler(FileSystemEventHandler):
         """
 
         self.is_running = False
+        with self.reload_lock:
+            if self.reload_conn is not None:
+                self.reload_conn.close()
+                self.reload_conn = None
+        if self.timings is not None:
+            self.timings.mark("terminating")
         self.p.send_signal(signal.SIGTERM)
         self.p.wait()
+        if self.timings is not None:
+            self.timings.mark("exited")
         self.start_process()
+        if self.timings is not None:
+            self.timings.mark("spawned")
 
     def print_qr_code(self, orig_url: str, android: bool):
         """
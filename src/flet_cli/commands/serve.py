@@ -1,12 +1,15 @@
 import argparse
+import email.utils
 import http.server
-import socketserver
+import os
+from http import HTTPStatus
 from pathlib import Path
 
 from rich.console import Console
 from rich.style import Style
 
 from flet_cli.commands.base import BaseCommand
+from flet_cli.utils.compressed_assets import negotiate_encoding
 
 error_style = Style(color="red1", bold=True)
 console = Console(log_path=False)
@@ -15,8 +18,22 @@ console = Console(log_path=False)
 class CustomHandler(http.server.SimpleHTTPRequestHandler):
     """
     Static-file request handler that injects cross-origin isolation headers.
+
+    Connections are kept alive between requests and file bodies are sent with
+    `sendfile()`, without copying them through Python buffers. Files are sent
+    compressed when the browser accepts it, see `negotiate_encoding()`.
     """
 
+    protocol_version = "HTTP/1.1"
+    # not known to `mimetypes` everywhere, but required for
+    # `WebAssembly.instantiateStreaming()` and ES modules
+    extensions_map = {
+        **http.server.SimpleHTTPRequestHandler.extensions_map,
+        ".js": "text/javascript",
+        ".mjs": "text/javascript",
+        ".wasm": "application/wasm",
+    }
+
     def __init__(self, *args, directory=None, **kwargs):
         super().__init__(*args, directory=directory, **kwargs)
 
@@ -28,8 +45,81 @@ class CustomHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header("Cross-Origin-Opener-Policy", "same-origin")
         self.send_header("Cross-Origin-Embedder-Policy", "require-corp")
         self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Vary", "Accept-Encoding")
         super().end_headers()
 
+    def send_head(self):
+        """
+        Send the headers of a file response, with a compressed body if the
+        browser accepts one.
+
+        Returns:
+            File object of the body, or `None` if there's no body to send.
+        """
+
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path) or path.endswith("/"):
+            return super().send_head()
+        ctype = self.guess_type(path)
+        encoded = negotiate_encoding(path, ctype, self.headers.get("Accept-Encoding"))
+        if encoded is None:
+            return super().send_head()
+        encoding, body_path = encoded
+        try:
+            mtime = int(os.stat(path).st_mtime)
+            f = open(body_path, "rb")
+        except OSError:
+            return super().send_head()
+
+        try:
+            if (
+                "If-Modified-Since" in self.headers
+                and "If-None-Match" not in self.headers
+            ):
+                try:
+                    ims = email.utils.parsedate_to_datetime(
+                        self.headers["If-Modified-Since"]
+                    )
+                except (TypeError, IndexError, OverflowError, ValueError):
+                    pass
+                else:
+                    if ims.tzinfo is not None and mtime <= ims.timestamp():
+                        self.send_response(HTTPStatus.NOT_MODIFIED)
+                        self.end_headers()
+                        f.close()
+                        return None
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Last-Modified", self.date_time_string(mtime))
+            self.end_headers()
+            return f
+        except BaseException:
+            f.close()
+            raise
+
+    def copyfile(self, source, outputfile):
+        """
+        Send a response body, zero-copy where the OS supports it.
+
+        Args:
+            source: File object opened for reading in binary mode.
+            outputfile: Stream the body is written to.
+        """
+
+        if outputfile is not self.wfile:
+            super().copyfile(source, outputfile)
+            return
+        try:
+            # falls back to plain `send()` for in-memory bodies or without
+            # `os.sendfile()`
+            self.connection.sendfile(source)
+        except ConnectionError:
+            # the browser cancelled the request
+            self.close_connection = True
+
 
 class Command(BaseCommand):
     """
@@ -89,7 +179,9 @@ class Command(BaseCommand):
             )
 
         try:
-            with socketserver.TCPServer(("", options.port), handler) as httpd:
+            with http.server.ThreadingHTTPServer(
+                ("", options.port), handler
+            ) as httpd:
                 console.print(
                     f"Serving [green]{directory}[/green] at [cyan]"
                     f"http://localhost:{options.port}[/cyan] (Press Ctrl+C to stop)\n"
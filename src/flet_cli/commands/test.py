@@ -10,6 +10,7 @@ from rich.console import Group
 from rich.live import Live
 
 from flet_cli.commands.build_base import BaseBuildCommand, console
+from flet_cli.utils.trace import traced_step
 
 # Maps the user-facing test platform to the build target_platform used to
 # provision the Flutter test host, plus the default device id for desktop.
@@ -217,6 +218,7 @@ class Command(BaseBuildCommand):
         exit_code = self._run_pytest(flutter_dir)
         sys.exit(exit_code)
 
+    @traced_step("pytest")
     def _run_pytest(self, flutter_dir: Path) -> int:
         assert self.python_app_path
         env = _flutter_path_env(self)
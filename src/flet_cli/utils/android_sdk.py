@@ -1,13 +1,13 @@
 import os
 import platform
-import tempfile
 from pathlib import Path
 from typing import Optional
 
 from rich.progress import Progress
 
 from flet_cli.utils import processes
-from flet_cli.utils.distros import download_with_progress, extract_with_progress
+from flet_cli.utils.distros import download_and_extract
+from flet_cli.utils.file_lock import file_lock
 
 ANDROID_CMDLINE_TOOLS_DOWNLOAD_VERSION = "11076708"
 ANDROID_CMDLINE_TOOLS_VERSION = "12.0"
@@ -254,6 +254,18 @@ class AndroidSDK:
             Android SDK home directory as a string.
         """
 
+        # another process may be installing the SDK: wait, then reuse it
+        with file_lock("android-sdk"):
+            return self._install()
+
+    def _install(self):
+        """
+        Install the SDK as described in `install()`, holding its lock.
+
+        Returns:
+            Android SDK home directory as a string.
+        """
+
         home_dir = AndroidSDK.android_home_dir()
         install = True
         if not home_dir:
@@ -289,23 +301,16 @@ class AndroidSDK:
             android_home: SDK home directory where `cmdline-tools` is created.
         """
 
-        archive_path = os.path.join(tempfile.gettempdir(), "commandlinetools.zip")
         url = self.cmdline_tools_url()
-        self.log(f"Downloading Android cmdline tools from {url}...")
-        download_with_progress(url, archive_path, progress=self.progress)
-
         unpack_dir = android_home / "cmdline-tools"
-        unpack_dir.mkdir(parents=True, exist_ok=True)
 
-        self.log(f"Extracting Android cmdline tools to {unpack_dir}...")
-        extract_with_progress(archive_path, str(unpack_dir), progress=self.progress)
+        self.log(f"Downloading and extracting Android cmdline tools from {url}...")
+        download_and_extract(url, unpack_dir, progress=self.progress)
 
         # rename "cmdline-tools/cmdline-tools" to "cmdline-tools/{version}"
         cmdlinetools_dir = unpack_dir / "cmdline-tools"
         cmdlinetools_dir.rename(unpack_dir / ANDROID_CMDLINE_TOOLS_VERSION)
 
-        os.remove(archive_path)
-
     def _install_package(self, home_dir: Path, package_name: str) -> int:
         """
         Install a single SDK package when it is not already present.
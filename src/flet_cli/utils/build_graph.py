@@ -0,0 +1,115 @@
+"""Dependency-graph scheduler for build pipeline steps.
+
+Steps declare the steps they depend on and the resources (paths or other
+named artifacts) they read and write. A step implicitly depends on every
+step declared before it that writes one of its inputs or outputs, so two
+steps touching the same resource never run at the same time. Independent
+steps run concurrently on a thread pool.
+"""
+
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class BuildStep:
+    name: str
+    run: Callable[[], object]
+    deps: set[str] = field(default_factory=set)
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+
+
+class BuildGraph:
+    """
+    A set of build steps with dependencies, run with a concurrency limit.
+    """
+
+    def __init__(self) -> None:
+        self._steps: dict[str, BuildStep] = {}
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[], object],
+        deps: Iterable[str] = (),
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ) -> None:
+        """
+        Declare a build step.
+
+        Args:
+            name: Unique step name.
+            run: Callable executing the step.
+            deps: Names of steps that must finish first.
+            inputs: Resources the step reads.
+            outputs: Resources the step writes.
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown.
+        """
+
+        if name in self._steps:
+            raise ValueError(f"Duplicate build step: {name}")
+        step = BuildStep(name, run, set(deps), tuple(inputs), tuple(outputs))
+        for dep in step.deps:
+            if dep not in self._steps:
+                raise ValueError(f"Build step {name} depends on unknown step {dep}")
+
+        # order against earlier writers of anything this step reads or writes
+        touched = set(step.inputs) | set(step.outputs)
+        for other in self._steps.values():
+            if touched.intersection(other.outputs):
+                step.deps.add(other.name)
+        self._steps[name] = step
+
+    def run(self, max_workers: int = 1) -> None:
+        """
+        Run all steps, respecting dependencies.
+
+        Ready steps are started in declaration order, so `max_workers=1`
+        reproduces a plain sequential pipeline. After the first failure no new
+        steps are started; running ones are awaited and the failure (including
+        `SystemExit` raised by a step) is re-raised in the calling thread.
+
+        Args:
+            max_workers: Maximum number of steps running at once.
+        """
+
+        max_workers = max(1, max_workers)
+        pending = dict(self._steps)
+        done: set[str] = set()
+        running: dict[Future, BuildStep] = {}
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="flet-build"
+        ) as executor:
+            while pending or running:
+                if error is None:
+                    for step in list(pending.values()):
+                        if len(running) >= max_workers:
+                            break
+                        if step.deps <= done:
+                            del pending[step.name]
+                            running[executor.submit(step.run)] = step
+
+                # dependencies always point at earlier steps, so nothing being
+                # runnable means a failure stopped the pipeline
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        error = error or exc
+                    else:
+                        done.add(step.name)
+
+        if error is not None:
+            raise error
@@ -0,0 +1,359 @@
+"""Index of cached build inputs, with a size budget and LRU eviction.
+
+Build templates, python-build manifests, Pyodide runtimes, site-packages,
+Dart tool snapshots, compressed `flet serve` assets (all under
+`get_cache_root()`) and the Flutter SDKs and JDKs installed under `~/flutter`
+and `~/java` are artifacts: directories or files that are reused as a whole.
+`~/.flet/cache/index.json` records the size, last use and hit/miss counts of
+each artifact plus per-kind totals.
+
+Artifacts present on disk but not yet indexed (e.g. created by an older
+release) are picked up by `list_artifacts`, with their modification time as
+last use.
+
+Updates of the index are serialized across processes with a file lock.
+
+When `FLET_CACHE_MAX_SIZE` is set (e.g. `20G`), adding an artifact evicts the
+least recently used ones until the total fits. Processes hold a shared lock on
+each artifact they use (`use_artifact`), and eviction skips artifacts whose
+lock it can't take, so artifacts used by concurrent builds are spared.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from flet_cli.utils.file_lock import file_lock, hold_shared_lock, try_file_lock
+from flet_cli.utils.template_cache import get_cache_root
+
+MAX_SIZE_ENV = "FLET_CACHE_MAX_SIZE"
+
+_lock = threading.Lock()
+
+
+@dataclass
+class CacheArtifact:
+    kind: str
+    path: Path
+    size: int
+    last_used: float
+    hits: int = 0
+    misses: int = 0
+
+
+def artifact_locations() -> list[tuple[str, Path, str]]:
+    """
+    Return where artifacts of each kind live.
+
+    Returns:
+        `(kind, directory, glob)` tuples; artifacts are the entries of
+        `directory` matching `glob`.
+    """
+
+    root = get_cache_root()
+    home = Path.home()
+    return [
+        ("build-template", root / "build-template", "v*"),
+        ("python-build", root / "python-build", "manifest-*.json"),
+        ("pyodide", root / "pyodide", "[0-9]*"),
+        ("site-packages", root / "site-packages", "*/*"),
+        ("dart-snapshot", root / "dart-snapshots", "*/*"),
+        ("compressed-asset", root / "compressed-assets", "*"),
+        ("flutter-sdk", home / "flutter", "[0-9]*"),
+        ("jdk", home / "java", "*+*"),
+    ]
+
+
+def artifact_lock_name(kind: str, path) -> str:
+    """
+    Return the name of the lock the producer of an artifact holds while
+    creating it.
+
+    Args:
+        kind: Artifact kind, one of those in `artifact_locations()`.
+        path: Artifact directory or file.
+    """
+
+    path = Path(path)
+    name = path.name
+    if kind == "build-template":
+        return f"build-template-{name}"
+    if kind == "python-build":
+        return f"python-build-{name.removeprefix('manifest-').removesuffix('.json')}"
+    if kind == "pyodide":
+        return f"pyodide-{name}"
+    if kind == "flutter-sdk":
+        return f"flutter-{name}"
+    if kind == "jdk":
+        return f"jdk-{name}"
+    if kind == "compressed-asset":
+        # held by `flet serve` for all of them
+        return "compressed-assets"
+    return f"{kind}-{path.parent.name}-{name}"
+
+
+def _use_lock_name(kind: str, path) -> str:
+    return f"{artifact_lock_name(kind, path)}.in-use"
+
+
+def use_artifact(kind: str, path) -> None:
+    """
+    Mark an artifact as used by this process until it exits, so that no
+    process evicts it.
+
+    Call it before checking for or creating the artifact.
+
+    Args:
+        kind: Artifact kind, one of those in `artifact_locations()`.
+        path: Artifact directory or file, existing or not.
+    """
+
+    hold_shared_lock(_use_lock_name(kind, path))
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as `500M`, `20G` or `1.5TiB` into bytes.
+
+    Raises:
+        ValueError: If `text` is not a valid size.
+    """
+
+    match = re.fullmatch(
+        r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", text, re.IGNORECASE
+    )
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit.upper() or " "))
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes for display."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+
+def max_cache_size() -> Optional[int]:
+    """Return the configured cache size budget in bytes, if any."""
+    value = os.environ.get(MAX_SIZE_ENV)
+    return parse_size(value) if value else None
+
+
+def _is_transient(path: Path) -> bool:
+    # temporary files of writers in progress and partial downloads
+    return path.name.startswith(".") or path.name.endswith(
+        (".tmp", "_temp", ".part", ".part.json")
+    )
+
+
+def _disk_size(path: Path) -> int:
+    try:
+        if not path.is_dir() or path.is_symlink():
+            return path.lstat().st_size
+    except OSError:
+        return 0
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _index_path() -> Path:
+    return get_cache_root() / "index.json"
+
+
+def _load() -> dict[str, Any]:
+    try:
+        with open(_index_path(), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data.setdefault("artifacts", {})
+    data.setdefault("kinds", {})
+    return data
+
+
+def _save(data: dict[str, Any]) -> None:
+    path = _index_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        # the index is best-effort
+        pass
+
+
+def _artifact(path: str, entry: dict[str, Any]) -> CacheArtifact:
+    return CacheArtifact(
+        kind=entry.get("kind", "unknown"),
+        path=Path(path),
+        size=entry.get("size", 0),
+        last_used=entry.get("last_used", 0.0),
+        hits=entry.get("hits", 0),
+        misses=entry.get("misses", 0),
+    )
+
+
+def record_use(kind: str, path, hit: bool) -> None:
+    """
+    Record a use of a cached artifact.
+
+    Args:
+        kind: Artifact kind, one of those in `artifact_locations()`.
+        path: Artifact directory or file.
+        hit: `True` when an existing artifact was reused, `False` when it
+            was just created; a new artifact may trigger eviction of others.
+    """
+
+    key = str(Path(path).absolute())
+    use_artifact(kind, key)
+    with _lock, file_lock("cache-index"):
+        data = _load()
+        entry = data["artifacts"].setdefault(key, {"kind": kind})
+        counter = "hits" if hit else "misses"
+        entry[counter] = entry.get(counter, 0) + 1
+        entry["last_used"] = time.time()
+        if not hit or "size" not in entry:
+            entry["size"] = _disk_size(Path(key))
+        kind_stats = data["kinds"].setdefault(kind, {})
+        kind_stats[counter] = kind_stats.get(counter, 0) + 1
+        _save(data)
+
+    if not hit:
+        budget = max_cache_size()
+        if budget is not None:
+            prune(max_size=budget)
+
+
+def list_artifacts() -> list[CacheArtifact]:
+    """
+    Return all cached artifacts, indexing those found on disk but not yet
+    recorded and forgetting those that no longer exist.
+    """
+
+    with _lock, file_lock("cache-index"):
+        data = _load()
+        artifacts = data["artifacts"]
+        found = set()
+        for kind, directory, pattern in artifact_locations():
+            if not directory.is_dir():
+                continue
+            for path in directory.glob(pattern):
+                if _is_transient(path):
+                    continue
+                key = str(path.absolute())
+                found.add(key)
+                if key not in artifacts or "size" not in artifacts[key]:
+                    entry = artifacts.setdefault(key, {"kind": kind})
+                    entry["size"] = _disk_size(path)
+                    entry.setdefault("last_used", path.stat().st_mtime)
+        for key in list(artifacts):
+            if key not in found and not os.path.exists(key):
+                del artifacts[key]
+        _save(data)
+    return [_artifact(k, e) for k, e in artifacts.items()]
+
+
+def kind_stats() -> dict[str, dict[str, int]]:
+    """
+    Return hit and miss counts per artifact kind, including those of evicted
+    artifacts.
+    """
+
+    with _lock, file_lock("cache-index"):
+        return _load()["kinds"]
+
+
+def _remove(artifact: CacheArtifact, dry_run: bool) -> bool:
+    """Evict an artifact unless it's being created or used by any process."""
+
+    path = artifact.path
+    with try_file_lock(artifact_lock_name(artifact.kind, path)) as idle:
+        if not idle:
+            return False
+        with try_file_lock(_use_lock_name(artifact.kind, path)) as unused:
+            if not unused:
+                return False
+            if dry_run:
+                return True
+            # move aside first, so a partially deleted artifact is never used
+            doomed = path.with_name(f"{path.name}.{os.getpid()}.evicted.tmp")
+            try:
+                os.rename(path, doomed)
+            except OSError:
+                return False
+    if doomed.is_dir() and not doomed.is_symlink():
+        shutil.rmtree(doomed, ignore_errors=True)
+    else:
+        doomed.unlink(missing_ok=True)
+    return True
+
+
+def prune(
+    max_size: Optional[int] = None,
+    older_than: Optional[float] = None,
+    kinds: Optional[list[str]] = None,
+    dry_run: bool = False,
+) -> list[CacheArtifact]:
+    """
+    Evict cached artifacts, least recently used first.
+
+    Artifacts being created, or used by any process, including this one, are
+    skipped.
+
+    Args:
+        max_size: Evict until all artifacts together take at most this many
+            bytes.
+        older_than: Evict artifacts unused for this many seconds.
+        kinds: Only evict artifacts of these kinds.
+        dry_run: Only report what would be evicted.
+
+    Returns:
+        Evicted (or, with `dry_run`, evictable) artifacts.
+    """
+
+    artifacts = sorted(list_artifacts(), key=lambda a: a.last_used)
+    total = sum(a.size for a in artifacts)
+    now = time.time()
+    evicted = []
+    for artifact in artifacts:
+        if kinds and artifact.kind not in kinds:
+            continue
+        too_old = older_than is not None and now - artifact.last_used > older_than
+        over_budget = max_size is not None and total > max_size
+        if not (too_old or over_budget):
+            continue
+        if not _remove(artifact, dry_run):
+            continue
+        evicted.append(artifact)
+        total -= artifact.size
+
+    if evicted and not dry_run:
+        with _lock, file_lock("cache-index"):
+            data = _load()
+            for artifact in evicted:
+                data["artifacts"].pop(str(artifact.path), None)
+            _save(data)
+    return evicted
@@ -0,0 +1,125 @@
+"""Collect file-system changes into batches for `flet run`.
+
+Saving several files, or a formatter rewriting a project, produces bursts of
+events. `ChangeBatcher` waits until no event arrived for a quiet period, then
+reports the paths of the burst once. Files whose contents didn't change, e.g.
+touched by an editor or rewritten identically by a formatter, are left out by
+comparing content hashes with those seen before.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import traceback
+from collections.abc import Iterable
+from typing import Callable, Optional
+
+from flet_cli.utils.fingerprint import hash_file
+
+# quiet period that ends a batch
+DEBOUNCE_SECONDS = 0.3
+# report a batch after this long even if events keep coming
+MAX_DELAY_SECONDS = 2.0
+
+
+def _content_hash(path: str) -> Optional[str]:
+    """Return the hash of a file, or `None` if it's gone or not a file."""
+
+    try:
+        return hash_file(path) if os.path.isfile(path) else None
+    except OSError:
+        return None
+
+
+class ChangeBatcher:
+    """
+    Aggregate changed paths and report them in trailing-edge batches.
+
+    Batches are reported by a single background thread, one at a time:
+    changes made while `on_batch` runs form the next batch.
+
+    Args:
+        on_batch: Called with the sorted paths whose contents changed and the
+            `time.monotonic()` of the batch's first event.
+        debounce: Quiet period, in seconds, that ends a batch.
+        max_delay: Longest time, in seconds, a change waits to be reported.
+    """
+
+    def __init__(
+        self,
+        on_batch: Callable[[list[str], float], None],
+        debounce: float = DEBOUNCE_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+    ):
+        self.on_batch = on_batch
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._pending: set[str] = set()
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._hashes: dict[str, Optional[str]] = {}
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def seed(self, paths: Iterable[str]) -> None:
+        """
+        Remember the current contents of files, so that touching them without
+        changes isn't reported.
+
+        Args:
+            paths: Files to hash.
+        """
+
+        for path in paths:
+            self._hashes[os.path.abspath(path)] = _content_hash(path)
+
+    def add(self, path: str) -> None:
+        """
+        Record a changed path and restart the quiet period.
+
+        Args:
+            path: Created, modified, deleted or moved path.
+        """
+
+        now = time.monotonic()
+        with self._condition:
+            if not self._pending:
+                self._first_event = now
+            self._pending.add(os.path.abspath(path))
+            self._last_event = now
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+                    now = time.monotonic()
+                    due = min(
+                        self._last_event + self.debounce,
+                        self._first_event + self.max_delay,
+                    )
+                    if now >= due:
+                        break
+                    self._condition.wait(due - now)
+                pending, self._pending = self._pending, set()
+                first_event = self._first_event
+
+            changed = [path for path in sorted(pending) if self._changed(path)]
+            if changed:
+                try:
+                    self.on_batch(changed, first_event)
+                except Exception:
+                    # keep batching: the next save may succeed
+                    traceback.print_exc()
+
+    def _changed(self, path: str) -> bool:
+        digest = _content_hash(path)
+        if path in self._hashes and self._hashes[path] == digest:
+            return False
+        self._hashes[path] = digest
+        return True
@@ -0,0 +1,208 @@
+"""Compressed response bodies for `flet serve`.
+
+Production hosts serve the multi-MB CanvasKit and Pyodide payloads of a Flet
+web app compressed. `negotiate_encoding` picks the encoding of a response
+from the request's `Accept-Encoding`, preferring `.br` and `.gz` files next
+to the requested one, as produced by a CDN pipeline or `brotli`/`gzip`
+command-line tools. Without such a sibling, compressible files are compressed
+on the fly once and kept in `~/.flet/cache/compressed-assets/`, one copy per
+file and encoding that is replaced when the file changes.
+
+Brotli compression on the fly requires the optional `brotli` package; gzip is
+always available.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# encoding -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+# smaller files aren't worth the `Content-Encoding` round trip
+MIN_SIZE = 1024
+
+# high ratios like a production build, but fast enough for a first request
+BROTLI_QUALITY = 9
+GZIP_LEVEL = 9
+
+_COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "application/xml",
+    "application/zip",
+    "image/svg+xml",
+}
+
+_locks: dict[str, threading.Lock] = {}
+_locks_lock = threading.Lock()
+# cached files recorded in the cache index by this process
+_recorded: set[str] = set()
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict[str, float]:
+    """
+    Parse an `Accept-Encoding` header into encodings and their q-values.
+
+    Args:
+        header: Header value, e.g. `gzip, deflate, br;q=0.9`.
+    """
+
+    accepted = {}
+    for item in (header or "").split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def is_compressible(content_type: str) -> bool:
+    """
+    Return whether responses of `content_type` are worth compressing.
+
+    Args:
+        content_type: MIME type, optionally with parameters.
+    """
+
+    content_type = content_type.split(";")[0].strip().lower()
+    return content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES
+
+
+def _fresh_sibling(path: str, suffix: str, mtime: float) -> Optional[str]:
+    sibling = path + suffix
+    try:
+        st = os.stat(sibling)
+    except OSError:
+        return None
+    # left behind by an earlier build of the file
+    if st.st_mtime < mtime:
+        return None
+    return sibling
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _remove_outdated(cache_dir: str, key: str, suffix: str, current: str) -> None:
+    # copies of earlier versions of the file, in the same encoding
+    for name in os.listdir(cache_dir):
+        old_path = os.path.join(cache_dir, name)
+        if name.startswith(f"{key}-") and name.endswith(suffix) and old_path != current:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass  # in use on Windows; replaced on a later change
+            _recorded.discard(old_path)
+
+
+def _cached(path: str, st: os.stat_result, encoding: str) -> Optional[str]:
+    from flet_cli.utils.cache_index import record_use, use_artifact
+    from flet_cli.utils.template_cache import get_cache_root
+
+    suffix = ENCODINGS[encoding]
+    key = hashlib.sha256(path.encode()).hexdigest()
+    cache_dir = str(get_cache_root() / "compressed-assets")
+    cache_path = os.path.join(
+        cache_dir, f"{key}-{st.st_size}-{st.st_mtime_ns}{suffix}"
+    )
+
+    with _locks_lock:
+        lock = _locks.setdefault(f"{key}{suffix}", threading.Lock())
+    with lock:
+        use_artifact("compressed-asset", cache_path)
+        hit = os.path.exists(cache_path)
+        if not hit:
+            try:
+                with open(path, "rb") as f:
+                    data = _compress(f.read(), encoding)
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path)
+                _remove_outdated(cache_dir, key, suffix, cache_path)
+            except OSError:
+                return None
+        if not hit or cache_path not in _recorded:
+            _recorded.add(cache_path)
+            record_use("compressed-asset", cache_path, hit=hit)
+
+    try:
+        # already compressed, e.g. a zip with deflated members
+        if os.path.getsize(cache_path) >= st.st_size:
+            return None
+    except OSError:
+        return None
+    return cache_path
+
+
+def negotiate_encoding(
+    path: str, content_type: str, accept_encoding: Optional[str]
+) -> Optional[tuple[str, str]]:
+    """
+    Choose a compressed body for a response with `path`'s contents.
+
+    Encodings with a higher q-value win, then `br` over `gzip`. Fresh
+    precompressed siblings are preferred over compressing on the fly.
+
+    Args:
+        path: Requested file.
+        content_type: MIME type of `path`.
+        accept_encoding: The request's `Accept-Encoding` header.
+
+    Returns:
+        `(encoding, body_path)`, or `None` to send `path` uncompressed.
+    """
+
+    accepted = parse_accept_encoding(accept_encoding)
+    quality = {e: accepted.get(e, accepted.get("*", 0.0)) for e in ENCODINGS}
+    # a stable sort keeps the preference order for equal q-values
+    candidates = sorted(
+        (e for e in ENCODINGS if quality[e] > 0), key=lambda e: -quality[e]
+    )
+    if not candidates:
+        return None
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    for encoding in candidates:
+        sibling = _fresh_sibling(path, ENCODINGS[encoding], st.st_mtime)
+        if sibling is not None:
+            return encoding, sibling
+
+    if st.st_size < MIN_SIZE or not is_compressible(content_type):
+        return None
+    for encoding in candidates:
+        if encoding == "br" and brotli is None:
+            continue
+        cache_path = _cached(path, st, encoding)
+        if cache_path is not None:
+            return encoding, cache_path
+    return None
@@ -0,0 +1,135 @@
+"""Kernel snapshots of Dart package executables used by the build.
+
+`dart run <package>:<executable>` re-checks package resolution and compiles
+the executable from source on every call. The build runs several such tools
+(`serious_python`, `flutter_launcher_icons`, `flutter_native_splash`), so
+they are compiled once into kernel snapshots cached under
+`~/.flet/cache/dart-snapshots/`, keyed by the Dart SDK version and the
+project's `pubspec.lock`, and run with `dart <snapshot>`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+import yaml
+
+from flet_cli.utils.template_cache import get_cache_root
+
+# Lock file sources whose contents are pinned by `pubspec.lock` itself.
+_PINNED_SOURCES = ("hosted", "git")
+
+
+def package_config_path(project_dir: Path) -> Path:
+    """Return the `package_config.json` written by package resolution."""
+    return project_dir / ".dart_tool" / "package_config.json"
+
+
+def dependencies_stale(project_dir: Path) -> bool:
+    """
+    Check whether the project's packages must be resolved before running tools.
+
+    Mirrors the check `dart run` performs: resolution is missing or older than
+    `pubspec.yaml`.
+
+    Args:
+        project_dir: Dart/Flutter project directory.
+    """
+
+    try:
+        resolved = min(
+            package_config_path(project_dir).stat().st_mtime,
+            (project_dir / "pubspec.lock").stat().st_mtime,
+        )
+        return (project_dir / "pubspec.yaml").stat().st_mtime > resolved
+    except OSError:
+        return True
+
+
+def _dart_sdk_version(dart_exe: str) -> Optional[str]:
+    exe = shutil.which(dart_exe) or dart_exe
+    bin_dir = Path(exe).resolve().parent
+    # Flutter's bin/dart wraps bin/cache/dart-sdk; a plain SDK has bin/dart
+    for version_file in (
+        bin_dir / "cache" / "dart-sdk" / "version",
+        bin_dir.parent / "version",
+    ):
+        if version_file.is_file():
+            return version_file.read_text(encoding="utf-8").strip()
+    return None
+
+
+def _package_root(project_dir: Path, package: str) -> Optional[Path]:
+    config_path = package_config_path(project_dir)
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+    for entry in config.get("packages", []):
+        if entry.get("name") != package:
+            continue
+        uri = urlparse(entry["rootUri"])
+        if uri.scheme == "file":
+            path = unquote(uri.path)
+            # file:///C:/... on Windows
+            if re.match(r"/[A-Za-z]:", path):
+                path = path[1:]
+            return Path(path)
+        # relative to the directory of package_config.json
+        return (config_path.parent / unquote(entry["rootUri"])).resolve()
+    return None
+
+
+def get_tool_snapshot(
+    dart_exe: str, project_dir: Path, tool: str
+) -> Optional[tuple[Path, Path]]:
+    """
+    Locate the snapshot of a Dart package executable and its entry point.
+
+    Args:
+        dart_exe: Dart executable the snapshot is built and run with.
+        project_dir: Project whose resolved packages provide the tool.
+        tool: Executable as passed to `dart run`: `<package>[:<executable>]`.
+
+    Returns:
+        `(snapshot_path, entry_point)`, where the snapshot may not exist yet,
+        or `None` when the tool can't be snapshotted (unresolved packages,
+        unknown SDK version or a path dependency whose sources aren't pinned
+        by `pubspec.lock`).
+    """
+
+    package, _, executable = tool.partition(":")
+    executable = executable or package
+
+    try:
+        lock_data = (project_dir / "pubspec.lock").read_bytes()
+        lock = yaml.safe_load(lock_data) or {}
+        source = (lock.get("packages") or {}).get(package, {}).get("source")
+        package_root = _package_root(project_dir, package)
+    except (OSError, ValueError, yaml.YAMLError):
+        return None
+    if source not in _PINNED_SOURCES or package_root is None:
+        return None
+
+    entry_point = package_root / "bin" / f"{executable}.dart"
+    sdk_version = _dart_sdk_version(dart_exe)
+    if sdk_version is None or not entry_point.is_file():
+        return None
+
+    key = hashlib.sha256()
+    for part in (sdk_version, package, executable):
+        key.update(f"{part}\n".encode())
+    key.update(lock_data)
+    digest = key.hexdigest()
+    snapshot = (
+        get_cache_root()
+        / "dart-snapshots"
+        / digest[:2]
+        / digest
+        / f"{package}-{executable}.dill"
+    )
+    return snapshot, entry_point
@@ -1,32 +1,450 @@
+import hashlib
+import http.client
+import json
 import os
+import re
+import shutil
 import tarfile
+import threading
+import time
+import urllib.error
+import urllib.parse
 import urllib.request
 import zipfile
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
 
 from rich.progress import Progress
 
+_CHUNK_SIZE = 256 * 1024
+# segments smaller than this aren't worth a connection of their own
+_MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+# how much a segment downloads between saves of the resume state
+_STATE_SAVE_INTERVAL = 8 * 1024 * 1024
+_TIMEOUT = 30
+_MAX_BACKOFF = 30.0
+_RETRYABLE_HTTP_CODES = (408, 425, 429, 500, 502, 503, 504)
+_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _open(url: str, headers: Optional[dict] = None):
+    request = urllib.request.Request(url, headers=headers or {})
+    return urllib.request.urlopen(request, timeout=_TIMEOUT)
+
+
+def _is_retryable(e: BaseException) -> bool:
+    if isinstance(e, urllib.error.HTTPError):
+        return e.code in _RETRYABLE_HTTP_CODES
+    return isinstance(
+        e,
+        (
+            urllib.error.URLError,
+            http.client.HTTPException,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
+def _backoff(attempt: int) -> float:
+    return min(_MAX_BACKOFF, 0.5 * 2**attempt)
+
+
+def _with_retries(fn: Callable, retries: int):
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= retries or not _is_retryable(e):
+                raise
+            attempt += 1
+            time.sleep(_backoff(attempt))
+
+
+def _probe(url: str) -> tuple[Optional[int], bool, Optional[str]]:
+    """Return the size of `url`, whether it serves ranges and its validator."""
+    try:
+        resp = _open(url, {"Range": "bytes=0-0"})
+    except urllib.error.HTTPError as e:
+        if e.code == 416:  # empty file
+            return None, False, None
+        raise
+    with resp:
+        validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        match = re.fullmatch(
+            r"bytes 0-0/(\d+)", resp.headers.get("Content-Range", "").strip()
+        )
+        if resp.status == 206 and match:
+            return int(match.group(1)), True, validator
+        length = resp.headers.get("Content-Length")
+        return (int(length) if length else None), False, validator
+
+
+def _plan_segments(size: int, segments: int) -> list[list[int]]:
+    count = max(1, min(segments, size // _MIN_SEGMENT_SIZE))
+    bounds = [size * i // count for i in range(count + 1)]
+    # [start, end, next offset to download]
+    return [[bounds[i], bounds[i + 1], bounds[i]] for i in range(count)]
+
+
+def _load_state(state_path: str) -> Optional[dict]:
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_path: str, state: dict) -> None:
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def _download_ranges(
+    url: str,
+    part_path: str,
+    state_path: str,
+    state: dict,
+    retries: int,
+    advance: Callable[[int], None],
+) -> None:
+    lock = threading.Lock()
+    stop = threading.Event()
+    validator = state["validator"]
+
+    def save():
+        with lock:
+            _save_state(state_path, state)
+
+    def fetch(segment: list[int]):
+        _, end, pos = segment
+        attempt = 0
+        with open(part_path, "r+b") as f:
+            while pos < end and not stop.is_set():
+                headers = {"Range": f"bytes={pos}-{end - 1}"}
+                if validator:
+                    # a changed file is sent whole instead of the range
+                    headers["If-Range"] = validator
+                try:
+                    with _open(url, headers) as resp:
+                        if resp.status != 206:
+                            raise RuntimeError(f"{url} changed during download")
+                        f.seek(pos)
+                        unsaved = 0
+                        while pos < end and not stop.is_set():
+                            chunk = resp.read(min(_CHUNK_SIZE, end - pos))
+                            if not chunk:
+                                raise http.client.IncompleteRead(b"", end - pos)
+                            f.write(chunk)
+                            pos += len(chunk)
+                            unsaved += len(chunk)
+                            advance(len(chunk))
+                            attempt = 0
+                            if unsaved >= _STATE_SAVE_INTERVAL:
+                                f.flush()
+                                segment[2] = pos
+                                save()
+                                unsaved = 0
+                except Exception as e:
+                    if attempt >= retries or not _is_retryable(e):
+                        raise
+                    attempt += 1
+                    time.sleep(_backoff(attempt))
+                finally:
+                    # only offsets of flushed data are recorded for resuming
+                    f.flush()
+                    segment[2] = pos
+
+    pending = [s for s in state["segments"] if s[2] < s[1]]
+    try:
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = [executor.submit(fetch, s) for s in pending]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                finally:
+                    stop.set()
+    finally:
+        save()
+
+
+def _download_stream(
+    url: str,
+    part_path: str,
+    retries: int,
+    advance: Callable[[int], None],
+    reset: Callable[[], None],
+) -> None:
+    def fetch():
+        # the server can't resume: every attempt starts over
+        reset()
+        with _open(url) as resp, open(part_path, "wb") as f:
+            while chunk := resp.read(_CHUNK_SIZE):
+                f.write(chunk)
+                advance(len(chunk))
+
+    _with_retries(fetch, retries)
+
+
+def fetch_text(url: str) -> Optional[str]:
+    """
+    Download a small text file, such as a published checksum list.
+
+    Network errors are retried like downloads.
+
+    Args:
+        url: URL to download.
+
+    Returns:
+        The file's text, or `None` if it can't be downloaded.
+    """
+
+    def fetch():
+        with _open(url) as resp:
+            return resp.read().decode("utf-8")
+
+    try:
+        return _with_retries(fetch, _env_int("FLET_CLI_DOWNLOAD_RETRIES", 5))
+    except (OSError, http.client.HTTPException, UnicodeDecodeError):
+        return None
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 def download_with_progress(
-    url, dest_path, progress: Optional[Progress] = None, description="Downloading..."
+    url,
+    dest_path,
+    progress: Optional[Progress] = None,
+    description="Downloading...",
+    sha256: Optional[str] = None,
+    resume: bool = True,
 ):
-    """Downloads a file with a progress bar."""
-    with urllib.request.urlopen(url) as response:
-        content_length = response.headers.get("Content-Length")
-        total_size = int(content_length) if content_length else None
-        block_size = 8192  # 8 KB chunks
-
-        if progress:
-            task = progress.add_task(description, total=total_size)
-        with open(dest_path, "wb") as out_file:
-            while chunk := response.read(block_size):
-                out_file.write(chunk)
-                if progress:
-                    progress.update(task, advance=len(chunk))
-        if progress:
+    """
+    Downloads a file with a progress bar.
+
+    Servers that accept HTTP range requests are downloaded in parallel
+    segments (`FLET_CLI_DOWNLOAD_SEGMENTS`, default 4). Data is written to
+    `<dest_path>.part`, with the downloaded ranges recorded in
+    `<dest_path>.part.json`, so an interrupted download continues where it
+    stopped as long as the remote file is unchanged. Network errors are
+    retried with exponential backoff (`FLET_CLI_DOWNLOAD_RETRIES` attempts,
+    default 5). The file appears at `dest_path` only once complete.
+
+    Args:
+        url: URL to download.
+        dest_path: Destination file path.
+        progress: Optional rich progress instance to report to.
+        description: Progress task description.
+        sha256: Optional expected hex digest of the file.
+        resume: Whether to keep a partial download on failure, to continue
+            it on the next call.
+
+    Raises:
+        RuntimeError: If the downloaded file doesn't match `sha256`.
+    """
+
+    dest_path = str(dest_path)
+    part_path = f"{dest_path}.part"
+    state_path = f"{part_path}.json"
+    retries = _env_int("FLET_CLI_DOWNLOAD_RETRIES", 5)
+
+    size, ranges, validator = _with_retries(lambda: _probe(url), retries)
+
+    state = _load_state(state_path) if ranges and size else None
+    if not (
+        state
+        and state.get("url") == url
+        and state.get("size") == size
+        and state.get("validator") == validator
+        and validator is not None
+        and os.path.isfile(part_path)
+        and os.path.getsize(part_path) == size
+    ):
+        state = None
+        for path in (part_path, state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    task = progress.add_task(description, total=size) if progress else None
+
+    def advance(n: int) -> None:
+        if progress and task is not None:
+            progress.update(task, advance=n)
+
+    def reset() -> None:
+        if progress and task is not None:
+            progress.update(task, completed=0)
+
+    try:
+        if ranges and size:
+            if state is None:
+                segments = _env_int("FLET_CLI_DOWNLOAD_SEGMENTS", 4)
+                state = {
+                    "url": url,
+                    "size": size,
+                    "validator": validator,
+                    "segments": _plan_segments(size, segments),
+                }
+                with open(part_path, "wb") as f:
+                    f.truncate(size)
+            advance(sum(s[2] - s[0] for s in state["segments"]))
+            _download_ranges(url, part_path, state_path, state, retries, advance)
+        else:
+            _download_stream(url, part_path, retries, advance, reset)
+
+        if sha256:
+            actual = _file_sha256(part_path)
+            if actual.lower() != sha256.lower():
+                # corrupt: don't resume it
+                state = None
+                raise RuntimeError(
+                    f"Checksum mismatch for {url}: "
+                    f"expected sha256 {sha256}, got {actual}"
+                )
+
+        with open(part_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(part_path, dest_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+    except BaseException:
+        if not resume or state is None:
+            for path in (part_path, state_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        raise
+    finally:
+        if progress and task is not None:
             progress.remove_task(task)
 
 
+class _StreamReader:
+    """File-like view of a stream that reports (and digests) what is read."""
+
+    def __init__(self, raw, advance: Callable[[int], None], digest=None) -> None:
+        self.raw = raw
+        self.advance = advance
+        self.digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.advance(len(data))
+        if self.digest is not None:
+            self.digest.update(data)
+        return data
+
+
+def _extract_tar_member(archive: tarfile.TarFile, member, extract_to) -> None:
+    extracted_path = os.path.join(extract_to, member.name)
+
+    if member.issym():
+        # Create symbolic link manually
+        os.symlink(member.linkname, extracted_path)
+    elif member.islnk():
+        # Create hard link manually
+        os.link(os.path.join(extract_to, member.linkname), extracted_path)
+    else:
+        # Extract regular files and directories
+        archive.extract(member, extract_to)
+
+    # Preserve permissions
+    if member.isfile() or member.isdir():
+        os.chmod(extracted_path, member.mode)
+
+
+def _zip_member_path(extract_to, member_info: zipfile.ZipInfo) -> str:
+    # the destination `ZipFile.extract()` uses: no drive, "." or ".." parts
+    arcname = os.path.splitdrive(member_info.filename.replace("/", os.path.sep))[1]
+    parts = [p for p in arcname.split(os.path.sep) if p not in ("", ".", "..")]
+    return os.path.join(extract_to, *parts)
+
+
+def _extract_zip(archive_path, extract_to, advance: Callable[[int], None]) -> None:
+    with zipfile.ZipFile(archive_path, "r") as archive:
+        members = archive.infolist()
+
+        # create the directory tree up front, so members can be written
+        # concurrently without racing on their parents
+        dirs = []
+        for member_info in members:
+            extracted_path = _zip_member_path(extract_to, member_info)
+            if member_info.is_dir():
+                dirs.append((member_info, extracted_path))
+                os.makedirs(extracted_path, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(extracted_path), exist_ok=True)
+
+        # `ZipFile` isn't thread-safe (it reference-counts its file handle
+        # without a lock): each worker reads through its own
+        local = threading.local()
+        opened: list[zipfile.ZipFile] = []
+        opened_lock = threading.Lock()
+
+        def worker_archive() -> zipfile.ZipFile:
+            if not hasattr(local, "archive"):
+                local.archive = zipfile.ZipFile(archive_path, "r")
+                with opened_lock:
+                    opened.append(local.archive)
+            return local.archive
+
+        def extract(member_info: zipfile.ZipInfo) -> None:
+            archive = worker_archive()
+            # Check if the member is a symbolic link
+            is_symlink = (member_info.external_attr >> 16) & 0o120000 == 0o120000
+            extracted_path = _zip_member_path(extract_to, member_info)
+
+            if is_symlink:
+                # Read the target of the symlink from the archive
+                with archive.open(member_info) as target_file:
+                    target = target_file.read().decode("utf-8")
+                # Create the symbolic link
+                os.symlink(target, extracted_path)
+            else:
+                # Extract regular files; decompression releases the GIL
+                archive.extract(member_info, extract_to)
+
+                # Preserve permissions
+                if member_info.external_attr > 0xFFFF:
+                    os.chmod(extracted_path, member_info.external_attr >> 16)
+
+            advance(member_info.file_size)
+
+        files = [m for m in members if not m.is_dir()]
+        # largest first, so a big member doesn't start last and run alone
+        files.sort(key=lambda m: m.file_size, reverse=True)
+        try:
+            with ThreadPoolExecutor(max_workers=_EXTRACT_WORKERS) as executor:
+                futures = [executor.submit(extract, m) for m in files]
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            for worker_zip in opened:
+                worker_zip.close()
+
+        # directory permissions last: a read-only directory can't be filled
+        for member_info, extracted_path in dirs:
+            if member_info.external_attr > 0xFFFF:
+                os.chmod(extracted_path, member_info.external_attr >> 16)
+
+
 def extract_with_progress(
     archive_path,
     extract_to,
@@ -35,61 +453,130 @@ def extract_with_progress(
     """
     Extracts an archive with a progress bar and preserves file attributes,
     including symbolic links.
+
+    Zip members are extracted concurrently. Tarballs are extracted in a single
+    streaming pass. Progress is reported in bytes: uncompressed for zip
+    files, compressed (read from the archive) for tarballs.
     """
-    if archive_path.endswith(".zip"):
-        with zipfile.ZipFile(archive_path, "r") as archive:
-            total_files = len(archive.namelist())
-            if progress:
-                task = progress.add_task("Extracting...", total=total_files)
-            for member in archive.namelist():
-                member_info = archive.getinfo(member)
-                # Check if the member is a symbolic link
-                is_symlink = (member_info.external_attr >> 16) & 0o120000 == 0o120000
-                extracted_path = os.path.join(extract_to, member_info.filename)
-
-                if is_symlink:
-                    # Read the target of the symlink from the archive
-                    with archive.open(member_info) as target_file:
-                        target = target_file.read().decode("utf-8")
-                    # Create the symbolic link
-                    os.symlink(target, extracted_path)
-                else:
-                    # Extract regular files and directories
-                    archive.extract(member_info, extract_to)
-
-                    # Preserve permissions
-                    if member_info.external_attr > 0xFFFF:
-                        os.chmod(extracted_path, member_info.external_attr >> 16)
-
-                if progress:
-                    progress.update(task, advance=1)
+    archive_path = str(archive_path)
+    extract_to = str(extract_to)
+    task = None
+
+    def advance(n: int) -> None:
+        if progress and task is not None:
+            progress.update(task, advance=n)
+
+    try:
+        if archive_path.endswith(".zip"):
             if progress:
-                progress.remove_task(task)
+                with zipfile.ZipFile(archive_path, "r") as archive:
+                    total = sum(m.file_size for m in archive.infolist())
+                task = progress.add_task("Extracting...", total=total)
+            _extract_zip(archive_path, extract_to, advance)
 
-    elif archive_path.endswith(".tar.xz") or archive_path.endswith(".tar.gz"):
-        with tarfile.open(archive_path, "r:*") as archive:
-            members = archive.getmembers()
-            total_files = len(members)
+        elif archive_path.endswith(".tar.xz") or archive_path.endswith(".tar.gz"):
             if progress:
-                task = progress.add_task("Extracting...", total=total_files)
-            for member in members:
-                extracted_path = os.path.join(extract_to, member.name)
-
-                if member.issym():
-                    # Create symbolic link manually
-                    os.symlink(member.linkname, extracted_path)
-                elif member.islnk():
-                    # Create hard link manually
-                    os.link(os.path.join(extract_to, member.linkname), extracted_path)
-                else:
-                    # Extract regular files and directories
-                    archive.extract(member, extract_to)
+                task = progress.add_task(
+                    "Extracting...", total=os.path.getsize(archive_path)
+                )
+            with open(archive_path, "rb") as f:
+                reader = _StreamReader(f, advance)
+                with tarfile.open(fileobj=reader, mode="r|*") as archive:
+                    for member in archive:
+                        _extract_tar_member(archive, member, extract_to)
+    finally:
+        if progress and task is not None:
+            progress.remove_task(task)
 
-                # Preserve permissions
-                if member.isfile() or member.isdir():
-                    os.chmod(extracted_path, member.mode)
 
-                if progress:
-                    progress.update(task, advance=1)
-            if progress:
+def _stream_extract_tar(
+    url: str,
+    extract_to,
+    progress: Optional[Progress],
+    description: str,
+    sha256: Optional[str],
+) -> None:
+    digest = hashlib.sha256()
+    retries = _env_int("FLET_CLI_DOWNLOAD_RETRIES", 5)
+    with _with_retries(lambda: _open(url), retries) as resp:
+        content_length = resp.headers.get("Content-Length")
+        task = (
+            progress.add_task(
+                description, total=int(content_length) if content_length else None
+            )
+            if progress
+            else None
+        )
+
+        def advance(n: int) -> None:
+            if progress and task is not None:
+                progress.update(task, advance=n)
+
+        try:
+            reader = _StreamReader(resp, advance, digest)
+            # "r|*": a single forward pass, decompressing as bytes arrive
+            with tarfile.open(fileobj=reader, mode="r|*") as archive:
+                for member in archive:
+                    _extract_tar_member(archive, member, extract_to)
+                # drain the end-of-archive padding so the digest covers it all
+                while reader.read(_CHUNK_SIZE):
+                    pass
+        finally:
+            if progress and task is not None:
                 progress.remove_task(task)
+
+    if sha256 and digest.hexdigest().lower() != sha256.lower():
+        raise RuntimeError(
+            f"Checksum mismatch for {url}: "
+            f"expected sha256 {sha256}, got {digest.hexdigest()}"
+        )
+
+
+def download_and_extract(
+    url,
+    extract_to,
+    progress: Optional[Progress] = None,
+    description="Downloading...",
+    sha256: Optional[str] = None,
+):
+    """
+    Downloads an archive and extracts it into `extract_to`.
+
+    Tarballs are decompressed and extracted as bytes arrive, without storing
+    the archive. Zip files keep their index at the end, so they are spooled
+    next to `extract_to` with `download_with_progress` and extracted once
+    complete. If streaming a tarball fails on a network error, the partial
+    extraction is discarded and the archive is downloaded resumably instead.
+
+    Args:
+        url: Archive URL, ending with `.zip`, `.tar.gz` or `.tar.xz`.
+        extract_to: Directory to extract the archive contents into.
+        progress: Optional rich progress instance to report to.
+        description: Progress task description for the download.
+        sha256: Optional expected hex digest of the archive.
+
+    Raises:
+        RuntimeError: If the archive doesn't match `sha256`.
+    """
+
+    extract_to = str(extract_to)
+    archive_name = os.path.basename(urllib.parse.urlparse(url).path)
+    os.makedirs(extract_to, exist_ok=True)
+
+    if not archive_name.endswith(".zip"):
+        try:
+            _stream_extract_tar(url, extract_to, progress, description, sha256)
+            return
+        except Exception as e:
+            # a dropped connection surfaces as a network or truncation error
+            if not (_is_retryable(e) or isinstance(e, (tarfile.ReadError, EOFError))):
+                raise
+        shutil.rmtree(extract_to)
+        os.makedirs(extract_to)
+
+    spool_path = os.path.join(
+        os.path.dirname(os.path.abspath(extract_to)), f".{archive_name}"
+    )
+    download_with_progress(url, spool_path, progress, description, sha256=sha256)
+    extract_with_progress(spool_path, extract_to, progress=progress)
+    os.remove(spool_path)
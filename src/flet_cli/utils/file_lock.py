@@ -0,0 +1,186 @@
+"""Cross-process locks for artifacts in the shared Flet cache.
+
+Cache writers publish atomically, so readers never see torn artifacts, but
+concurrent builds with a cold cache would all download the same artifact. A
+writer holds the artifact's lock while it checks for and creates the
+artifact, so other processes wait and then reuse it. Processes using an
+artifact hold a shared lock on it, so it isn't evicted while in use.
+
+Locks are `flock`/`LockFileEx` locks on files under `~/.flet/cache/locks/`,
+released by the OS if their holder dies. They also exclude threads of the
+same process, but are not reentrant.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_listeners: list[Callable[[str, float], None]] = []
+_listeners_lock = threading.Lock()
+
+
+def add_wait_listener(listener: Callable[[str, float], None]) -> None:
+    """
+    Register a callback invoked after waiting for a lock held elsewhere.
+
+    Args:
+        listener: Called with the lock name and the seconds waited.
+    """
+
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+# `msvcrt` has no shared locks: a shared holder locks one of these bytes after
+# byte 0, an exclusive holder locks byte 0 and all of them
+_SHARED_SLOTS = 64
+# fd -> (offset, length) of the bytes it locked, on Windows
+_regions: dict[int, tuple[int, int]] = {}
+# shared locks held until the process exits, by name
+_held: dict[str, int] = {}
+_held_lock = threading.Lock()
+
+
+def _try_lock(fd: int, shared: bool = False) -> bool:
+    if fcntl is not None:
+        try:
+            mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            fcntl.flock(fd, mode | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+    regions = (
+        [(slot, 1) for slot in range(1, 1 + _SHARED_SLOTS)]
+        if shared
+        else [(0, 1 + _SHARED_SLOTS)]
+    )
+    for offset, length in regions:
+        try:
+            os.lseek(fd, offset, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, length)
+        except OSError:
+            continue
+        _regions[fd] = (offset, length)
+        return True
+    return False
+
+
+def _lock(fd: int, shared: bool = False) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+    # LK_LOCK gives up after 10 seconds: retry until acquired
+    while not _try_lock(fd, shared):
+        time.sleep(0.1)
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        offset, length = _regions.pop(fd)
+        os.lseek(fd, offset, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, length)
+
+
+def _open_lock_file(name: str) -> int:
+    # imported here: template_cache locks its own artifacts
+    from flet_cli.utils.template_cache import get_cache_root
+
+    lock_dir = get_cache_root() / "locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    path = lock_dir / f"{re.sub(r'[^A-Za-z0-9._-]', '_', name)}.lock"
+    return os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+
+
+def _acquire(fd: int, name: str, shared: bool) -> None:
+    if _try_lock(fd, shared):
+        return
+    start = time.monotonic()
+    _lock(fd, shared)
+    waited = time.monotonic() - start
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener(name, waited)
+
+
+@contextlib.contextmanager
+def file_lock(name: str, shared: bool = False) -> Iterator[None]:
+    """
+    Hold the cross-process lock `name` for the enclosed block.
+
+    Args:
+        name: Lock name, e.g. `pyodide-0.27.2`.
+        shared: Whether to take a shared lock, which excludes only exclusive
+            holders.
+    """
+
+    fd = _open_lock_file(name)
+    try:
+        _acquire(fd, name, shared)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def try_file_lock(name: str) -> Iterator[bool]:
+    """
+    Hold the cross-process lock `name` exclusively if it's free right now.
+
+    Args:
+        name: Lock name.
+
+    Returns:
+        Context manager yielding whether the lock is held.
+    """
+
+    fd = _open_lock_file(name)
+    try:
+        locked = _try_lock(fd)
+        try:
+            yield locked
+        finally:
+            if locked:
+                _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def hold_shared_lock(name: str) -> None:
+    """
+    Hold the cross-process lock `name` shared until this process exits.
+
+    Holding it again is a no-op.
+
+    Args:
+        name: Lock name.
+    """
+
+    with _held_lock:
+        if name in _held:
+            return
+        fd = _open_lock_file(name)
+        try:
+            _acquire(fd, name, shared=True)
+        except BaseException:
+            os.close(fd)
+            raise
+        # released by the OS when the process exits
+        _held[name] = fd
@@ -0,0 +1,173 @@
+"""Content fingerprints for files and directory trees.
+
+Build steps used to detect changes through `st_mtime`, so a `git checkout`,
+`touch` or CI cache restore forced regeneration even when no bytes changed.
+`FileFingerprints` hashes file contents instead, and keeps a persisted stat
+index (inode, size, mtime_ns -> digest) so unchanged files are never re-read.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+# Files at least this large are hashed through mmap instead of buffered reads.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Entries whose mtime is this close to "now" are not memoized: a write landing
+# within the filesystem's timestamp granularity after hashing would otherwise
+# keep the same (size, mtime) key and go unnoticed ("racy" entries, as in git).
+_RACY_WINDOW_NS = 2_000_000_000
+
+_READ_CHUNK = 1024 * 1024
+
+# Directory names that never contribute to a tree fingerprint.
+DEFAULT_TREE_EXCLUDES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        "venv",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".flet",
+    }
+)
+
+
+def hash_file(path) -> str:
+    """
+    Return the SHA-256 hex digest of a file's contents.
+
+    Large files are hashed through a read-only memory map.
+
+    Args:
+        path: File to hash.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                digest.update(m)
+        else:
+            while chunk := f.read(_READ_CHUNK):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileFingerprints:
+    """
+    Content digests of files and trees, memoized by a persisted stat index.
+
+    A file is re-read only when its inode, size or `mtime_ns` differ from the
+    index entry recorded the last time it was hashed. Without an `index_path`
+    the index lives in memory only.
+    """
+
+    def __init__(self, index_path=None) -> None:
+        self._index_path = Path(index_path) if index_path else None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._index: dict[str, list] = {}
+        if self._index_path is None:
+            return
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._index = data
+        except (OSError, ValueError):
+            pass
+
+    def file_digest(self, path) -> Optional[str]:
+        """
+        Return the content digest of a file, or `None` if it does not exist.
+
+        Args:
+            path: File to fingerprint.
+        """
+
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            return None
+        stat_key = [st.st_ino, st.st_size, st.st_mtime_ns]
+
+        with self._lock:
+            entry = self._index.get(key)
+        if entry and entry[:3] == stat_key:
+            return entry[3]
+
+        digest = hash_file(key)
+        if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            with self._lock:
+                self._index[key] = [*stat_key, digest]
+                self._dirty = True
+        return digest
+
+    def tree_digest(self, root, exclude: Iterable[str] = DEFAULT_TREE_EXCLUDES):
+        """
+        Return a digest over the relative paths and contents of a tree.
+
+        Symbolic links contribute their target rather than the linked content.
+
+        Args:
+            root: Directory to fingerprint.
+            exclude: Directory or file names skipped at any depth.
+
+        Returns:
+            Hex digest, or `None` if `root` is not a directory.
+        """
+
+        if not os.path.isdir(root):
+            return None
+
+        excluded = set(exclude)
+        digest = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in excluded)
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+            digest.update(f"d {rel_dir}\n".encode())
+            for name in sorted(filenames):
+                if name in excluded:
+                    continue
+                path = os.path.join(dirpath, name)
+                rel = f"{rel_dir}/{name}"
+                if os.path.islink(path):
+                    digest.update(f"l {rel} {os.readlink(path)}\n".encode())
+                else:
+                    digest.update(f"f {rel} {self.file_digest(path)}\n".encode())
+        return digest.hexdigest()
+
+    def save(self):
+        """
+        Persist the stat index, dropping entries for files that no longer exist.
+        """
+
+        if self._index_path is None:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            index = {k: v for k, v in self._index.items() if os.path.exists(k)}
+            self._dirty = False
+
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._index_path.with_suffix(
+            f"{self._index_path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
@@ -1,3 +1,4 @@
+import json
 import os
 import platform
 import shutil
@@ -8,9 +9,12 @@ from typing import Optional
 from rich.console import Console
 from rich.progress import Progress
 
-from flet_cli.utils.distros import download_with_progress, extract_with_progress
+from flet_cli.utils.cache_index import record_use, use_artifact
+from flet_cli.utils.distros import download_and_extract, fetch_text
+from flet_cli.utils.file_lock import file_lock
 
 FLUTTER_GIT_URL = "https://github.com/flutter/flutter.git"
+FLUTTER_RELEASES_URL = "https://storage.googleapis.com/flutter_infra_release/releases"
 
 
 def is_arm64_linux() -> bool:
@@ -26,7 +30,7 @@ def get_flutter_url(version):
     system = platform.system()
     machine = platform.machine()
 
-    url_root = "https://storage.googleapis.com/flutter_infra_release/releases/stable"
+    url_root = f"{FLUTTER_RELEASES_URL}/stable"
     if system == "Windows":
         return f"{url_root}/windows/flutter_windows_{version}-stable.zip"
     elif system == "Darwin":
@@ -40,6 +44,64 @@ def get_flutter_url(version):
         raise ValueError(f"Unsupported platform: {system}")
 
 
+def get_flutter_sha256(url: str) -> Optional[str]:
+    """
+    Look up the published SHA-256 digest of a Flutter SDK archive.
+
+    Args:
+        url: Archive URL returned by `get_flutter_url()`.
+
+    Returns:
+        Hex digest from Flutter's releases manifest, or `None` if the manifest
+        can't be downloaded or doesn't list the archive.
+    """
+
+    prefix = f"{FLUTTER_RELEASES_URL}/"
+    if not url.startswith(prefix):
+        return None
+    archive = url[len(prefix) :]  # e.g. stable/linux/flutter_linux_...
+    parts = archive.split("/")
+    if len(parts) < 3:
+        return None
+    manifest = fetch_text(f"{FLUTTER_RELEASES_URL}/releases_{parts[1]}.json")
+    try:
+        releases = json.loads(manifest)["releases"] if manifest else []
+    except (ValueError, KeyError, TypeError):
+        return None
+    for release in releases:
+        if isinstance(release, dict) and release.get("archive") == archive:
+            return release.get("sha256")
+    return None
+
+
+def flutter_settings_path() -> Path:
+    """Return the file `flutter config` stores its settings in."""
+    legacy_path = Path.home() / ".flutter_settings"
+    if platform.system() == "Windows" or legacy_path.is_file():
+        return legacy_path
+    config_home = os.getenv("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(config_home) / "flutter" / "settings"
+
+
+def get_flutter_config(name: str) -> Optional[str]:
+    """
+    Read a value set with `flutter config` without launching Flutter.
+
+    Args:
+        name: Setting name, e.g. `jdk-dir`.
+
+    Returns:
+        Configured value, or `None` if not set or unreadable.
+    """
+
+    try:
+        with open(flutter_settings_path(), encoding="utf-8") as f:
+            value = json.load(f).get(name)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return value if isinstance(value, str) else None
+
+
 def get_flutter_dir(version):
     """
     Return the local install directory for a specific SDK version.
@@ -55,6 +117,49 @@ def get_flutter_dir(version):
     return os.path.join(home_dir, "flutter", version)
 
 
+def _install_flutter_sdk(
+    version, install_dir, log, progress: Optional[Progress] = None
+) -> None:
+    home_dir = Path.home()
+
+    if is_arm64_linux():
+        # Flutter publishes no prebuilt arm64 Linux SDK (its releases are
+        # x64-only), so clone the SDK at the version tag, then precache its
+        # engine artifacts. The prebuilt archives ship these under
+        # `bin/cache` (incl. the `sky_engine` package that `dart run` /
+        # `flutter build` resolve); a bare clone does not, so without the
+        # precache pub solving fails with "could not find package sky_engine".
+        # The downloaded artifacts are arch-appropriate (mirrors fvm/git).
+        os.makedirs(os.path.dirname(install_dir), exist_ok=True)
+        log(f"Cloning Flutter {version} for arm64 Linux from {FLUTTER_GIT_URL}...")
+        subprocess.run(
+            ["git", "clone", "--depth", "1", "--branch", version]
+            + [FLUTTER_GIT_URL, install_dir],
+            check=True,
+        )
+        log(f"Precaching Flutter {version} engine artifacts...")
+        flutter_exe = os.path.join(install_dir, "bin", "flutter")
+        subprocess.run([flutter_exe, "precache", "--linux"], check=True)
+    else:
+        url = get_flutter_url(version)
+
+        log(f"Downloading and extracting Flutter {version} from {url}...")
+        temp_extract_dir = os.path.join(home_dir, "flutter", f"{version}_temp")
+        if os.path.exists(temp_extract_dir):
+            shutil.rmtree(temp_extract_dir)
+        sha256 = get_flutter_sha256(url)
+        if not sha256:
+            log("No published checksum found for the Flutter SDK archive.")
+        download_and_extract(url, temp_extract_dir, progress=progress, sha256=sha256)
+
+        # Move extracted 'flutter' directory contents to final destination
+        flutter_root = os.path.join(temp_extract_dir, "flutter")
+        shutil.move(flutter_root, install_dir)
+
+        # Clean up
+        shutil.rmtree(temp_extract_dir)
+
+
 def install_flutter(version, log, progress: Optional[Progress] = None):
     """
     Ensure the requested SDK version is installed and return its directory.
@@ -73,50 +178,17 @@ def install_flutter(version, log, progress: Optional[Progress] = None):
     """
 
     install_dir = get_flutter_dir(version)
-    home_dir = Path.home()
-
-    if not os.path.exists(install_dir):
-        if is_arm64_linux():
-            # Flutter publishes no prebuilt arm64 Linux SDK (its releases are
-            # x64-only), so clone the SDK at the version tag, then precache its
-            # engine artifacts. The prebuilt archives ship these under
-            # `bin/cache` (incl. the `sky_engine` package that `dart run` /
-            # `flutter build` resolve); a bare clone does not, so without the
-            # precache pub solving fails with "could not find package sky_engine".
-            # The downloaded artifacts are arch-appropriate (mirrors fvm/git).
-            os.makedirs(os.path.dirname(install_dir), exist_ok=True)
-            log(f"Cloning Flutter {version} for arm64 Linux from {FLUTTER_GIT_URL}...")
-            subprocess.run(
-                ["git", "clone", "--depth", "1", "--branch", version]
-                + [FLUTTER_GIT_URL, install_dir],
-                check=True,
-            )
-            log(f"Precaching Flutter {version} engine artifacts...")
-            flutter_exe = os.path.join(install_dir, "bin", "flutter")
-            subprocess.run([flutter_exe, "precache", "--linux"], check=True)
-        else:
-            url = get_flutter_url(version)
-            archive_name = os.path.basename(url)
-            archive_path = os.path.join(home_dir, archive_name)
-
-            log(f"Downloading Flutter {version} from {url}...")
-            download_with_progress(url, archive_path, progress=progress)
-
-            log(f"Extracting Flutter to {install_dir}...")
-            temp_extract_dir = os.path.join(home_dir, "flutter", f"{version}_temp")
-            os.makedirs(temp_extract_dir, exist_ok=True)
-
-            extract_with_progress(archive_path, temp_extract_dir, progress=progress)
-
-            # Move extracted 'flutter' directory contents to final destination
-            flutter_root = os.path.join(temp_extract_dir, "flutter")
-            shutil.move(flutter_root, install_dir)
-
-            # Clean up
-            os.remove(archive_path)
-            shutil.rmtree(temp_extract_dir)
 
-        log(f"Flutter {version} installed at {install_dir}.")
+    use_artifact("flutter-sdk", install_dir)
+    hit = os.path.exists(install_dir)
+    if not hit:
+        # another process may be installing the same version: wait, then reuse it
+        with file_lock(f"flutter-{version}"):
+            hit = os.path.exists(install_dir)
+            if not hit:
+                _install_flutter_sdk(version, install_dir, log, progress)
+                log(f"Flutter {version} installed at {install_dir}.")
+    record_use("flutter-sdk", install_dir, hit=hit)
     return install_dir
 
 
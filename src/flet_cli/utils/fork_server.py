@@ -0,0 +1,403 @@
+"""Fork server behind `flet run --reload=fork` (Linux and macOS).
+
+Restarting the app in a fresh interpreter pays for Python startup, `import
+flet` and the app's third-party imports on every change. With the fork server,
+`flet run` starts one long-lived process that imports those modules once and
+forks a new app process from itself on each (re)start, so a restart only
+costs the fork and the import of the app's own modules.
+
+The modules to preload are given on the command line or detected from the
+top-level imports of the Python files next to the app's entry point: those
+resolving to installed packages or the standard library the way the app
+resolves them, and not to a module of the project. Preloaded modules must not
+start threads or open connections at import time, as those don't survive a
+fork.
+"""
+
+from __future__ import annotations
+
+import ast
+import importlib
+import importlib.machinery
+import os
+import queue
+import runpy
+import signal
+import socket
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+import time
+import traceback
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Optional
+
+FD_ENV = "FLET_FORK_SERVER_FD"
+
+# always preloaded: `flet` imports its controls lazily
+_FLET_MODULES = ["flet", "flet.app"]
+
+
+def is_fork_supported() -> bool:
+    """
+    Return whether the fork server can run on this platform.
+    """
+
+    return hasattr(os, "fork") and sys.platform != "win32"
+
+
+class ForkedProcess:
+    """
+    Handle of an app process forked by the fork server.
+
+    Mirrors the parts of `subprocess.Popen` `flet run` uses.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        self._exited = threading.Event()
+
+    def _set_exited(self, returncode: int) -> None:
+        self.returncode = returncode
+        self._exited.set()
+
+    def poll(self) -> Optional[int]:
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(f"pid {self.pid}", timeout)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+
+class ForkServer:
+    """
+    Client side of the fork server, used by `flet run`.
+
+    Args:
+        script_path: Path of the app's entry point file.
+        target: Script path, or module name when `is_module` is set.
+        is_module: Whether `target` is run as a module (`python -m`).
+        script_args: Arguments passed to the app as `sys.argv[1:]`.
+        preload: Modules to import ahead of time; detected from the app's
+            imports when `None`.
+    """
+
+    def __init__(
+        self,
+        script_path: str,
+        target: str,
+        is_module: bool,
+        script_args: list[str],
+        preload: Optional[list[str]] = None,
+    ):
+        self.script_path = script_path
+        self.target = target
+        self.is_module = is_module
+        self.script_args = script_args
+        self.preload = preload
+        self.process: Optional[subprocess.Popen] = None
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+        self._spawned: queue.Queue = queue.Queue()
+        self._children: dict[int, ForkedProcess] = {}
+
+    def start(self, env: dict, cwd: str) -> subprocess.Popen:
+        """
+        Start the fork server process and let it preload modules.
+
+        Forked app processes write to the standard output of the returned
+        process.
+
+        Args:
+            env: Environment of the fork server; app processes get their own
+                environment in `spawn`.
+            cwd: Working directory of the fork server.
+
+        Returns:
+            The fork server process.
+        """
+
+        parent_sock, child_sock = socket.socketpair()
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "-m", "flet_cli.utils.fork_server"],
+            env={**env, FD_ENV: str(child_sock.fileno())},
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            encoding="utf-8",
+            pass_fds=[child_sock.fileno()],
+        )
+        child_sock.close()
+        self._conn = Connection(parent_sock.detach())
+        self._conn.send(
+            (
+                "preload",
+                {"modules": self.preload, "script_path": self.script_path},
+            )
+        )
+        threading.Thread(target=self._read_messages, daemon=True).start()
+        return self.process
+
+    def spawn(self, env: dict, cwd: str) -> ForkedProcess:
+        """
+        Fork a new app process.
+
+        Args:
+            env: Environment of the app process.
+            cwd: Working directory of the app process.
+
+        Returns:
+            Handle of the forked process.
+
+        Raises:
+            RuntimeError: The fork server isn't running.
+        """
+
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("The fork server is not running.")
+            try:
+                self._conn.send(
+                    (
+                        "spawn",
+                        {
+                            "target": self.target,
+                            "is_module": self.is_module,
+                            "argv": [self.target, *self.script_args],
+                            "env": env,
+                            "cwd": cwd,
+                        },
+                    )
+                )
+            except (OSError, ValueError) as e:
+                raise RuntimeError(f"The fork server is not running: {e}") from e
+            # waits for preloading to finish on the first spawn
+            child = self._spawned.get()
+        if child is None:
+            raise RuntimeError("The fork server exited.")
+        return child
+
+    def _read_messages(self) -> None:
+        assert self._conn
+        while True:
+            try:
+                message, payload = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if message == "spawned":
+                child = ForkedProcess(payload)
+                self._children[payload] = child
+                self._spawned.put(child)
+            elif message == "exited":
+                pid, returncode = payload
+                child = self._children.pop(pid, None)
+                if child is not None:
+                    child._set_exited(returncode)
+
+        self._conn = None
+        for child in self._children.values():
+            child._set_exited(-1)
+        self._children.clear()
+        self._spawned.put(None)
+
+
+def _is_library(origin: str) -> bool:
+    """Whether `origin` is in an installed package or the standard library."""
+
+    if {"site-packages", "dist-packages"} & set(Path(origin).parts):
+        return True
+    paths = sysconfig.get_paths()
+    stdlib_dirs = {os.path.realpath(paths[k]) for k in ("stdlib", "platstdlib")}
+    return any(origin.startswith(d + os.sep) for d in stdlib_dirs)
+
+
+def detect_imports(script_path: str) -> list[str]:
+    """
+    Return modules imported by the Python files next to `script_path` that
+    are installed packages or part of the standard library.
+
+    Names are resolved like the app resolves them, with the script's directory
+    first on `sys.path`. Names found in the project are skipped even when a
+    package of the same name is installed, so the fork server neither freezes
+    the app's own modules nor preloads the wrong ones.
+
+    Args:
+        script_path: Path of the app's entry point file.
+
+    Returns:
+        Top-level module names, sorted.
+    """
+
+    project_dir = os.path.realpath(os.path.dirname(script_path))
+    names: set[str] = set()
+    for path in Path(project_dir).glob("*.py"):
+        try:
+            tree = ast.parse(path.read_bytes(), filename=str(path))
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.partition(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names.add(node.module.partition(".")[0])
+
+    # the app has the script's directory where the server has its working
+    # directory: `sys.path[0]`
+    local_dirs = [project_dir, os.path.realpath(sys.path[0] or os.curdir)]
+    modules = []
+    for name in sorted(names):
+        if name == "__future__":
+            continue
+        if name in sys.builtin_module_names:
+            modules.append(name)
+            continue
+        try:
+            if importlib.machinery.PathFinder.find_spec(name, local_dirs):
+                continue
+            spec = importlib.machinery.PathFinder.find_spec(name, sys.path[1:])
+        except (ImportError, ValueError):
+            continue
+        origin = spec.origin if spec else None
+        if origin and os.path.isabs(origin) and _is_library(os.path.realpath(origin)):
+            modules.append(name)
+    return modules
+
+
+def _preload(modules: Optional[list[str]], script_path: str) -> None:
+    start = time.perf_counter()
+    if modules is None:
+        modules = detect_imports(script_path)
+    loaded = 0
+    for name in [*_FLET_MODULES, *modules]:
+        try:
+            importlib.import_module(name)
+            loaded += 1
+        except BaseException as e:
+            print(f"Fork server: unable to preload {name}: {e}", flush=True)
+    print(
+        f"Fork server: preloaded {loaded} module(s) "
+        f"in {time.perf_counter() - start:.1f}s",
+        flush=True,
+    )
+
+
+def _run_app(spec: dict) -> int:
+    os.environ.clear()
+    os.environ.update(spec["env"])
+    os.chdir(spec["cwd"])
+    tempfile.tempdir = None  # re-read TMPDIR
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    sys.argv = list(spec["argv"])
+
+    try:
+        if spec["is_module"]:
+            runpy.run_module(spec["target"], run_name="__main__", alter_sys=True)
+        else:
+            # like `python script.py`: the script's directory comes first
+            sys.path[0] = os.path.dirname(os.path.abspath(spec["target"]))
+            runpy.run_path(spec["target"], run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _reap(conn: Connection, children: set[int]) -> None:
+    for pid in list(children):
+        try:
+            done, status = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            done, status = pid, 0
+        if done:
+            children.discard(pid)
+            conn.send(("exited", (pid, os.waitstatus_to_exitcode(status))))
+
+
+def _serve(conn: Connection) -> int:
+    # SIGCHLD writes to `wakeup_r`, so an exited app is reaped, and restarted
+    # by `flet run`, without polling
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_r, False)
+    os.set_blocking(wakeup_w, False)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    signal.set_wakeup_fd(wakeup_w)
+
+    children: set[int] = set()
+    while True:
+        ready = wait([conn, wakeup_r])
+        if wakeup_r in ready:
+            try:
+                os.read(wakeup_r, 4096)
+            except BlockingIOError:
+                pass
+            _reap(conn, children)
+        if conn not in ready:
+            continue
+        try:
+            message, payload = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        if message == "preload":
+            _preload(payload["modules"], payload["script_path"])
+        elif message == "spawn":
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                # the app process: leave the server loop and exit with the app
+                conn.close()
+                signal.set_wakeup_fd(-1)
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                os.close(wakeup_r)
+                os.close(wakeup_w)
+                return _run_app(payload)
+            children.add(pid)
+            conn.send(("spawned", pid))
+
+    # `flet run` went away: stop the apps it started
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    return 0
+
+
+def main() -> int:
+    """Serve fork requests of `flet run` received over an inherited socket."""
+
+    fd = os.environ.pop(FD_ENV, None)
+    if fd is None:
+        print("The fork server is started by `flet run --reload=fork`.")
+        return 2
+    # Ctrl+C reaches the whole process group: leave it to the apps
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    return _serve(Connection(int(fd)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
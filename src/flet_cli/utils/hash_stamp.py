@@ -1,5 +1,12 @@
 import hashlib
 from pathlib import Path
+from typing import Optional
+
+from flet_cli.utils.fingerprint import (
+    DEFAULT_TREE_EXCLUDES,
+    FileFingerprints,
+    hash_file,
+)
 
 
 class HashStamp:
@@ -7,12 +14,14 @@ class HashStamp:
     Track a SHA-256 digest and persist it to a stamp file.
 
     A `HashStamp` instance is typically used to detect whether a set of values
-    has changed since the last run.
+    has changed since the last run. Files and directory trees are included by
+    content, memoized through an optional `FileFingerprints` index.
     """
 
-    def __init__(self, path) -> None:
+    def __init__(self, path, fingerprints: Optional[FileFingerprints] = None) -> None:
         self._path = path
         self._hash = hashlib.sha256()
+        self._fingerprints = fingerprints
 
     def update(self, data):
         """
@@ -25,6 +34,33 @@ class HashStamp:
         if data is not None:
             self._hash.update(str(data).encode())
 
+    def update_file(self, path):
+        """
+        Add the contents of a file to the current digest state.
+
+        Args:
+            path: File to include. A missing file is recorded as such.
+        """
+
+        if self._fingerprints:
+            digest = self._fingerprints.file_digest(path)
+        else:
+            digest = hash_file(path) if Path(path).is_file() else None
+        self._hash.update(f"file:{digest}".encode())
+
+    def update_tree(self, path, exclude=DEFAULT_TREE_EXCLUDES):
+        """
+        Add the relative paths and contents of a directory tree to the digest.
+
+        Args:
+            path: Directory to include. A missing directory is recorded as such.
+            exclude: Directory or file names skipped at any depth.
+        """
+
+        fingerprints = self._fingerprints or FileFingerprints()
+        digest = fingerprints.tree_digest(path, exclude)
+        self._hash.update(f"tree:{digest}".encode())
+
     def has_changed(self):
         """
         Check whether the current digest differs from the stored stamp.
@@ -42,9 +78,12 @@ class HashStamp:
         """
         Persist the current digest value to the stamp file.
 
-        Parent directories are created automatically when needed.
+        Parent directories are created automatically when needed, and the
+        fingerprint index, if any, is saved alongside.
         """
 
         hash_file = Path(self._path)
         hash_file.parent.mkdir(parents=True, exist_ok=True)
         hash_file.write_text(self._hash.hexdigest())
+        if self._fingerprints:
+            self._fingerprints.save()
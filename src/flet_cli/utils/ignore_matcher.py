@@ -0,0 +1,329 @@
+"""Gitignore-style path matching for the `flet run` watcher.
+
+`IgnoreMatcher` compiles built-in defaults, the project's `.gitignore` files
+(including those of parent directories up to the repository root and nested
+ones) and `--ignore-dirs` into regular expressions, so that a file-system
+event is checked with a few regex matches instead of path comparisons
+against every ignored directory. `plan_watches` uses it to leave ignored
+subtrees, such as virtual environments and the `.flet` storage the running
+app writes to, without any file-system watches.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable
+from typing import Optional
+
+# directories and files that never affect a running app
+DEFAULT_IGNORE_PATTERNS = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".flet/",
+    ".venv/",
+    "venv/",
+    "node_modules/",
+    "__pycache__/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".idea/",
+    "/build/",
+    "*.py[cod]",
+    "*.swp",
+    "*.swx",
+    "*~",
+    ".#*",
+    ".DS_Store",
+]
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob, without leading `/`, to a regex."""
+
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and pattern[i - 1 : i] == "/":
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1 : end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class _Rules:
+    """Compiled patterns of one ignore file, relative to its directory."""
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        self.base = base
+        # (regex, negated, directories only), in file order
+        self.rules: list[tuple[re.Pattern, bool, bool]] = []
+        any_parts, dir_parts = [], []
+        for line in lines:
+            line = line.rstrip("\n\r")
+            if not line.endswith("\\ "):
+                line = line.rstrip(" ")
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated or line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            regex = _translate(line.lstrip("/"))
+            if not anchored:
+                regex = f"(?:.*/)?{regex}"
+            self.rules.append((re.compile(f"{regex}\\Z"), negated, dir_only))
+            (dir_parts if dir_only else any_parts).append(regex)
+
+        self.has_negations = any(negated for _, negated, _ in self.rules)
+        self._any = re.compile(f"(?:{'|'.join(any_parts)})\\Z") if any_parts else None
+        self._dir = re.compile(f"(?:{'|'.join(dir_parts)})\\Z") if dir_parts else None
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """Return whether `rel` is ignored, or `None` if no rule matches."""
+
+        if not self.has_negations:
+            # a single regex search per kind of rule
+            if self._any is not None and self._any.match(rel):
+                return True
+            if is_dir and self._dir is not None and self._dir.match(rel):
+                return True
+            return None
+        for regex, negated, dir_only in reversed(self.rules):
+            if (is_dir or not dir_only) and regex.match(rel):
+                return not negated
+        return None
+
+
+class IgnoreMatcher:
+    """
+    Decide which paths below a watched directory are ignored.
+
+    Like Git, later rules override earlier ones, rules of nested ignore files
+    override those of parent directories, and nothing below an ignored
+    directory can be re-included.
+
+    Args:
+        root: Watched directory.
+        ignore_dirs: Additional absolute directories to ignore, e.g. from
+            `--ignore-dirs`.
+        use_gitignore: Whether to honour `.gitignore` files.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        ignore_dirs: Iterable[str] = (),
+        use_gitignore: bool = True,
+    ):
+        self.root = os.path.abspath(root)
+        self.use_gitignore = use_gitignore
+        self._rules: list[_Rules] = [_Rules(self.root, DEFAULT_IGNORE_PATTERNS)]
+        self._dir_cache: dict[str, bool] = {}
+        self._extra: list[_Rules] = []
+
+        if use_gitignore:
+            # ignore files of parent directories, up to the repository root
+            parents = []
+            directory = os.path.dirname(self.root)
+            while directory != os.path.dirname(directory):
+                parents.append(directory)
+                if os.path.exists(os.path.join(directory, ".git")):
+                    break
+                directory = os.path.dirname(directory)
+            else:
+                parents = []  # not in a repository
+            if os.path.exists(os.path.join(self.root, ".git")):
+                parents = []
+            for directory in reversed(parents):
+                self.add_ignore_file(os.path.join(directory, ".gitignore"))
+            self.add_ignore_file(os.path.join(self.root, ".gitignore"))
+
+        patterns = []
+        for directory in ignore_dirs:
+            rel = os.path.relpath(os.path.abspath(directory), self.root)
+            if rel != "." and not rel.startswith(".."):
+                patterns.append(f"/{escape_pattern(rel.replace(os.sep, '/'))}/")
+        if patterns:
+            self._extra.append(_Rules(self.root, patterns))
+
+    def add_ignore_file(self, path: str) -> None:
+        """
+        Add the rules of a `.gitignore` file, if it exists.
+
+        Args:
+            path: Ignore file; its rules apply to its directory.
+        """
+
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        self._rules.append(_Rules(os.path.dirname(os.path.abspath(path)), lines))
+        self._dir_cache.clear()
+
+    def _match(self, path: str, is_dir: bool) -> bool:
+        ignored = False
+        for rules in (*self._rules, *self._extra):
+            if path == rules.base:
+                continue
+            rel = os.path.relpath(path, rules.base)
+            if rel.startswith(".."):
+                continue
+            result = rules.match(rel.replace(os.sep, "/"), is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def _dir_ignored(self, path: str) -> bool:
+        ignored = self._dir_cache.get(path)
+        if ignored is None:
+            parent = os.path.dirname(path)
+            ignored = (
+                path != self.root
+                and parent != path
+                and parent.startswith(self.root)
+                and (self._dir_ignored(parent) or self._match(path, True))
+            )
+            self._dir_cache[path] = ignored
+        return ignored
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Return whether `path` or one of its parent directories is ignored.
+
+        Paths outside of the root directory are never ignored.
+
+        Args:
+            path: Path to check.
+            is_dir: Whether `path` is a directory.
+        """
+
+        path = os.path.abspath(path)
+        if path == self.root or not path.startswith(self.root + os.sep):
+            return False
+        if is_dir:
+            return self._dir_ignored(path)
+        return self._dir_ignored(os.path.dirname(path)) or self._match(path, False)
+
+
+class PathPatterns:
+    """
+    Gitignore-style glob patterns matched against paths below a directory.
+
+    A path matches when it, or one of its parent directories, matches.
+
+    Args:
+        base: Directory the patterns are relative to.
+        patterns: Patterns, e.g. `assets/` or `*.toml`.
+    """
+
+    def __init__(self, base: str, patterns: Iterable[str]):
+        self.base = os.path.abspath(base)
+        self._rules = _Rules(self.base, patterns)
+
+    def matches(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Return whether `path` matches the patterns.
+
+        Args:
+            path: Path to check.
+            is_dir: Whether `path` is a directory.
+        """
+
+        path = os.path.abspath(path)
+        if not path.startswith(self.base + os.sep):
+            return False
+        parts = os.path.relpath(path, self.base).split(os.sep)
+        for i in range(1, len(parts) + 1):
+            last = i == len(parts)
+            if self._rules.match("/".join(parts[:i]), is_dir or not last):
+                return True
+        return False
+
+
+def escape_pattern(path: str) -> str:
+    """
+    Escape glob characters of a literal path for use in a pattern.
+
+    Args:
+        path: Path with `/` separators.
+    """
+
+    return re.sub(r"([*?\[\\!#])", r"\\\1", path)
+
+
+def plan_watches(root: str, matcher: IgnoreMatcher) -> list[tuple[str, bool]]:
+    """
+    Return the watches covering the directories below `root` that aren't
+    ignored.
+
+    Subtrees without ignored directories get one recursive watch; others a
+    non-recursive watch per directory. `.gitignore` files found on the way are
+    added to `matcher`.
+
+    Args:
+        root: Directory to watch.
+        matcher: Ignore rules.
+
+    Returns:
+        `(directory, recursive)` pairs.
+    """
+
+    def plan(directory: str) -> tuple[list[tuple[str, bool]], bool]:
+        if matcher.use_gitignore and directory != matcher.root:
+            matcher.add_ignore_file(os.path.join(directory, ".gitignore"))
+        children = []
+        clean = True
+        try:
+            with os.scandir(directory) as it:
+                subdirs = [
+                    e.path for e in it if e.is_dir(follow_symlinks=False)
+                ]
+        except OSError:
+            subdirs = []
+        for subdir in sorted(subdirs):
+            if matcher.is_ignored(subdir, is_dir=True):
+                clean = False
+                continue
+            child_plan, child_clean = plan(subdir)
+            children.extend(child_plan)
+            clean = clean and child_clean
+        if clean:
+            return [(directory, True)], True
+        return [(directory, False), *children], False
+
+    return plan(os.path.abspath(root))[0]
@@ -0,0 +1,154 @@
+"""Local import graph of an app, for `flet run` restart filtering.
+
+`ImportGraph` follows the `import` statements of the app's entry point
+through the Python files below the watched directory, found by scanning their
+AST rather than importing them. `flet run` restarts the app only for changes
+of files in that graph, so edits of notebooks, data files or unrelated
+scripts next to the app are ignored.
+
+Modules imported dynamically, e.g. via `importlib.import_module()`, aren't
+seen; their files can be added through restart patterns.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+import threading
+from collections.abc import Iterable
+
+
+def _module_candidates(base: str, parts: list[str]) -> list[str]:
+    """Return the files that may implement module `parts` below `base`."""
+
+    candidates = []
+    # importing `a.b` runs `a/__init__.py` first
+    for i in range(1, len(parts)):
+        candidates.append(os.path.join(base, *parts[:i], "__init__.py"))
+    candidates.append(os.path.join(base, *parts) + ".py")
+    candidates.append(os.path.join(base, *parts, "__init__.py"))
+    return candidates
+
+
+class ImportGraph:
+    """
+    Files reachable from an entry point through local imports.
+
+    Edges are cached per file and recomputed only for files reported as
+    changed.
+
+    Args:
+        root: Watched directory; files outside of it aren't followed.
+        entry_point: The app's entry point file.
+        search_paths: Directories absolute imports are resolved against, like
+            `sys.path`.
+    """
+
+    def __init__(self, root: str, entry_point: str, search_paths: Iterable[str]):
+        self.root = os.path.abspath(root)
+        self.entry_point = os.path.abspath(entry_point)
+        self.search_paths = [
+            p
+            for p in dict.fromkeys(os.path.abspath(p) for p in search_paths)
+            if p == self.root
+            or p.startswith(self.root + os.sep)
+            or self.root.startswith(p + os.sep)
+        ]
+        # file -> files its imports may resolve to, existing or not
+        self._imports: dict[str, list[str]] = {}
+        self._reachable: set[str] = set()
+        self._candidates: set[str] = set()
+        self._lock = threading.Lock()
+        self._refresh()
+
+    def _local(self, path: str) -> bool:
+        return path.startswith(self.root + os.sep)
+
+    def _parse(self, path: str) -> list[str]:
+        try:
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError):
+            return []
+
+        directory = os.path.dirname(path)
+        candidates = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    parts = alias.name.split(".")
+                    for base in self.search_paths:
+                        candidates.extend(_module_candidates(base, parts))
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module.split(".") if node.module else []
+                if node.level:
+                    base = directory
+                    for _ in range(node.level - 1):
+                        base = os.path.dirname(base)
+                    bases = [base]
+                    if module:
+                        candidates.extend(_module_candidates(base, module))
+                    else:
+                        candidates.append(os.path.join(base, "__init__.py"))
+                else:
+                    bases = self.search_paths
+                    for base in bases:
+                        candidates.extend(_module_candidates(base, module))
+                # `from a import b` may import submodule `a.b`
+                for alias in node.names:
+                    if alias.name != "*":
+                        for base in bases:
+                            candidates.extend(
+                                _module_candidates(base, [*module, alias.name])
+                            )
+        return [c for c in dict.fromkeys(candidates) if self._local(c)]
+
+    def _refresh(self) -> None:
+        reachable: set[str] = set()
+        candidates: set[str] = set()
+        pending = [self.entry_point]
+        while pending:
+            path = pending.pop()
+            if path in reachable:
+                continue
+            reachable.add(path)
+            imports = self._imports.get(path)
+            if imports is None:
+                imports = self._imports[path] = self._parse(path)
+            for candidate in imports:
+                candidates.add(candidate)
+                if candidate not in reachable and os.path.isfile(candidate):
+                    pending.append(candidate)
+        self._reachable = reachable
+        self._candidates = candidates
+
+    def _contains(self, path: str) -> bool:
+        return path in self._reachable or path in self._candidates
+
+    def update(self, paths: Iterable[str]) -> list[str]:
+        """
+        Re-scan changed files and return those that belong to the app.
+
+        A changed file belongs to the app if it was or now is reachable from
+        the entry point, including files created at paths an import of a
+        reachable file refers to.
+
+        Args:
+            paths: Changed paths.
+
+        Returns:
+            Changed paths in the import graph.
+        """
+
+        paths = [os.path.abspath(p) for p in paths]
+        with self._lock:
+            before = {p for p in paths if self._contains(p)}
+            for path in paths:
+                self._imports.pop(path, None)
+                if os.path.isdir(path) or not os.path.exists(path):
+                    # a renamed or removed package: forget files below it
+                    prefix = path + os.sep
+                    for known in [k for k in self._imports if k.startswith(prefix)]:
+                        del self._imports[known]
+            self._refresh()
+            return [p for p in paths if p in before or self._contains(p)]
@@ -1,15 +1,18 @@
 import os
 import platform
+import re
 import shutil
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import Optional
 
 from rich.console import Console
 from rich.progress import Progress
 
-from flet_cli.utils.distros import download_with_progress, extract_with_progress
+from flet_cli.utils.cache_index import record_use, use_artifact
+from flet_cli.utils.distros import download_and_extract, fetch_text
+from flet_cli.utils.file_lock import file_lock
+from flet_cli.utils.toolchain_cache import file_stamp, get_cached, set_cached
 
 # Constants
 JDK_MAJOR_VER = 17
@@ -41,19 +44,32 @@ def check_jdk_version(jdk_path):
         otherwise `False`.
     """
 
-    try:
-        result = subprocess.run(
-            [os.path.join(jdk_path, "bin", "javac"), "-version"],
-            capture_output=True,
-            text=True,
-        )
-        version_line = result.stdout.strip("\n").split(" ")[
-            1
-        ]  # Extract version from output
-        major_version = int(version_line.split(".")[0])
-        return major_version == JDK_MAJOR_VER
-    except (IndexError, ValueError, FileNotFoundError):
-        return False
+    # `javac -version` starts a JVM; reuse the version found for this JDK until
+    # its release file or compiler changes
+    jdk_key = os.path.realpath(jdk_path)
+    stamp = file_stamp(
+        [
+            os.path.join(jdk_path, "release"),
+            os.path.join(jdk_path, "bin", "javac"),
+            os.path.join(jdk_path, "bin", "javac.exe"),
+        ]
+    )
+    major_version = get_cached("jdk_version", jdk_key, stamp)
+    if major_version is None:
+        try:
+            result = subprocess.run(
+                [os.path.join(jdk_path, "bin", "javac"), "-version"],
+                capture_output=True,
+                text=True,
+            )
+            version_line = result.stdout.strip("\n").split(" ")[
+                1
+            ]  # Extract version from output
+            major_version = int(version_line.split(".")[0])
+        except (IndexError, ValueError, FileNotFoundError):
+            return False
+        set_cached("jdk_version", jdk_key, stamp, major_version)
+    return major_version == JDK_MAJOR_VER
 
 
 def platform_info():
@@ -84,6 +100,42 @@ def platform_info():
     return platform_name, arch_name, ext
 
 
+def get_jdk_sha256(url: str) -> Optional[str]:
+    """
+    Look up the published SHA-256 digest of a Temurin JDK archive.
+
+    Temurin publishes `<archive>.sha256.txt` next to each archive, in
+    `sha256sum` format.
+
+    Args:
+        url: Archive URL.
+
+    Returns:
+        Hex digest, or `None` if it can't be downloaded.
+    """
+
+    text = fetch_text(f"{url}.sha256.txt")
+    digest = text.split()[0].lower() if text and text.split() else ""
+    return digest if re.fullmatch(r"[0-9a-f]{64}", digest) else None
+
+
+def _download_jdk(url, install_dir: Path, log, progress: Optional[Progress]):
+    # Step 5: Download and extract JDK next to its destination, so an
+    # interrupted install doesn't leave a partial `install_dir` behind
+    temp_extract_dir = install_dir.with_name(f"{JDK_DIR_NAME}_temp")
+    if temp_extract_dir.exists():
+        shutil.rmtree(temp_extract_dir)
+    log(f"Downloading and extracting JDK from {url}...")
+    sha256 = get_jdk_sha256(url)
+    if not sha256:
+        log("No published checksum found for the JDK archive.")
+    download_and_extract(url, temp_extract_dir, progress=progress, sha256=sha256)
+
+    # Move extracted `jdk-{JDK_DIR_NAME}` to the destination
+    shutil.move(str(temp_extract_dir / f"jdk-{JDK_DIR_NAME}"), str(install_dir))
+    shutil.rmtree(temp_extract_dir)
+
+
 def install_jdk(log, progress: Optional[Progress] = None):
     """
     Ensure a compatible JDK is available and return its home directory.
@@ -135,27 +187,17 @@ def install_jdk(log, progress: Optional[Progress] = None):
     install_dir = Path.home() / "java" / JDK_DIR_NAME
 
     # Step 4: Check if JDK is already installed
-    if not install_dir.exists():
-        # Step 5: Download and extract JDK
-        archive_path = os.path.join(tempfile.gettempdir(), f"jdk-{JDK_DIR_NAME}.{ext}")
-        log(f"Downloading JDK from {url}...")
-        download_with_progress(url, archive_path, progress=progress)
-
-        log(f"Extracting JDK to {install_dir}...")
-        install_dir.mkdir(exist_ok=True, parents=True)
-        extract_with_progress(archive_path, str(install_dir), progress=progress)
-
-        # Move contents of extracted `jdk-{JDK_DIR_NAME}` to the destination
-        extracted_root = os.path.join(install_dir, f"jdk-{JDK_DIR_NAME}")
-        for item in os.listdir(extracted_root):
-            shutil.move(os.path.join(extracted_root, item), str(install_dir))
-
-        shutil.rmtree(extracted_root)  # remove root
-
-        # Step 6: Clean up archive
-        os.remove(archive_path)
+    use_artifact("jdk", install_dir)
+    installed = install_dir.exists()
+    if not installed:
+        # another process may be installing the JDK: wait, then reuse it
+        with file_lock(f"jdk-{JDK_DIR_NAME}"):
+            installed = install_dir.exists()
+            if not installed:
+                _download_jdk(url, install_dir, log, progress)
 
     log(f"JDK installed at {install_dir}")
+    record_use("jdk", install_dir, hit=installed)
 
     if platform.system() == "Darwin":
         install_dir = install_dir / "Contents" / "Home"
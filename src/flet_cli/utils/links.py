@@ -0,0 +1,341 @@
+"""Materialize directory trees from a cache as cheaply as the filesystem allows.
+
+Files are cloned (reflink: `FICLONE` on Linux, `clonefile()` on macOS) where
+the filesystem supports copy-on-write, hard-linked where it doesn't, and
+copied as a last resort, e.g. across devices. The first strategy that works
+for a tree is reused for the rest of it.
+
+`TreeMirror` keeps a directory in sync with source trees, cloning or copying
+only files that changed and deleting the ones that went away. It doesn't
+hard-link by default, since the mirror is usually build output that gets
+modified in place (code signing, `strip`, post-processing).
+"""
+
+from __future__ import annotations
+
+import filecmp
+import os
+import shutil
+import stat
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+# _IOW(0x94, 9, int): clone a whole file (btrfs, xfs, bcachefs, ...).
+_FICLONE = 0x40049409
+
+
+def _reflink_linux(src: str, dst: str) -> None:
+    import fcntl
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _reflink_darwin(src: str, dst: str) -> None:
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno), src)
+
+
+def _hardlink(src: str, dst: str) -> None:
+    os.link(src, dst)
+
+
+def _copy(src: str, dst: str) -> None:
+    shutil.copy2(src, dst)
+
+
+def _strategies(allow_hardlinks: bool) -> list[Callable[[str, str], None]]:
+    strategies: list[Callable[[str, str], None]] = []
+    if sys.platform.startswith("linux"):
+        strategies.append(_reflink_linux)
+    elif sys.platform == "darwin":
+        strategies.append(_reflink_darwin)
+    if allow_hardlinks:
+        strategies.append(_hardlink)
+    strategies.append(_copy)
+    return strategies
+
+
+def _sticky_linker(allow_hardlinks: bool) -> Callable[[str, str], None]:
+    strategies = _strategies(allow_hardlinks)
+
+    def link_file(s: str, d: str) -> None:
+        while len(strategies) > 1:
+            try:
+                strategies[0](s, d)
+                return
+            except OSError:
+                # not supported here (or across devices): fall back for good
+                strategies.pop(0)
+        strategies[0](s, d)
+
+    return link_file
+
+
+def link_tree(src, dst, allow_hardlinks: bool = True) -> None:
+    """
+    Recreate the directory tree `src` at `dst` sharing file data where possible.
+
+    Hard-linked files share their inode with `src`: they must be replaced, not
+    modified in place. Symbolic links are recreated as links. `dst` must not
+    exist.
+
+    Args:
+        src: Existing directory to materialize.
+        dst: Destination directory to create.
+        allow_hardlinks: Whether hard links may be used when files can't be
+            cloned.
+    """
+
+    shutil.copytree(
+        Path(src),
+        Path(dst),
+        symlinks=True,
+        copy_function=_sticky_linker(allow_hardlinks),
+    )
+
+
+def link_files(pairs, allow_hardlinks: bool = True) -> None:
+    """
+    Create files sharing data with existing ones where possible.
+
+    Like `link_tree`, hard-linked files must be replaced, not modified in
+    place. Destinations must not exist.
+
+    Args:
+        pairs: `(src, dst)` file paths.
+        allow_hardlinks: Whether hard links may be used when files can't be
+            cloned.
+    """
+
+    link_file = _sticky_linker(allow_hardlinks)
+    for src, dst in pairs:
+        link_file(str(src), str(dst))
+
+
+@dataclass
+class MirrorStats:
+    """Number of entries `TreeMirror.sync` linked, kept and deleted."""
+
+    linked: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+class TreeMirror:
+    """
+    Mirror the contents of several source trees into one directory.
+
+    Sources are overlaid in the order they are added, like consecutive
+    `copy_tree` calls. `sync` only replaces files whose size, mode and
+    modification time (or, when only the time differs, contents) changed, and
+    deletes anything the sources no longer have. Symbolic links are mirrored
+    as links, and directories get the mode of their source.
+    """
+
+    def __init__(self):
+        # destination path relative to the mirror root, with `/` separators
+        # -> (source path, whether it may be hard-linked)
+        self._entries: dict[str, tuple[str, bool]] = {}
+
+    def add(
+        self,
+        src,
+        names: Optional[Iterable[str]] = None,
+        allow_hardlinks: bool = False,
+    ) -> None:
+        """
+        Overlay the contents of directory `src`.
+
+        Args:
+            src: Directory whose contents are mirrored.
+            names: Only mirror these top-level entries of `src`; all when
+                `None`.
+            allow_hardlinks: Whether files may be hard-linked when they can't
+                be cloned. Only for sources that may change when the mirror is
+                modified in place; otherwise files are copied.
+        """
+
+        src = str(src)
+        for name in os.listdir(src) if names is None else names:
+            path = os.path.join(src, name)
+            if os.path.lexists(path):
+                self._add(name, path, allow_hardlinks)
+
+    def _add(self, rel: str, path: str, allow_hardlinks: bool) -> None:
+        previous = self._entries.get(rel)
+        is_dir = os.path.isdir(path) and not os.path.islink(path)
+        if previous and not is_dir and _is_dir(previous[0]):
+            # a file replaces a directory of an earlier source
+            prefix = f"{rel}/"
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+        self._entries[rel] = (path, allow_hardlinks)
+        if is_dir:
+            with os.scandir(path) as it:
+                for entry in it:
+                    self._add(f"{rel}/{entry.name}", entry.path, allow_hardlinks)
+
+    def clear(self) -> None:
+        """Forget all sources added so far."""
+
+        self._entries.clear()
+
+    def sync(self, dst, delete: bool = True) -> MirrorStats:
+        """
+        Make directory `dst` mirror the added sources.
+
+        Files of sources added with `allow_hardlinks` may share their inode
+        with the source: like with `link_tree`, they must be replaced, not
+        modified in place.
+
+        Args:
+            dst: Directory to update, created if missing.
+            delete: Whether to delete entries of `dst` the sources don't have.
+
+        Returns:
+            Counts of linked, unchanged and removed entries.
+        """
+
+        dst = Path(dst)
+        dst.mkdir(parents=True, exist_ok=True)
+        stats = MirrorStats()
+        if delete:
+            self._remove_stale(str(dst), "", stats)
+
+        linkers = {
+            True: _sticky_linker(allow_hardlinks=True),
+            False: _sticky_linker(allow_hardlinks=False),
+        }
+        # applied last, so read-only directories can still be filled
+        dir_modes: list[tuple[Path, int]] = []
+        # sorted, so that directories are created before their contents
+        for rel in sorted(self._entries):
+            src, allow_hardlinks = self._entries[rel]
+            target = dst / rel
+            src_st = os.lstat(src)
+            try:
+                dst_st: Optional[os.stat_result] = os.lstat(target)
+            except FileNotFoundError:
+                dst_st = None
+
+            if stat.S_ISDIR(src_st.st_mode):
+                if dst_st is not None and not stat.S_ISDIR(dst_st.st_mode):
+                    target.unlink()
+                    dst_st = None
+                if dst_st is None:
+                    target.mkdir()
+                    stats.linked += 1
+                else:
+                    stats.unchanged += 1
+                mode = stat.S_IMODE(src_st.st_mode)
+                if dst_st is not None and not dst_st.st_mode & stat.S_IWUSR:
+                    # a read-only directory of an earlier sync
+                    os.chmod(target, stat.S_IMODE(dst_st.st_mode) | stat.S_IWUSR)
+                    dst_st = None
+                if dst_st is None or stat.S_IMODE(dst_st.st_mode) != mode:
+                    dir_modes.append((target, mode))
+            elif stat.S_ISLNK(src_st.st_mode):
+                link = os.readlink(src)
+                if dst_st is not None and stat.S_ISLNK(dst_st.st_mode):
+                    if os.readlink(target) == link:
+                        stats.unchanged += 1
+                        continue
+                if dst_st is not None:
+                    _remove(target, dst_st)
+                os.symlink(link, target)
+                stats.linked += 1
+            elif dst_st is not None and _up_to_date(
+                src, src_st, target, dst_st, allow_hardlinks
+            ):
+                stats.unchanged += 1
+            else:
+                if dst_st is not None and stat.S_ISDIR(dst_st.st_mode):
+                    shutil.rmtree(target)
+                # link next to the target, then swap: never write through a
+                # hard link into the previous source
+                tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+                tmp.unlink(missing_ok=True)
+                linkers[allow_hardlinks](src, str(tmp))
+                os.replace(tmp, target)
+                stats.linked += 1
+        for target, mode in reversed(dir_modes):
+            os.chmod(target, mode)
+        return stats
+
+    def _remove_stale(self, path: str, rel: str, stats: MirrorStats) -> None:
+        with os.scandir(path) as it:
+            entries = list(it)
+        for entry in entries:
+            entry_rel = f"{rel}{entry.name}"
+            source = self._entries.get(entry_rel)
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if source is None or is_dir != _is_dir(source[0]):
+                _make_writable(path)
+                _remove(Path(entry.path), entry.stat(follow_symlinks=False))
+                stats.removed += 1
+            elif is_dir:
+                self._remove_stale(entry.path, f"{entry_rel}/", stats)
+
+
+def _is_dir(path: str) -> bool:
+    return os.path.isdir(path) and not os.path.islink(path)
+
+
+def _make_writable(path: str) -> None:
+    # sync() restores the mode of directories that have a source
+    mode = stat.S_IMODE(os.lstat(path).st_mode)
+    if not mode & stat.S_IWUSR:
+        os.chmod(path, mode | stat.S_IWUSR)
+
+
+def _remove(path: Path, st: os.stat_result) -> None:
+    if stat.S_ISDIR(st.st_mode):
+        # read-only directories can't be emptied
+        for dirpath, dirnames, _ in os.walk(path):
+            for name in dirnames:
+                _make_writable(os.path.join(dirpath, name))
+        _make_writable(str(path))
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def _up_to_date(
+    src: str,
+    src_st: os.stat_result,
+    dst: Path,
+    dst_st: os.stat_result,
+    allow_hardlinks: bool,
+) -> bool:
+    if not stat.S_ISREG(dst_st.st_mode):
+        return False
+    if (src_st.st_dev, src_st.st_ino) == (dst_st.st_dev, dst_st.st_ino):
+        # a hard link, e.g. made by an earlier release, is replaced by a copy
+        # unless allowed
+        return allow_hardlinks
+    if src_st.st_size != dst_st.st_size:
+        return False
+    if stat.S_IMODE(src_st.st_mode) != stat.S_IMODE(dst_st.st_mode):
+        return False
+    if src_st.st_mtime_ns == dst_st.st_mtime_ns:
+        return True
+    # rebuilt with the same contents: keep the file, and its new time so the
+    # next sync doesn't compare it again
+    if filecmp.cmp(src, dst, shallow=False):
+        os.utime(dst, ns=(src_st.st_atime_ns, src_st.st_mtime_ns))
+        return True
+    return False
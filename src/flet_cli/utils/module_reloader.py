@@ -0,0 +1,353 @@
+"""In-process reloader behind `flet run --reload=module`.
+
+`flet run` starts the app as `python -m flet_cli.utils.module_reloader
+[-m] <script or module> [args...]`. The reloader connects back to `flet run`,
+then runs the app like `python` would, capturing the `main` it passes to
+`flet.run()`. On each batch of changed files received from `flet run` it
+reloads the changed modules (and the modules that hold references to them),
+re-executes the entry point to pick up the new `main` - `flet.run()` doesn't
+start another server then - and runs it again on every connected page.
+
+Interpreter startup, imports of unchanged dependencies and the server
+connection survive reloads. App state kept outside the page, e.g. in
+module globals of unchanged modules, survives too.
+
+Re-running `main` relies on Flet internals (`flet.controls.context` and the
+page session's `after_event()` and `error()`), present in Flet 0.70 through
+0.86. With other Flet versions the reloader doesn't connect to `flet run`,
+which then restarts the app process on changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import inspect
+import os
+import runpy
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+import weakref
+from multiprocessing.connection import Client
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+ADDRESS_ENV = "FLET_RELOAD_ADDRESS"
+AUTHKEY_ENV = "FLET_RELOAD_AUTHKEY"
+
+# time to wait for more changes of the same save before reloading
+_COALESCE_SECONDS = 0.05
+
+
+class _Reloader:
+    """Runs the app's entry point and reloads it on request of `flet run`."""
+
+    def __init__(self, target: str, is_module: bool):
+        self.target = target
+        self.is_module = is_module
+        self.main: Optional[Callable] = None
+        self.started = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pages: weakref.WeakSet = weakref.WeakSet()
+        self.lock = threading.Lock()
+        self.library_dirs = tuple(
+            {
+                os.path.normcase(os.path.realpath(p))
+                for p in (
+                    sys.prefix,
+                    sys.base_prefix,
+                    sys.exec_prefix,
+                    *sysconfig.get_paths().values(),
+                )
+                if p
+            }
+        )
+
+    def patch_flet(self) -> None:
+        """Route `flet.run()` and friends through `_capture`."""
+
+        import flet
+        import flet.app
+
+        for name in ("run", "app"):
+            original = getattr(flet.app, name, None)
+            if original is not None:
+                patched = self._patch_run(original)
+                setattr(flet.app, name, patched)
+                setattr(flet, name, patched)
+        for name in ("run_async", "app_async"):
+            original = getattr(flet.app, name, None)
+            if original is not None:
+                patched = self._patch_run_async(original)
+                setattr(flet.app, name, patched)
+                setattr(flet, name, patched)
+
+    def _capture(self, args: tuple, kwargs: dict) -> tuple[bool, tuple, dict]:
+        """Remember the app's `main`; return whether the server runs already."""
+
+        main = args[0] if args else kwargs.get("main", kwargs.get("target"))
+        if main == self.entry:
+            # `flet.run()` calling `flet.run_async()`
+            return False, args, kwargs
+        if args:
+            self.main, args = args[0], (self.entry, *args[1:])
+        else:
+            key = "main" if "main" in kwargs else "target"
+            self.main = kwargs.get(key)
+            kwargs = {**kwargs, key: self.entry}
+        started, self.started = self.started, True
+        return started, args, kwargs
+
+    def _patch_run(self, original: Callable) -> Callable:
+        def run(*args, **kwargs):
+            started, args, kwargs = self._capture(args, kwargs)
+            if started:
+                return None
+            return original(*args, **kwargs)
+
+        return run
+
+    def _patch_run_async(self, original: Callable) -> Callable:
+        async def run_async(*args, **kwargs):
+            started, args, kwargs = self._capture(args, kwargs)
+            if started:
+                return None
+            self.loop = asyncio.get_running_loop()
+            return await original(*args, **kwargs)
+
+        return run_async
+
+    async def entry(self, page) -> None:
+        """Page entry point passed to Flet instead of the app's `main`."""
+
+        self.loop = asyncio.get_running_loop()
+        self.pages.add(page)
+        await _call_main(self.main, page, page.session)
+
+    # reloading
+
+    def listen(self, address: str, authkey: bytes) -> None:
+        """
+        Receive changed paths from `flet run` and reload, until it goes away.
+
+        Args:
+            address: `host:port` of the `flet run` listener.
+            authkey: Key authenticating the connection.
+        """
+
+        host, _, port = address.rpartition(":")
+        conn = Client((host, int(port)), authkey=authkey)
+        while True:
+            try:
+                paths = set(conn.recv())
+                while conn.poll(_COALESCE_SECONDS):
+                    paths.update(conn.recv())
+            except (EOFError, OSError):
+                return
+            paths = {p for p in paths if "__pycache__" not in p}
+            # before `flet.run()` a reload would start a second server
+            if paths and self.started:
+                self.reload(paths)
+
+    def reload(self, paths: set[str]) -> None:
+        """
+        Reload the modules of changed files and re-run `main` on all pages.
+
+        The reload runs on the app's event loop, so no event handler or page
+        sees a half-reloaded app. The running app is kept as is when a
+        module fails to reload.
+
+        Args:
+            paths: Changed file paths.
+        """
+
+        loop = self.loop
+        if loop is None:
+            # the server hasn't started a loop: no app code runs yet
+            with self.lock:
+                self._reload(paths)
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._reload_async(paths), loop).result()
+        except RuntimeError:
+            pass  # the loop was closed, the app is exiting
+
+    async def _reload_async(self, paths: set[str]) -> None:
+        pages = self._reload(paths)
+        for page in pages or ():
+            await self._rerun(page)
+
+    def _reload(self, paths: set[str]) -> Optional[list]:
+        start = time.perf_counter()
+        changed = {os.path.normcase(os.path.realpath(p)) for p in paths}
+        try:
+            modules = self._modules_to_reload(changed)
+            for module in modules:
+                importlib.reload(module)
+            if self.is_module:
+                runpy.run_module(self.target, run_name="__main__")
+            else:
+                runpy.run_path(self.target, run_name="__main__")
+        except BaseException:
+            traceback.print_exc()
+            print("Reload failed, keeping the running app.", flush=True)
+            return None
+
+        pages = list(self.pages)
+        print(
+            f"Reloaded {len(modules)} module(s) for {len(pages)} page(s) "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms",
+            flush=True,
+        )
+        return pages
+
+    def _module_file(self, module: ModuleType) -> Optional[str]:
+        path = getattr(module, "__file__", None)
+        if not path:
+            return None
+        path = os.path.normcase(os.path.realpath(path))
+        if path.startswith(self.library_dirs):
+            return None
+        return path
+
+    def _modules_to_reload(self, changed: set[str]) -> list[ModuleType]:
+        app_modules = {
+            name: module
+            for name, module in list(sys.modules.items())
+            if name != "__main__"
+            and isinstance(module, ModuleType)
+            and self._module_file(module)
+        }
+        stale = {
+            name
+            for name, module in app_modules.items()
+            if self._module_file(module) in changed
+        }
+
+        # modules holding references to reloaded ones would keep using the
+        # old objects: reload them too
+        pending = list(stale)
+        while pending:
+            name = pending.pop()
+            for other, module in app_modules.items():
+                if other not in stale and _references(module, name):
+                    stale.add(other)
+                    pending.append(other)
+
+        # sys.modules lists packages before the modules they import:
+        # reload dependencies first
+        return [app_modules[n] for n in reversed(app_modules) if n in stale]
+
+    async def _rerun(self, page) -> None:
+        from flet.controls.context import _context_page, context
+
+        try:
+            session = page.session
+        except RuntimeError:
+            self.pages.discard(page)  # session closed
+            return
+        _context_page.set(page)
+        context.reset_auto_update()
+        del page.views[1:]
+        page.controls.clear()
+        try:
+            await _call_main(self.main, page, session)
+            await session.after_event(page)
+        except Exception as e:
+            traceback.print_exc()
+            session.error(f"{e}\n{traceback.format_exc()}")
+
+
+def rerun_supported() -> bool:
+    """Whether the installed Flet has the internals `_rerun()` relies on."""
+
+    try:
+        from flet.controls.context import _context_page, context
+        from flet.messaging.session import Session
+    except ImportError:
+        return False
+    return (
+        hasattr(_context_page, "set")
+        and hasattr(context, "reset_auto_update")
+        and hasattr(Session, "after_event")
+        and hasattr(Session, "error")
+    )
+
+
+def _references(module: ModuleType, name: str) -> bool:
+    # `import x` references see the reloaded module; `from x import y` ones
+    # keep the old `y`
+    for value in list(vars(module).values()):
+        if isinstance(value, ModuleType):
+            continue
+        try:
+            if getattr(value, "__module__", None) == name:
+                return True
+        except Exception:
+            pass
+    return False
+
+
+async def _call_main(main: Any, page, session) -> None:
+    """Run `main(page)` the way Flet runs the app's entry point."""
+
+    if inspect.iscoroutinefunction(main):
+        await main(page)
+    elif inspect.isasyncgenfunction(main):
+        async for _ in main(page):
+            await session.after_event(page)
+    elif inspect.isgeneratorfunction(main):
+        for _ in main(page):
+            await session.after_event(page)
+    else:
+        main(page)
+
+
+def main() -> None:
+    """Run the app given on the command line with module reloading."""
+
+    args = sys.argv[1:]
+    is_module = bool(args) and args[0] == "-m"
+    if is_module:
+        args = args[1:]
+    if not args:
+        print(
+            "usage: python -m flet_cli.utils.module_reloader [-m] target [args...]"
+        )
+        sys.exit(2)
+
+    target = args[0]
+    reloader = _Reloader(target, is_module)
+    sys.argv = args
+    if not is_module:
+        # like `python script.py`: the script's directory comes first
+        sys.path[0] = os.path.dirname(os.path.abspath(target))
+
+    address = os.environ.pop(ADDRESS_ENV, None)
+    authkey = os.environ.pop(AUTHKEY_ENV, None)
+    if address and authkey and not rerun_supported():
+        # without a reloader `flet run` restarts the app instead
+        print(
+            "Module reload isn't supported by the installed Flet, "
+            "restarting the app on changes instead.",
+            flush=True,
+        )
+    elif address and authkey:
+        threading.Thread(
+            target=reloader.listen,
+            args=(address, bytes.fromhex(authkey)),
+            daemon=True,
+        ).start()
+
+    reloader.patch_flet()
+    if is_module:
+        runpy.run_module(target, run_name="__main__", alter_sys=True)
+    else:
+        runpy.run_path(target, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
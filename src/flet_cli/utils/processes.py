@@ -1,5 +1,6 @@
 import os
 import subprocess
+import threading
 from typing import Optional
 
 from flet.utils import is_windows
@@ -7,13 +8,39 @@ from flet.utils import is_windows
 if is_windows():
     from ctypes import windll
 
+# Build steps may run commands concurrently; the console code page is process
+# wide, so it is switched on the first active command and restored on the last.
+_code_page_lock = threading.Lock()
+_code_page_users = 0
+_previous_code_page = None
+
+
+def _acquire_utf8_code_page():
+    global _code_page_users, _previous_code_page
+    with _code_page_lock:
+        if _code_page_users == 0:
+            # Source: https://stackoverflow.com/a/77374899/1435891
+            # Save the current console output code page and switch to 65001 (UTF-8)
+            _previous_code_page = windll.kernel32.GetConsoleOutputCP()
+            windll.kernel32.SetConsoleOutputCP(65001)
+        _code_page_users += 1
+
+
+def _release_utf8_code_page():
+    global _code_page_users
+    with _code_page_lock:
+        _code_page_users -= 1
+        if _code_page_users == 0:
+            # Restore the previous output console code page.
+            windll.kernel32.SetConsoleOutputCP(_previous_code_page)
+
 
 def run(args, cwd, env: Optional[dict] = None, capture_output=True, log=None):
     """
     Execute a subprocess command with optional streamed logging.
 
     On Windows, the console output code page is temporarily switched to UTF-8
-    while the command runs, then restored.
+    while the command runs, then restored once no other command is running.
 
     Args:
         args: Command and arguments passed to the subprocess.
@@ -34,11 +61,15 @@ def run(args, cwd, env: Optional[dict] = None, capture_output=True, log=None):
     """
 
     if is_windows():
-        # Source: https://stackoverflow.com/a/77374899/1435891
-        # Save the current console output code page and switch to 65001 (UTF-8)
-        previousCp = windll.kernel32.GetConsoleOutputCP()
-        windll.kernel32.SetConsoleOutputCP(65001)
+        _acquire_utf8_code_page()
+    try:
+        return _run(args, cwd, env, capture_output, log)
+    finally:
+        if is_windows():
+            _release_utf8_code_page()
+
 
+def _run(args, cwd, env, capture_output, log):
     cmd_env = None
     if env is not None:
         cmd_env = os.environ.copy()
@@ -87,8 +118,4 @@ def run(args, cwd, env: Optional[dict] = None, capture_output=True, log=None):
         process.stdout.close()
         process.wait()
 
-    if is_windows():
-        # Restore the previous output console code page.
-        windll.kernel32.SetConsoleOutputCP(previousCp)
-
     return process
@@ -5,19 +5,30 @@ python_stdlib.zip / pyodide-lock.json / ...) but not the micropip+packaging
 wheels that `loadPackage("micropip")` needs at runtime. We supplement the core
 tarball with those two wheels (filenames resolved from pyodide-lock.json) so
 the bundle works in `--no-cdn` deployments too.
+
+The cache carries a small stamp recording the version and its files, and
+builds keep one for the directory they place the runtime in, outside of the
+shipped tree. Checking them needs a few `stat` calls instead of parsing the
+multi-MB pyodide-lock.json. Files are placed as reflinks or hard links to the
+cache where the filesystem allows.
 """
 
 from __future__ import annotations
 
+import contextlib
 import json
 import shutil
 import tarfile
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import Optional
 
 from rich.progress import Progress
 
+from flet_cli.utils.cache_index import record_use, use_artifact
 from flet_cli.utils.distros import download_with_progress
+from flet_cli.utils.file_lock import file_lock
+from flet_cli.utils.links import link_files
 from flet_cli.utils.template_cache import get_cache_root
 
 _GITHUB_TARBALL_URL = "https://github.com/pyodide/pyodide/releases/download/{version}/pyodide-core-{version}.tar.bz2"
@@ -27,38 +38,60 @@ _CDN_FILE_URL = "https://cdn.jsdelivr.net/pyodide/v{version}/full/{filename}"
 # Without them in dest_dir, `--no-cdn` builds break.
 _EXTRA_RUNTIME_PACKAGES = ("micropip", "packaging")
 
+_STAMP_FILE = ".flet-pyodide.json"
+
 
 def _flet_cache_root() -> Path:
     return get_cache_root() / "pyodide"
 
 
-def _download(url: str, dest: Path, progress: Progress, description: str) -> None:
+def _download(
+    url: str,
+    dest: Path,
+    progress: Progress,
+    description: str,
+    sha256: Optional[str] = None,
+) -> None:
     dest.parent.mkdir(parents=True, exist_ok=True)
-    download_with_progress(url, str(dest), progress, description=description)
+    download_with_progress(
+        url, str(dest), progress, description=description, sha256=sha256
+    )
 
 
-def _resolve_runtime_wheel_filenames(
+def _resolve_runtime_wheels(
     lock_json: Path, package_names: Iterable[str]
-) -> list[str]:
+) -> list[tuple[str, Optional[str]]]:
+    """Return the file names and SHA-256 digests of wheels in pyodide-lock.json."""
     with lock_json.open("r", encoding="utf-8") as f:
         lock = json.load(f)
     wanted = set(package_names)
-    filenames: list[str] = []
+    wheels: list[tuple[str, Optional[str]]] = []
     for pkg in lock.get("packages", {}).values():
         name = pkg.get("name")
         fn = pkg.get("file_name")
         if name in wanted and isinstance(fn, str) and fn.endswith(".whl"):
-            filenames.append(fn)
-    return filenames
+            wheels.append((fn, pkg.get("sha256")))
+    return wheels
+
+
+@contextlib.contextmanager
+def _progress_or_own(progress: Optional[Progress]) -> Iterator[Progress]:
+    if progress is not None:
+        yield progress
+    else:
+        with Progress(transient=True) as own:
+            yield own
 
 
-def _populate_cache(version: str, cache_dir: Path) -> None:
+def _populate_cache(
+    version: str, cache_dir: Path, progress: Optional[Progress] = None
+) -> None:
     """Fetch core tarball + supplementary wheels into `cache_dir`."""
 
     cache_dir.mkdir(parents=True, exist_ok=True)
     tarball = cache_dir / f"pyodide-core-{version}.tar.bz2"
 
-    with Progress(transient=True) as progress:
+    with _progress_or_own(progress) as progress:
         _download(
             _GITHUB_TARBALL_URL.format(version=version),
             tarball,
@@ -88,8 +121,8 @@ def _populate_cache(version: str, cache_dir: Path) -> None:
     lock_json = cache_dir / "pyodide-lock.json"
     if not lock_json.exists():
         raise RuntimeError(f"pyodide-core-{version} did not contain pyodide-lock.json")
-    with Progress(transient=True) as progress:
-        for wheel in _resolve_runtime_wheel_filenames(
+    with _progress_or_own(progress) as progress:
+        for wheel, sha256 in _resolve_runtime_wheels(
             lock_json, _EXTRA_RUNTIME_PACKAGES
         ):
             wheel_path = cache_dir / wheel
@@ -100,6 +133,7 @@ def _populate_cache(version: str, cache_dir: Path) -> None:
                 wheel_path,
                 progress,
                 f"Downloading {wheel}...",
+                sha256=sha256,
             )
 
 
@@ -115,26 +149,129 @@ def _cache_matches_version(cache_dir: Path, version: str) -> bool:
     return lock.get("info", {}).get("version") == version
 
 
-def ensure_pyodide(version: str, dest_dir: Path) -> None:
+def _read_stamp(stamp_path: Path) -> Optional[dict]:
+    try:
+        with stamp_path.open("r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return stamp if isinstance(stamp, dict) else None
+
+
+def _write_stamp(stamp_path: Path, version: str, files: dict[str, int]) -> None:
+    stamp_path.parent.mkdir(parents=True, exist_ok=True)
+    with stamp_path.open("w", encoding="utf-8") as f:
+        json.dump({"version": version, "files": files}, f)
+
+
+def _stamp_matches(
+    directory: Path, version: str, stamp_path: Optional[Path] = None
+) -> Optional[dict[str, int]]:
+    """Return the stamped `{file name: size}` if `directory` holds `version`.
+
+    The stamp is read from `stamp_path`, by default a file in `directory`.
+    """
+    stamp = _read_stamp(stamp_path or directory / _STAMP_FILE)
+    if not stamp or stamp.get("version") != version:
+        return None
+    files = stamp.get("files")
+    if not isinstance(files, dict):
+        return None
+    for name, size in files.items():
+        try:
+            if (directory / name).stat().st_size != size:
+                return None
+        except OSError:
+            return None
+    return files
+
+
+def _stamp_cache(cache_dir: Path, version: str) -> dict[str, int]:
+    files = {
+        src.name: src.stat().st_size
+        for src in cache_dir.iterdir()
+        if src.is_file() and src.name != _STAMP_FILE
+    }
+    _write_stamp(cache_dir / _STAMP_FILE, version, files)
+    return files
+
+
+def ensure_pyodide_cache(
+    version: str, progress: Optional[Progress] = None
+) -> tuple[Path, dict[str, int]]:
+    """Ensure the Pyodide runtime of `version` is in the cache.
+
+    Args:
+        version: Pyodide version.
+        progress: Progress to report downloads to; by default a transient one
+            is shown.
+
+    Returns:
+        The cache directory and the `{file name: size}` of the runtime files.
+    """
+
+    cache_dir = _flet_cache_root() / version
+    use_artifact("pyodide", cache_dir)
+    files = _stamp_matches(cache_dir, version)
+    hit = files is not None
+    if files is None:
+        # another process may be populating the cache: wait, then reuse it
+        with file_lock(f"pyodide-{version}"):
+            files = _stamp_matches(cache_dir, version)
+            hit = files is not None
+            if files is None:
+                if not _cache_matches_version(cache_dir, version):
+                    # Wipe a partial cache from a prior failed run.
+                    if cache_dir.exists():
+                        shutil.rmtree(cache_dir)
+                    _populate_cache(version, cache_dir, progress)
+                # the stamp is written last: it marks a complete cache
+                files = _stamp_cache(cache_dir, version)
+    record_use("pyodide", cache_dir, hit=hit)
+    return cache_dir, files
+
+
+def ensure_pyodide(
+    version: str,
+    dest_dir: Path,
+    stamp_path: Optional[Path] = None,
+    allow_hardlinks: bool = False,
+) -> None:
     """Ensure a working Pyodide runtime of `version` exists at `dest_dir`.
 
-    Cached per version under `~/.flet/cache/pyodide/<version>/`. Idempotent: if
-    `dest_dir/pyodide-lock.json` already pins `version`, no work is done.
+    Cached per version under `~/.flet/cache/pyodide/<version>/`. With
+    `stamp_path`, idempotent: if the stamp records `version` and the files in
+    `dest_dir` are intact, no work is done. The stamp is kept outside of
+    `dest_dir`, so it's not shipped with the app.
+
+    Args:
+        version: Pyodide version.
+        dest_dir: Directory to place the runtime in.
+        stamp_path: File recording the runtime placed in `dest_dir`.
+        allow_hardlinks: Whether files may be hard-linked to the cache when
+            they can't be cloned. Only for directories that are copied
+            elsewhere rather than deployed: edits of hard-linked files write
+            through into the cache.
     """
 
     dest_dir = Path(dest_dir)
-    if _cache_matches_version(dest_dir, version):
+    # left in the runtime directory by earlier releases
+    (dest_dir / _STAMP_FILE).unlink(missing_ok=True)
+    if stamp_path and _stamp_matches(dest_dir, version, stamp_path) is not None:
         return
 
-    cache_dir = _flet_cache_root() / version
-    if not _cache_matches_version(cache_dir, version):
-        # Wipe a partial cache from a prior failed run.
-        if cache_dir.exists():
-            shutil.rmtree(cache_dir)
-        _populate_cache(version, cache_dir)
+    cache_dir, files = ensure_pyodide_cache(version)
 
     dest_dir.mkdir(parents=True, exist_ok=True)
-    for src in cache_dir.iterdir():
-        if not src.is_file():
-            continue
-        shutil.copy2(src, dest_dir / src.name)
+    if stamp_path:
+        # a stale stamp must not outlive a partial update
+        stamp_path.unlink(missing_ok=True)
+    for name in files:
+        # replace rather than overwrite: existing files may be linked to a cache
+        (dest_dir / name).unlink(missing_ok=True)
+    link_files(
+        ((cache_dir / name, dest_dir / name) for name in files),
+        allow_hardlinks=allow_hardlinks,
+    )
+    if stamp_path:
+        _write_stamp(stamp_path, version, files)
@@ -23,6 +23,8 @@ from typing import Callable, Optional
 from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 
+from flet_cli.utils.cache_index import record_use, use_artifact
+from flet_cli.utils.file_lock import file_lock
 from flet_cli.utils.template_cache import get_cache_root
 
 # python-build release this flet pins. Keep in sync with serious_python's
@@ -75,28 +77,41 @@ def _load_manifest() -> dict:
     url = _MANIFEST_URL.format(date=date)
     cache_path = get_cache_root() / "python-build" / f"manifest-{date}.json"
 
-    if not (cache_path.exists() and cache_path.stat().st_size > 0):
+    def cached() -> bool:
+        return cache_path.exists() and cache_path.stat().st_size > 0
+
+    use_artifact("python-build", cache_path)
+    hit = cached()
+    if not hit:
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
-        try:
-            with urllib.request.urlopen(url) as resp, open(tmp_path, "wb") as out:
-                shutil.copyfileobj(resp, out)
-                out.flush()
-                os.fsync(out.fileno())
-            os.replace(tmp_path, cache_path)
-        except BaseException as e:
-            tmp_path.unlink(missing_ok=True)
-            if not (cache_path.exists() and cache_path.stat().st_size > 0):
-                raise RuntimeError(
-                    f"Could not obtain the Python build manifest for release "
-                    f"{date} from {url}: {e}. Check your network connection, or "
-                    f"set ${MANIFEST_PATH_ENV} to a local manifest.json."
-                ) from e
+        with file_lock(f"python-build-{date}"):
+            # fetched by another process while waiting for the lock
+            hit = cached()
+            if not hit:
+                _download_manifest(url, cache_path, date)
 
+    record_use("python-build", cache_path, hit=hit)
     with cache_path.open(encoding="utf-8") as f:
         return json.load(f)
 
 
+def _download_manifest(url: str, cache_path, date: str) -> None:
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    try:
+        with urllib.request.urlopen(url) as resp, open(tmp_path, "wb") as out:
+            shutil.copyfileobj(resp, out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, cache_path)
+    except BaseException as e:
+        tmp_path.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"Could not obtain the Python build manifest for release "
+            f"{date} from {url}: {e}. Check your network connection, or "
+            f"set ${MANIFEST_PATH_ENV} to a local manifest.json."
+        ) from e
+
+
 @lru_cache(maxsize=1)
 def _load_data() -> tuple[tuple[PythonRelease, ...], str]:
     manifest = _load_manifest()
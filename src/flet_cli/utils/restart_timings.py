@@ -0,0 +1,124 @@
+"""Restart latency measurements for `flet run --timings`.
+
+A restart is split into phases, so slow reloads can be attributed:
+
+* `detect` - first file event to the restart: debouncing and change checks.
+* `shutdown` - terminating the old app process until it exited.
+* `spawn` - starting the new app process.
+* `startup` - new process started until the app server is up, i.e. the
+  interpreter startup, imports and `flet.run()`.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+PHASES = ["detect", "shutdown", "spawn", "startup"]
+# marks ending each phase
+_MARKS = ["terminating", "exited", "spawned", "ready"]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Return the `fraction` percentile of `values` by linear interpolation.
+
+    Args:
+        values: Non-empty list of values.
+        fraction: Percentile between 0 and 1, e.g. `0.95`.
+    """
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class RestartTimings:
+    """
+    Collect restart phases and report them with a rolling summary.
+
+    Args:
+        window: Number of recent restarts the p50/p95 summary covers.
+        jsonl_path: File to append one JSON object per restart to.
+    """
+
+    def __init__(self, window: int = 50, jsonl_path: Optional[str] = None):
+        self.jsonl_path = jsonl_path
+        self.count = 0
+        self._history: deque[dict[str, float]] = deque(maxlen=window)
+        self._current: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def begin(self, event_time: float, paths: list[str]) -> None:
+        """
+        Start measuring a restart.
+
+        Args:
+            event_time: `time.monotonic()` of the first file event.
+            paths: Changed files that caused the restart.
+        """
+
+        with self._lock:
+            self._current = {"start": event_time, "paths": paths, "marks": {}}
+
+    def mark(self, name: str) -> None:
+        """
+        Record the end of a phase of the current restart.
+
+        `ready` completes the restart and prints its report.
+
+        Args:
+            name: One of `terminating`, `exited`, `spawned` and `ready`.
+        """
+
+        with self._lock:
+            current = self._current
+            if current is None or name in current["marks"]:
+                return
+            current["marks"][name] = time.monotonic()
+            if name != "ready":
+                return
+            self._current = None
+        self._finish(current)
+
+    def _finish(self, current: dict) -> None:
+        previous = current["start"]
+        phases = {}
+        for phase, mark in zip(PHASES, _MARKS):
+            end = current["marks"].get(mark, previous)
+            phases[phase] = end - previous
+            previous = end
+        phases["total"] = previous - current["start"]
+
+        self.count += 1
+        self._history.append(phases)
+        print(
+            f"Restart {self.count}: "
+            + ", ".join(f"{k} {v:.2f}s" for k, v in phases.items())
+        )
+        summary = []
+        for phase in [*PHASES, "total"]:
+            values = [h[phase] for h in self._history]
+            summary.append(
+                f"{phase} {percentile(values, 0.5):.2f}"
+                f"/{percentile(values, 0.95):.2f}s"
+            )
+        print(f"  p50/p95 of last {len(self._history)}: {', '.join(summary)}")
+
+        if self.jsonl_path:
+            record = {
+                "restart": self.count,
+                "time": time.time(),
+                "paths": current["paths"],
+                **{f"{k}_s": round(v, 4) for k, v in phases.items()},
+            }
+            try:
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"Unable to write restart timings: {e}")
@@ -0,0 +1,181 @@
+"""Content-addressed store of installed site-packages, shared across builds.
+
+Installing app dependencies is the slowest part of packaging a native build,
+yet apps built on the same machine often resolve to identical sets. Entries
+live under `~/.flet/cache/site-packages/<key>/`, where the key digests
+everything that determines the installed files: requirements, package
+platform, architectures, Python release and packaging flags. An entry holds
+named trees (the `site-packages` directory and the Flutter extension packages
+found in it) and is published with an atomic rename, so it is either absent
+or complete.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from packaging.requirements import InvalidRequirement, Requirement
+
+from flet_cli.utils.cache_index import record_use, use_artifact
+from flet_cli.utils.links import link_tree
+from flet_cli.utils.template_cache import get_cache_root
+
+# Bump when the entry layout or key derivation changes.
+_STORE_VERSION = 1
+
+
+def _store_root() -> Path:
+    return get_cache_root() / "site-packages"
+
+
+def site_packages_key(*parts) -> str:
+    """
+    Return the store key for the given site-packages inputs.
+
+    Args:
+        parts: JSON-serializable values that determine the installed files.
+    """
+
+    data = json.dumps([_STORE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+# requirements.txt options that pull in other files or local sources, which
+# the file's own contents don't capture
+_LOCAL_REFERENCE_OPTIONS = (
+    "-r",
+    "--requirement",
+    "-c",
+    "--constraint",
+    "-e",
+    "--editable",
+    "-f",
+    "--find-links",
+)
+
+
+def requirements_txt_is_portable(path) -> bool:
+    """
+    Check whether a `requirements.txt` fully describes its requirements.
+
+    Files referencing other requirement files, editable installs or local
+    paths can resolve differently while their contents stay the same, so
+    their installs are not shared.
+
+    Args:
+        path: `requirements.txt` file to check.
+    """
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split(" #", 1)[0].strip()
+            if not line or line.startswith("#"):
+                continue
+            if (
+                line.split("=", 1)[0].split(" ", 1)[0] in _LOCAL_REFERENCE_OPTIONS
+                or line.startswith((".", "/", "~"))
+                or "file:" in line
+            ):
+                return False
+    return True
+
+
+def requirement_is_portable(dependency: str) -> bool:
+    """
+    Check whether a dependency declaration fully describes what it installs.
+
+    Direct references (`pkg @ file:///...`, `pkg @ git+https://...@main`) and
+    local paths can install different code under the same declaration, so
+    their installs are not shared.
+
+    Args:
+        dependency: Dependency string, e.g. from `project.dependencies`.
+    """
+
+    try:
+        return Requirement(dependency).url is None
+    except InvalidRequirement:
+        # e.g. a bare path or VCS URL that pip accepts
+        dependency = dependency.strip()
+        return not (
+            dependency.startswith((".", "/", "~"))
+            or "file:" in dependency
+            or "://" in dependency
+        )
+
+
+def _entry_dir(key: str) -> Path:
+    return _store_root() / key[:2] / key
+
+
+def restore_site_packages(key: str, trees: dict[str, Path]) -> bool:
+    """
+    Materialize a stored entry, replacing the destination trees.
+
+    A tree absent from the entry (e.g. no Flutter extensions) is removed at
+    its destination.
+
+    Args:
+        key: Store key from `site_packages_key`.
+        trees: Destination directory for each tree name.
+
+    Returns:
+        `True` on a store hit, otherwise `False` with destinations untouched.
+    """
+
+    entry = _entry_dir(key)
+    use_artifact("site-packages", entry)
+    if not entry.is_dir():
+        return False
+
+    for name, dest in trees.items():
+        if dest.exists():
+            shutil.rmtree(dest)
+        if (entry / name).is_dir():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            link_tree(entry / name, dest)
+
+    # entry mtime records the last use
+    os.utime(entry)
+    record_use("site-packages", entry, hit=True)
+    return True
+
+
+def save_site_packages(key: str, trees: dict[str, Optional[Path]]) -> None:
+    """
+    Publish trees to the store under `key`, unless an entry already exists.
+
+    Args:
+        key: Store key from `site_packages_key`.
+        trees: Source directory for each tree name; missing ones are skipped.
+    """
+
+    entry = _entry_dir(key)
+    use_artifact("site-packages", entry)
+    if entry.exists():
+        return
+
+    tmp_entry = entry.with_name(
+        f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        tmp_entry.mkdir(parents=True)
+        for name, src in trees.items():
+            if src is not None and src.is_dir():
+                link_tree(src, tmp_entry / name)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # published concurrently by another build
+            if not entry.exists():
+                raise
+            return
+    finally:
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+    record_use("site-packages", entry, hit=False)
@@ -1,7 +1,15 @@
+import contextlib
+import json
 import os
 import shutil
-import urllib.request
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Optional
+
+from flet_cli.utils.distros import download_with_progress
 
 
 def get_cache_root() -> Path:
@@ -28,21 +36,238 @@ def get_cached_template_zip(url: str, version: str) -> Path:
         get_cache_root() / "build-template" / f"v{version}" / "flet-build-template.zip"
     )
 
-    if cache_path.exists() and cache_path.stat().st_size > 0:
+    # imported here: the cache index and locks depend on this module
+    from flet_cli.utils.cache_index import record_use, use_artifact
+    from flet_cli.utils.file_lock import file_lock
+
+    def cached() -> bool:
+        return cache_path.exists() and cache_path.stat().st_size > 0
+
+    use_artifact("build-template", cache_path.parent)
+    if cached():
+        record_use("build-template", cache_path.parent, hit=True)
         return cache_path
 
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with file_lock(f"build-template-v{version}"):
+        # downloaded by another process while waiting for the lock
+        if cached():
+            record_use("build-template", cache_path.parent, hit=True)
+            return cache_path
 
-    try:
-        with urllib.request.urlopen(url) as resp, open(tmp_path, "wb") as out:
-            shutil.copyfileobj(resp, out)
-            out.flush()
-            os.fsync(out.fileno())
-        os.replace(tmp_path, cache_path)
-    except BaseException:
-        if tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
-        raise
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # unique per writer, so concurrent builds don't write into the same file
+        tmp_path = cache_path.with_suffix(
+            f"{cache_path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+
+        try:
+            download_with_progress(url, tmp_path, resume=False)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink(missing_ok=True)
+            raise
 
+    record_use("build-template", cache_path.parent, hit=False)
     return cache_path
+
+
+def _zip_stamp(zip_path: Path) -> dict:
+    st = zip_path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_stamp(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def get_cached_template_dir(zip_path: Path) -> Path:
+    """Return the extracted copy of a cached template zip.
+
+    The zip is extracted once, next to it, and published with an atomic
+    rename. A stamp of the zip's size and modification time is written after
+    a complete extraction, so a partial extraction or a replaced zip is
+    extracted again. Like cookiecutter, a zip holding a single top-level
+    directory yields that directory.
+    """
+    from flet_cli.utils.file_lock import file_lock
+
+    extract_dir = zip_path.parent / "template"
+    stamp_path = zip_path.parent / "template.stamp.json"
+
+    def extracted() -> bool:
+        return extract_dir.is_dir() and _read_stamp(stamp_path) == _zip_stamp(
+            zip_path
+        )
+
+    if not extracted():
+        with file_lock(f"build-template-{zip_path.parent.name}"):
+            # extracted by another process while waiting for the lock
+            if not extracted():
+                stamp_path.unlink(missing_ok=True)
+                if extract_dir.exists():
+                    # moved aside first, so it's never used half-deleted
+                    stale_dir = extract_dir.with_name(
+                        f"{extract_dir.name}.{os.getpid()}.stale.tmp"
+                    )
+                    os.rename(extract_dir, stale_dir)
+                    shutil.rmtree(stale_dir, ignore_errors=True)
+                tmp_dir = extract_dir.with_name(
+                    f"{extract_dir.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                try:
+                    with zipfile.ZipFile(zip_path) as zf:
+                        zf.extractall(tmp_dir)
+                    os.rename(tmp_dir, extract_dir)
+                finally:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                stamp_path.write_text(
+                    json.dumps(_zip_stamp(zip_path)), encoding="utf-8"
+                )
+
+    entries = list(extract_dir.iterdir())
+    if len(entries) == 1 and entries[0].is_dir():
+        return entries[0]
+    return extract_dir
+
+
+# Bytecode cache used by cookiecutter renders on the current thread; builds of
+# several targets render different templates concurrently.
+_render_state = threading.local()
+_bytecode_caches: dict[Path, object] = {}
+_bytecode_caches_lock = threading.Lock()
+
+
+def _get_bytecode_cache(directory: Path):
+    with _bytecode_caches_lock:
+        cache = _bytecode_caches.get(directory)
+        if cache is None:
+            from jinja2 import FileSystemBytecodeCache
+
+            class TemplateBytecodeCache(FileSystemBytecodeCache):
+                """Jinja bytecode cache kept in memory in front of the on-disk one."""
+
+                def __init__(self, directory: str) -> None:
+                    super().__init__(directory)
+                    self._memory: dict[str, bytes] = {}
+
+                def load_bytecode(self, bucket) -> None:
+                    data = self._memory.get(bucket.key)
+                    if data is not None:
+                        bucket.bytecode_from_string(data)
+                        return
+                    super().load_bytecode(bucket)
+                    if bucket.code is not None:
+                        self._memory[bucket.key] = bucket.bytecode_to_string()
+
+                def dump_bytecode(self, bucket) -> None:
+                    self._memory[bucket.key] = bucket.bytecode_to_string()
+                    super().dump_bytecode(bucket)
+
+            directory.mkdir(parents=True, exist_ok=True)
+            cache = _bytecode_caches[directory] = TemplateBytecodeCache(str(directory))
+        return cache
+
+
+# Compiled string templates shared by all renders, least recently used first.
+MAX_COMPILED_STRINGS = 4096
+_compiled_strings: OrderedDict[tuple, object] = OrderedDict()
+_compiled_strings_lock = threading.Lock()
+
+# Renders in progress with cookiecutter's environment replaced.
+_patch_lock = threading.Lock()
+_patch_users = 0
+_original_environment = None
+
+# Environment settings that change how a template source compiles.
+_COMPILE_SETTINGS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "optimized",
+)
+
+
+def _cached_environment(base_environment):
+    """Return a subclass of cookiecutter's `StrictEnvironment` using the caches."""
+
+    class CachedEnvironment(base_environment):
+        def __init__(self, **kwargs) -> None:
+            kwargs.setdefault(
+                "bytecode_cache", getattr(_render_state, "bytecode_cache", None)
+            )
+            super().__init__(**kwargs)
+
+        def compile(self, source, name=None, filename=None, raw=False, **kwargs):
+            # only anonymous templates: file templates go through bytecode_cache
+            if name is not None or raw or not isinstance(source, str):
+                return super().compile(source, name, filename, raw, **kwargs)
+            key = (
+                source,
+                tuple(sorted(self.extensions)),
+                tuple(getattr(self, a) for a in _COMPILE_SETTINGS),
+                repr(self.autoescape),
+                tuple(sorted(kwargs.items())),
+            )
+            with _compiled_strings_lock:
+                code = _compiled_strings.get(key)
+                if code is not None:
+                    _compiled_strings.move_to_end(key)
+                    return code
+            code = super().compile(source, name, filename, raw, **kwargs)
+            with _compiled_strings_lock:
+                _compiled_strings[key] = code
+                while len(_compiled_strings) > MAX_COMPILED_STRINGS:
+                    _compiled_strings.popitem(last=False)
+            return code
+
+    return CachedEnvironment
+
+
+@contextlib.contextmanager
+def template_render_cache(cache_dir: Path) -> Iterator[None]:
+    """Reuse compiled Jinja templates in cookiecutter renders of the block.
+
+    Compiled file templates are kept in memory, so both template passes of a
+    build parse each file once, and in `cache_dir` for later builds. Jinja
+    validates entries against a checksum of the template source, so stale
+    entries are simply recompiled. Path names and other string templates are
+    compiled once per process, up to `MAX_COMPILED_STRINGS` of them.
+
+    cookiecutter's `StrictEnvironment` is replaced while any thread is in the
+    block, and restored when the last one leaves it.
+
+    Args:
+        cache_dir: Directory for compiled templates of the rendered template.
+    """
+    global _patch_users, _original_environment
+    import cookiecutter.generate as generate
+
+    previous_cache = getattr(_render_state, "bytecode_cache", None)
+    _render_state.bytecode_cache = _get_bytecode_cache(cache_dir)
+    with _patch_lock:
+        if _patch_users == 0:
+            _original_environment = generate.StrictEnvironment
+            generate.StrictEnvironment = _cached_environment(_original_environment)
+        _patch_users += 1
+    try:
+        yield
+    finally:
+        with _patch_lock:
+            _patch_users -= 1
+            if _patch_users == 0:
+                generate.StrictEnvironment = _original_environment
+                _original_environment = None
+        _render_state.bytecode_cache = previous_cache
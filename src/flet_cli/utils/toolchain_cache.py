@@ -0,0 +1,105 @@
+"""Persisted results of toolchain probes.
+
+Probing the toolchain (e.g. `flutter --version`) costs seconds on every
+command. Results are stored in `~/.flet/cache/toolchain.json`, each with a
+stamp of the files that identify the installed tool (path, mtime, size and
+content digest), and reused until any of those files changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from flet_cli.utils.file_lock import file_lock
+from flet_cli.utils.template_cache import get_cache_root
+
+_lock = threading.Lock()
+
+
+def _manifest_path() -> Path:
+    return get_cache_root() / "toolchain.json"
+
+
+def _load() -> dict[str, Any]:
+    try:
+        with open(_manifest_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def file_stamp(paths) -> Optional[list]:
+    """
+    Return a stamp identifying the current state of the given files.
+
+    Args:
+        paths: Files that change whenever the probed tool changes; missing
+            ones are skipped.
+
+    Returns:
+        JSON-serializable stamp, or `None` if none of the files exist.
+    """
+
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            continue
+        stamp.append([str(path), st.st_mtime_ns, st.st_size, digest])
+    return stamp or None
+
+
+def get_cached(kind: str, key: str, stamp: Optional[list]) -> Optional[Any]:
+    """
+    Return a stored probe result if it was recorded for the same stamp.
+
+    Args:
+        kind: Probe kind, e.g. `flutter_version`.
+        key: Probed tool identity, e.g. its resolved executable path.
+        stamp: Current stamp from `file_stamp`.
+    """
+
+    if stamp is None:
+        return None
+    with _lock:
+        entry = _load().get(kind, {}).get(key)
+    if isinstance(entry, dict) and entry.get("stamp") == stamp:
+        return entry.get("value")
+    return None
+
+
+def set_cached(kind: str, key: str, stamp: Optional[list], value: Any) -> None:
+    """
+    Store a probe result for the given stamp.
+
+    Args:
+        kind: Probe kind, e.g. `flutter_version`.
+        key: Probed tool identity, e.g. its resolved executable path.
+        stamp: Stamp from `file_stamp` taken before probing.
+        value: JSON-serializable probe result.
+    """
+
+    if stamp is None:
+        return
+    path = _manifest_path()
+    with _lock, file_lock("toolchain"):
+        data = _load()
+        data.setdefault(kind, {})[key] = {"stamp": stamp, "value": value}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError:
+            # caching is best-effort
+            pass
@@ -0,0 +1,233 @@
+"""Tracing of build pipeline steps and the subprocesses they launch.
+
+A `BuildTracer` records spans with their wall time, the CPU time of child
+processes that finished during the span, the peak RSS of those children and
+free-form annotations such as cache hits. Spans are written in Chrome
+trace-event format (open in `chrome://tracing` or https://ui.perfetto.dev) and
+summarized in a table.
+
+Child CPU time and peak RSS come from `getrusage(RUSAGE_CHILDREN)`, which is
+process-wide: spans running concurrently on other threads are included, and
+peak RSS is only known when a child exceeds all previous ones. Both are
+unavailable on Windows.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from rich.table import Column, Table
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class TraceRecord:
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int
+    thread_id: int
+    depth: int
+    child_cpu: Optional[float] = None
+    child_peak_rss: Optional[int] = None
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+def _children_usage() -> tuple[Optional[float], Optional[int]]:
+    if resource is None:
+        return None, None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * rss_unit
+
+
+class BuildTracer:
+    """
+    Thread-safe recorder of nested timing spans.
+    """
+
+    def __init__(self) -> None:
+        self.records: list[TraceRecord] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_names: dict[int, str] = {}
+
+    def _stack(self) -> list[dict[str, Any]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "step", **args) -> Iterator[dict]:
+        """
+        Record the enclosed block as a span.
+
+        Args:
+            name: Span name.
+            category: Span category, e.g. `step` or `subprocess`.
+            args: Initial span annotations.
+
+        Yields:
+            Mutable annotations of the span.
+        """
+
+        stack = self._stack()
+        depth = len(stack)
+        stack.append(args)
+        cpu_before, rss_before = _children_usage()
+        start_ns = time.perf_counter_ns()
+        try:
+            yield args
+        except SystemExit as e:
+            if e.code:
+                args.setdefault("error", f"exit code {e.code}")
+            raise
+        except BaseException as e:
+            args.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            end_ns = time.perf_counter_ns()
+            cpu_after, rss_after = _children_usage()
+            stack.pop()
+            thread = threading.current_thread()
+            record = TraceRecord(
+                name=name,
+                category=category,
+                start_ns=start_ns - self._origin_ns,
+                end_ns=end_ns - self._origin_ns,
+                thread_id=thread.ident or 0,
+                depth=depth,
+                args=args,
+            )
+            if cpu_before is not None and cpu_after is not None:
+                record.child_cpu = cpu_after - cpu_before
+            if rss_before is not None and rss_after and rss_after > rss_before:
+                record.child_peak_rss = rss_after
+            with self._lock:
+                self.records.append(record)
+                self._thread_names[record.thread_id] = thread.name
+
+    def annotate(self, **args) -> None:
+        """
+        Add annotations to the innermost span open on the current thread.
+
+        Args:
+            args: Annotations to set, e.g. `cache="hit"`.
+        """
+
+        stack = self._stack()
+        if stack:
+            stack[-1].update(args)
+
+    def write(self, path) -> None:
+        """
+        Write recorded spans as a Chrome trace-event JSON file.
+
+        Args:
+            path: Output file path.
+        """
+
+        pid = os.getpid()
+        with self._lock:
+            records = sorted(self.records, key=lambda r: r.start_ns)
+            thread_names = dict(self._thread_names)
+
+        events: list[dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in thread_names.items()
+        ]
+        for r in records:
+            args = dict(r.args)
+            if r.child_cpu is not None:
+                args["child_cpu_s"] = round(r.child_cpu, 3)
+            if r.child_peak_rss is not None:
+                args["child_peak_rss_bytes"] = r.child_peak_rss
+            events.append(
+                {
+                    "name": r.name,
+                    "cat": r.category,
+                    "ph": "X",
+                    "ts": r.start_ns / 1000,
+                    "dur": (r.end_ns - r.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": r.thread_id,
+                    "args": args,
+                }
+            )
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str
+            )
+
+    def summary(self) -> Table:
+        """
+        Return a table of recorded spans in start order, nested by depth.
+        """
+
+        table = Table(
+            Column("Span", style="cyan"),
+            Column("Wall", justify="right"),
+            Column("Child CPU", justify="right"),
+            Column("Child peak RSS", justify="right"),
+            Column("Notes"),
+            title="Build trace",
+        )
+        with self._lock:
+            records = sorted(self.records, key=lambda r: r.start_ns)
+        for r in records:
+            table.add_row(
+                f"{'  ' * r.depth}{r.name}",
+                f"{(r.end_ns - r.start_ns) / 1e9:.2f}s",
+                f"{r.child_cpu:.2f}s" if r.child_cpu is not None else "-",
+                (
+                    f"{r.child_peak_rss / (1024 * 1024):.0f} MiB"
+                    if r.child_peak_rss is not None
+                    else "-"
+                ),
+                ", ".join(f"{k}={v}" for k, v in r.args.items() if k != "command"),
+            )
+        return table
+
+
+def traced_step(name: Optional[str] = None) -> Callable:
+    """
+    Record calls of a command method as `step` spans of the command's tracer.
+
+    Args:
+        name: Span name; defaults to the method name.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            tracer: Optional[BuildTracer] = getattr(self, "tracer", None)
+            if tracer is None:
+                return fn(self, *args, **kwargs)
+            with tracer.span(name or fn.__name__):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
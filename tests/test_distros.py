@@ -0,0 +1,126 @@
+import hashlib
+import http.server
+import os
+import threading
+
+import pytest
+
+from flet_cli.utils import distros
+
+PAYLOAD = os.urandom(64 * 1024)
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves `PAYLOAD` with range support, optionally dropping connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        start, end = 0, len(PAYLOAD) - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (None, server.etag):
+            first, _, last = range_header.removeprefix("bytes=").partition("-")
+            start, end = int(first), int(last) if last else end
+            status = 206
+        body = PAYLOAD[start : end + 1]
+
+        self.send_response(status)
+        self.send_header("ETag", server.etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.end_headers()
+
+        if len(body) <= 1:
+            # the size probe isn't counted or cut short
+            self.wfile.write(body)
+            return
+        if server.cut_after is not None:
+            self.wfile.write(body[: server.cut_after])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+        with server.lock:
+            server.served += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.etag = '"v1"'
+    httpd.cut_after = None
+    httpd.served = 0
+    httpd.lock = threading.Lock()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def small_segments(monkeypatch):
+    monkeypatch.setattr(distros, "_MIN_SEGMENT_SIZE", 16 * 1024)
+    monkeypatch.setattr(distros, "_STATE_SAVE_INTERVAL", 1024)
+    monkeypatch.setattr(distros, "_CHUNK_SIZE", 1024)
+    monkeypatch.setenv("FLET_CLI_DOWNLOAD_SEGMENTS", "4")
+    monkeypatch.setenv("FLET_CLI_DOWNLOAD_RETRIES", "0")
+
+
+def url_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+
+
+def test_interrupted_download_resumes(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    server.cut_after = 8 * 1024
+
+    with pytest.raises(Exception):
+        distros.download_with_progress(url_of(server), dest)
+    assert not dest.exists()
+    assert (tmp_path / "file.bin.part").exists()
+    assert (tmp_path / "file.bin.part.json").exists()
+
+    server.cut_after = None
+    distros.download_with_progress(url_of(server), dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    # only the missing parts of the segments were requested again
+    assert server.served < len(PAYLOAD)
+    assert not (tmp_path / "file.bin.part").exists()
+    assert not (tmp_path / "file.bin.part.json").exists()
+
+
+def test_changed_file_restarts_download(server, tmp_path):
+    dest = tmp_path / "file.bin"
+    server.cut_after = 8 * 1024
+    with pytest.raises(Exception):
+        distros.download_with_progress(url_of(server), dest)
+
+    server.cut_after = None
+    server.etag = '"v2"'
+    distros.download_with_progress(url_of(server), dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert server.served == len(PAYLOAD)
+
+
+def test_digest_mismatch_discards_download(server, tmp_path):
+    dest = tmp_path / "file.bin"
+
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        distros.download_with_progress(url_of(server), dest, sha256="0" * 64)
+    assert not dest.exists()
+    assert not (tmp_path / "file.bin.part").exists()
+    assert not (tmp_path / "file.bin.part.json").exists()
+
+    distros.download_with_progress(
+        url_of(server), dest, sha256=hashlib.sha256(PAYLOAD).hexdigest()
+    )
+    assert dest.read_bytes() == PAYLOAD